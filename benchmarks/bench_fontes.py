@@ -0,0 +1,91 @@
+# ============================================================================
+# BENCHMARK - FONTES DA PLANILHA
+# Exportação xlsx (CachePlanilha) x Sheets API por faixas (FonteSheetsAPI),
+# ambas servidas localmente
+# Uso: python benchmarks/bench_fontes.py [--linhas 1000 10000]
+# ============================================================================
+
+import argparse
+import functools
+import sys
+import tempfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_leitura_xlsx import cronometra, gera_xlsx  # noqa: E402
+from servidor_sheets_falso import URL_PLANILHA_FALSA, ServidorSheetsFalso  # noqa: E402
+
+from luatech.cache_planilha import CachePlanilha  # noqa: E402
+from luatech.leitura_sheets import FonteSheetsAPI  # noqa: E402
+from luatech.leitura_xlsx import ler_xlsx  # noqa: E402
+
+
+class _Silencioso(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def _servidor_arquivos(diretorio):
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_Silencioso, directory=diretorio))
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def _mesmo_conteudo(a, b) -> bool:
+    """Compara dois DataFrames pelo texto das células (tipos podem variar)"""
+    if list(a.columns) != list(b.columns) or len(a) != len(b):
+        return False
+    texto = lambda df: df.astype(object).where(df.notna(), None).astype(str)  # noqa: E731
+    return texto(a).reset_index(drop=True).equals(texto(b).reset_index(drop=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara as fontes da planilha (xlsx x Sheets API)")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'linhas':>8}  {'fonte':<38}{'segundos':>10}")
+    for linhas in args.linhas:
+        conteudo = gera_xlsx(linhas)
+        diretorio = tempfile.mkdtemp()
+        Path(diretorio, "planilha.xlsx").write_bytes(conteudo)
+        arquivos = _servidor_arquivos(diretorio)
+        url_xlsx = f"http://127.0.0.1:{arquivos.server_port}/planilha.xlsx"
+
+        # A aba inteira (com as colunas extras) é o que a API falsa publica
+        aba_completa = ler_xlsx(conteudo, "GERAL", colunas=None)
+        try:
+            with ServidorSheetsFalso({"GERAL": aba_completa}) as sheets:
+                cliente = sheets.cliente()
+
+                def xlsx_frio():
+                    return CachePlanilha(tempfile.mkdtemp()).obtem(url_xlsx, "GERAL")
+
+                def api_fria():
+                    return FonteSheetsAPI(cliente).obtem(URL_PLANILHA_FALSA, "GERAL")
+
+                fonte_api = FonteSheetsAPI(cliente)
+                fonte_api.obtem(URL_PLANILHA_FALSA, "GERAL")
+
+                repeticoes = 1 if linhas >= 100000 else args.repeticoes
+                casos = [
+                    ("xlsx exportado (cache vazio)", xlsx_frio),
+                    ("sheets api (primeira leitura)", api_fria),
+                    ("sheets api (sem mudança)", lambda: fonte_api.obtem(URL_PLANILHA_FALSA, "GERAL")),
+                ]
+                for nome, func in casos:
+                    print(f"{linhas:>8}  {nome:<38}{cronometra(func, repeticoes):>10.3f}")
+
+                iguais = _mesmo_conteudo(xlsx_frio(), api_fria())
+                print(f"{linhas:>8}  {'conteúdo idêntico entre as fontes':<38}{'sim' if iguais else 'NÃO':>10}")
+        finally:
+            arquivos.shutdown()
+            arquivos.server_close()
+
+
+if __name__ == "__main__":
+    main()
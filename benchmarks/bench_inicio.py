@@ -0,0 +1,112 @@
+# ============================================================================
+# BENCHMARK - INÍCIO DO APLICATIVO
+# Partida a frio do processo (interpretador + Streamlit), tempo até a tela
+# de login e até o primeiro grid (EMPRESAS, planilha servida localmente),
+# cada repetição em um processo novo e com cache em disco vazio
+# Uso: python benchmarks/bench_inicio.py [--linhas 10000] [--repeticoes 5]
+#      [--app outro_Gestor_Fiscal.py] (ex.: uma versão anterior, para comparar)
+# ============================================================================
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+DIRETORIO_DADOS = Path(__file__).resolve().parent / ".dados"
+
+# Módulos pesados que a tela de login não deveria carregar
+MODULOS_PESADOS = ("pandas", "st_aggrid", "requests")
+
+
+def _filho(app: str, inicio: float):
+    """Mede login e primeiro grid neste processo; imprime uma linha JSON"""
+    sys.path.insert(0, str(RAIZ))
+    from streamlit.testing.v1 import AppTest
+
+    pronto = time.time()
+    at = AppTest.from_file(app, default_timeout=300)
+    t = time.perf_counter()
+    at.run()
+    ate_login = time.perf_counter() - t
+    login_ok = any(campo.label == "Senha" for campo in at.text_input)
+    carregados = [m for m in MODULOS_PESADOS if m in sys.modules]
+
+    at.session_state["autenticado"] = True
+    t = time.perf_counter()
+    at.run()
+    ate_grid = time.perf_counter() - t
+
+    print(json.dumps({
+        "inicio_processo": pronto - inicio,
+        "ate_login": ate_login,
+        "ate_primeiro_grid": ate_grid,
+        "login_ok": login_ok,
+        "erros": [str(e.value) for e in at.exception],
+        "modulos_no_login": carregados,
+    }))
+
+
+def _mede(app: str, registro: str) -> dict:
+    """Uma repetição em processo novo (cache em disco vazio)"""
+    ambiente = dict(
+        os.environ,
+        GESTOR_FISCAL_ESCRITORIOS=registro,
+        GESTOR_FISCAL_CACHE_DIR=tempfile.mkdtemp(),
+        GESTOR_FISCAL_LOG_DESEMPENHO="off",
+    )
+    inicio = time.time()
+    saida = subprocess.run(
+        [sys.executable, __file__, "--filho", app, "--inicio", repr(inicio)],
+        env=ambiente, capture_output=True, text=True, check=True, cwd=RAIZ
+    ).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partida a frio, tempo até o login e até o primeiro grid")
+    parser.add_argument("--linhas", type=int, default=10000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--app", default=str(RAIZ / "Gestor_Fiscal.py"))
+    parser.add_argument("--filho", help=argparse.SUPPRESS)
+    parser.add_argument("--inicio", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho:
+        _filho(args.filho, args.inicio)
+        return
+
+    sys.path.insert(0, str(RAIZ))
+    from bench_fontes import _servidor_arquivos
+    from gera_geral import planilha_em_cache
+
+    planilha = planilha_em_cache(args.linhas, DIRETORIO_DADOS)
+    servidor = _servidor_arquivos(str(planilha.parent))
+    registro = Path(tempfile.mkdtemp(), "escritorios.json")
+    registro.write_text(json.dumps([{
+        "nome": "VIDAL", "url": f"http://127.0.0.1:{servidor.server_port}/{planilha.name}", "aba": "GERAL"
+    }]))
+
+    try:
+        medicoes = [_mede(str(Path(args.app).resolve()), str(registro)) for _ in range(args.repeticoes)]
+    finally:
+        servidor.shutdown()
+
+    print(f"App: {args.app} | linhas: {args.linhas} | repetições: {args.repeticoes}")
+    for etapa in ("inicio_processo", "ate_login", "ate_primeiro_grid"):
+        valores = [m[etapa] for m in medicoes]
+        print(f"{etapa:<20}{statistics.median(valores):>8.2f} s (mín {min(valores):.2f} | máx {max(valores):.2f})")
+    ultima = medicoes[-1]
+    print(f"Módulos pesados na tela de login: {', '.join(ultima['modulos_no_login']) or 'nenhum'}")
+    if not ultima["login_ok"] or ultima["erros"]:
+        print(f"Atenção: login exibido={ultima['login_ok']} | erros={ultima['erros']}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# ============================================================================
+# BENCHMARK - SERVIDOR DE INDICADORES
+# Requisições por segundo e latência do servidor JSON (luatech.servidor_kpis)
+# com clientes keep-alive em paralelo; metade revalida com If-None-Match.
+# A planilha é servida localmente só para preencher o cache e o servidor de
+# arquivos é desligado antes das medições (o servidor não pode depender dele)
+# Uso: python benchmarks/bench_kpis.py [--linhas 10000] [--clientes 8] [--segundos 5]
+# ============================================================================
+
+import argparse
+import http.client
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("GESTOR_FISCAL_LOG_DESEMPENHO", "off")
+
+from bench_fontes import _servidor_arquivos  # noqa: E402
+from gera_geral import planilha_em_cache  # noqa: E402
+
+from luatech.cache_planilha import CachePlanilha  # noqa: E402
+from luatech.escritorios import Escritorio  # noqa: E402
+from luatech.historico import HistoricoCompetencias  # noqa: E402
+from luatech.leitura_xlsx import assinatura_leitura, ler_xlsx  # noqa: E402
+from luatech.servidor_kpis import VARIAVEL_TOKEN, cria_servidor  # noqa: E402
+
+DIRETORIO_DADOS = Path(__file__).resolve().parent / ".dados"
+
+ROTAS = ("/kpis", "/empresas", "/saude")
+
+# O servidor lê o token do ambiente; os clientes mandam o mesmo
+AUTORIZACAO = {"Authorization": f"Bearer {os.environ[VARIAVEL_TOKEN]}"} if os.environ.get(VARIAVEL_TOKEN) else {}
+
+
+def _cliente(porta, rota, revalida, ate, latencias, status):
+    conexao = http.client.HTTPConnection("127.0.0.1", porta)
+    etag = None
+    while time.perf_counter() < ate:
+        headers = {**AUTORIZACAO, "If-None-Match": etag} if revalida and etag else AUTORIZACAO
+        t = time.perf_counter()
+        conexao.request("GET", rota, headers=headers)
+        resposta = conexao.getresponse()
+        resposta.read()
+        latencias.append(time.perf_counter() - t)
+        status.append(resposta.status)
+        etag = resposta.getheader("ETag")
+    conexao.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Requisições por segundo do servidor de indicadores")
+    parser.add_argument("--linhas", type=int, default=10000)
+    parser.add_argument("--clientes", type=int, default=8)
+    parser.add_argument("--segundos", type=float, default=5)
+    args = parser.parse_args()
+
+    # Cache em disco preenchido como o aplicativo faria
+    planilha = planilha_em_cache(args.linhas, DIRETORIO_DADOS)
+    arquivos = _servidor_arquivos(str(planilha.parent))
+    escritorio = Escritorio("VIDAL", f"http://127.0.0.1:{arquivos.server_port}/{planilha.name}", "GERAL")
+    diretorio = tempfile.mkdtemp()
+    cache = CachePlanilha(diretorio, leitor=ler_xlsx, versao_leitor=assinatura_leitura())
+    cache.obtem(escritorio.url, escritorio.aba)
+    arquivos.shutdown()
+    arquivos.server_close()
+
+    servidor = cria_servidor(
+        porta=0, escritorios=[escritorio], cache=cache,
+        historico=HistoricoCompetencias(Path(diretorio) / "historico.sqlite3")
+    )
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    porta = servidor.server_port
+    servidor.atualizador.aguarda()
+
+    # Primeira consulta de cada rota monta a resposta (fora da medição)
+    for rota in ROTAS:
+        conexao = http.client.HTTPConnection("127.0.0.1", porta)
+        t = time.perf_counter()
+        conexao.request("GET", rota, headers=AUTORIZACAO)
+        resposta = conexao.getresponse()
+        corpo = resposta.read()
+        print(f"{rota:<10} primeira resposta {resposta.status} em {(time.perf_counter() - t) * 1000:7.1f} ms ({len(corpo) / 1024:.0f} KiB)")
+        conexao.close()
+
+    print(f"\nLinhas: {args.linhas} | clientes: {args.clientes} | {args.segundos:.0f} s por rota")
+    try:
+        for rota in ROTAS:
+            latencias, status = [], []
+            ate = time.perf_counter() + args.segundos
+            clientes = [
+                threading.Thread(target=_cliente, args=(porta, rota, i % 2 == 1, ate, latencias, status))
+                for i in range(args.clientes)
+            ]
+            inicio = time.perf_counter()
+            for c in clientes:
+                c.start()
+            for c in clientes:
+                c.join()
+            duracao = time.perf_counter() - inicio
+
+            latencias.sort()
+            p99 = latencias[int(len(latencias) * 0.99)]
+            erros = sum(s not in (200, 304) for s in status)
+            print(
+                f"{rota:<10}{len(latencias) / duracao:>8.0f} req/s | p50 {statistics.median(latencias) * 1000:6.2f} ms"
+                f" | p99 {p99 * 1000:6.2f} ms | 304: {status.count(304) / len(status):4.0%} | erros: {erros}"
+            )
+    finally:
+        servidor.shutdown()
+        servidor.atualizador.para()
+        servidor.carga.fecha()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# ============================================================================
+# BENCHMARK - MOTORES DE LEITURA DO XLSX
+# Uso: python benchmarks/bench_leitura_xlsx.py [--linhas 1000 10000 100000]
+# ============================================================================
+
+import argparse
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from luatech.leitura_xlsx import COLUNAS_USADAS, MOTORES, ler_xlsx, motor_disponivel  # noqa: E402
+
+# Colunas extras que nenhuma página exibe (simulam o restante da aba GERAL)
+COLUNAS_EXTRAS = 25
+
+
+def gera_xlsx(linhas: int, aba: str = "GERAL") -> bytes:
+    """Gera uma aba GERAL sintética com as colunas usadas + colunas extras"""
+    rng = np.random.default_rng(42)
+    dados = {}
+    for col in COLUNAS_USADAS:
+        if col.startswith(("TOTAL", "FATURAMENTO", "BASE")):
+            dados[col] = rng.uniform(0, 100000, linhas).round(2)
+        elif col.startswith("PERÍODO"):
+            dados[col] = pd.Timestamp("2024-01-01")
+        elif col == "Código":
+            dados[col] = np.arange(1, linhas + 1)
+        else:
+            dados[col] = rng.choice(["ATIVA", "OK", "FILIAL", "SEM ACESSO", ""], linhas)
+    for i in range(COLUNAS_EXTRAS):
+        dados[f"EXTRA {i}"] = rng.choice(["x", "y", "z"], linhas)
+
+    saida = BytesIO()
+    engine = "xlsxwriter" if _tem_modulo("xlsxwriter") else "openpyxl"
+    pd.DataFrame(dados).to_excel(saida, sheet_name=aba, index=False, engine=engine)
+    return saida.getvalue()
+
+
+def _tem_modulo(nome: str) -> bool:
+    try:
+        __import__(nome)
+        return True
+    except ImportError:
+        return False
+
+
+def cronometra(func, repeticoes: int) -> float:
+    """Menor tempo entre as repetições, em segundos"""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara os motores de leitura do xlsx")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    motores = [m for m in MOTORES if motor_disponivel(m)]
+    print(f"{'linhas':>8}  {'motor':<38}{'segundos':>10}")
+    for linhas in args.linhas:
+        conteudo = gera_xlsx(linhas)
+        # Referência: caminho original (openpyxl lendo a aba inteira)
+        casos = [("openpyxl (aba inteira)", lambda: ler_xlsx(conteudo, "GERAL", "openpyxl", None))]
+        casos += [
+            (f"{m} (colunas podadas)", lambda m=m: ler_xlsx(conteudo, "GERAL", m))
+            for m in motores
+        ]
+        repeticoes = 1 if linhas >= 100000 else args.repeticoes
+        for nome, func in casos:
+            print(f"{linhas:>8}  {nome:<38}{cronometra(func, repeticoes):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# ============================================================================
+# BENCHMARK - MEMÓRIA POR SESSÃO
+# Tamanho do conjunto compartilhado (planilha normalizada, uma vez por
+# processo) e memória retida por sessão ao montar todas as páginas
+# (relatórios + preparo do grid), com N sessões simultâneas
+# Uso: python benchmarks/bench_memoria.py [--linhas 100000] [--sessoes 10]
+# ============================================================================
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("GESTOR_FISCAL_LOG_DESEMPENHO", "off")
+
+from gera_geral import planilha_em_cache  # noqa: E402
+
+from luatech import formatacao  # noqa: E402
+from luatech.leitura_xlsx import ler_xlsx  # noqa: E402
+from luatech.normalizacao import DadosNormalizados  # noqa: E402
+from luatech.relatorios import RELATORIOS  # noqa: E402
+
+DIRETORIO_DADOS = Path(__file__).resolve().parent / ".dados"
+
+MB = 1024 * 1024
+
+
+def memoria_frame(df) -> float:
+    """Memória do DataFrame em MB (inclui o texto das colunas object/str)"""
+    return df.memory_usage(deep=True, index=True).sum() / MB
+
+
+def memoria_dados(dados) -> float:
+    """Planilha + status em maiúsculas + recorte das ATIVAS"""
+    return memoria_frame(dados.df) + memoria_frame(dados.status) + memoria_frame(dados.ativas)
+
+
+def renderiza_sessao(dados) -> list:
+    """O que uma sessão mantém ao passar por todas as páginas"""
+    retidos = []
+    for monta in RELATORIOS.values():
+        relatorio = monta(dados)
+        retidos.append((relatorio, formatacao.datas_iso(relatorio.df)))
+    return retidos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória compartilhada e por sessão")
+    parser.add_argument("--linhas", type=int, default=100000)
+    parser.add_argument("--sessoes", type=int, default=10)
+    args = parser.parse_args()
+
+    conteudo = planilha_em_cache(args.linhas, DIRETORIO_DADOS).read_bytes()
+    df = ler_xlsx(conteudo, "GERAL")
+    dados = DadosNormalizados(df)
+
+    print(f"Linhas: {args.linhas} | ATIVAS: {len(dados.ativas)}")
+    print(f"Planilha lida (DataFrame cru):       {memoria_frame(df):8.1f} MB")
+    print(f"Conjunto compartilhado (normalizado): {memoria_dados(dados):8.1f} MB")
+
+    gc.collect()
+    tracemalloc.start()
+    inicial = tracemalloc.get_traced_memory()[0]
+    sessoes = [renderiza_sessao(dados) for _ in range(args.sessoes)]
+    retido, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Por sessão (retido, {args.sessoes} sessões):   {(retido - inicial) / MB / args.sessoes:8.1f} MB")
+    print(f"Pico ao montar as {args.sessoes} sessões:       {(pico - inicial) / MB:8.1f} MB")
+    del sessoes
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# ============================================================================
+# BENCHMARK - PIPELINE DAS PÁGINAS
+# Leitura da planilha, normalização, relatório de cada página, opções do
+# grid e exportação Excel, com tempo e pico de memória por etapa.
+# Tudo local: a aba GERAL sintética é servida por um servidor HTTP local.
+# Uso: python benchmarks/bench_paginas.py [--linhas 1000 10000 100000 1000000]
+#      python benchmarks/bench_paginas.py --grava-baseline
+# Sai com código 1 quando alguma etapa piora além da tolerância da baseline.
+# ============================================================================
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Os logs JSON por etapa atrapalhariam a tabela
+os.environ.setdefault("GESTOR_FISCAL_LOG_DESEMPENHO", "off")
+
+from bench_fontes import _servidor_arquivos  # noqa: E402
+from bench_leitura_xlsx import cronometra  # noqa: E402
+from gera_geral import planilha_em_cache  # noqa: E402
+
+from luatech import formatacao  # noqa: E402
+from luatech.cache_planilha import CachePlanilha  # noqa: E402
+from luatech.exportacao import gera_arquivo  # noqa: E402
+from luatech.grid import monta_opcoes_grid  # noqa: E402
+from luatech.normalizacao import DadosNormalizados  # noqa: E402
+from luatech.relatorios import RELATORIOS  # noqa: E402
+
+DIRETORIO = Path(__file__).resolve().parent
+ARQUIVO_BASELINE = DIRETORIO / "baselines_paginas.json"
+DIRETORIO_DADOS = DIRETORIO / ".dados"
+
+# Folgas absolutas: abaixo disso a diferença é ruído de medição
+FOLGA_SEGUNDOS = 0.01
+FOLGA_MB = 1.0
+
+
+class Resultado:
+    """Tempo (menor entre as repetições) e pico de memória de uma etapa"""
+
+    def __init__(self, linhas, etapa, segundos, pico_mb):
+        self.linhas = linhas
+        self.etapa = etapa
+        self.segundos = segundos
+        self.pico_mb = pico_mb
+
+    def como_dict(self):
+        return {"segundos": round(self.segundos, 4), "pico_mb": round(self.pico_mb, 2)}
+
+
+def mede(linhas, etapa, func, repeticoes):
+    """Executa uma vez com tracemalloc (pico de memória) e cronometra sem ele"""
+    tracemalloc.start()
+    try:
+        inicial = tracemalloc.get_traced_memory()[0]
+        valor = func()
+        pico = tracemalloc.get_traced_memory()[1] - inicial
+    finally:
+        tracemalloc.stop()
+    segundos = cronometra(func, repeticoes)
+    return valor, Resultado(linhas, etapa, segundos, pico / 1024 / 1024)
+
+
+def _opcoes_do_grid(relatorio):
+    """O que exibe_aggrid faz antes de desenhar: gridOptions + datas em AAAA-MM-DD"""
+    formatos = tuple(formatacao.formatos_padrao(relatorio.df, relatorio.formatos).items())
+    opcoes = monta_opcoes_grid(relatorio.df.head(0), formatos=formatos)
+    return opcoes, formatacao.datas_iso(relatorio.df)
+
+
+def executa(linhas, repeticoes, exporta=True):
+    """Mede todas as etapas para uma planilha de `linhas` linhas"""
+    caminho = planilha_em_cache(linhas, DIRETORIO_DADOS)
+    servidor = _servidor_arquivos(str(caminho.parent))
+    url = f"http://127.0.0.1:{servidor.server_port}/{caminho.name}"
+    resultados = []
+    try:
+        def leitura():
+            # Mesmo caminho de le_planilha_google, com o cache em disco vazio
+            with tempfile.TemporaryDirectory() as cache:
+                return CachePlanilha(cache).obtem(url, "GERAL")
+
+        df, resultado = mede(linhas, "leitura", leitura, repeticoes)
+        resultados.append(resultado)
+
+        dados, resultado = mede(linhas, "normalizacao", lambda: DadosNormalizados(df), repeticoes)
+        resultados.append(resultado)
+
+        for pagina, monta in RELATORIOS.items():
+            relatorio, resultado = mede(linhas, f"relatorio:{pagina}", lambda m=monta: m(dados), repeticoes)
+            resultados.append(resultado)
+
+            _, resultado = mede(linhas, f"grid:{pagina}", lambda r=relatorio: _opcoes_do_grid(r), repeticoes)
+            resultados.append(resultado)
+
+            if exporta:
+                _, resultado = mede(
+                    linhas, f"exportacao_xlsx:{pagina}",
+                    lambda r=relatorio: gera_arquivo(r.df, "xlsx"), repeticoes
+                )
+                resultados.append(resultado)
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+    return resultados
+
+
+# ============================================================================
+# BASELINES
+# ============================================================================
+
+def carrega_baselines(caminho=ARQUIVO_BASELINE) -> dict:
+    if not Path(caminho).exists():
+        return {}
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f).get("resultados", {})
+
+
+def grava_baselines(resultados, caminho=ARQUIVO_BASELINE):
+    """Atualiza a baseline das etapas medidas (as demais são mantidas)"""
+    baselines = carrega_baselines(caminho)
+    for r in resultados:
+        baselines.setdefault(str(r.linhas), {})[r.etapa] = r.como_dict()
+    conteudo = {
+        "maquina": f"{platform.system()} {platform.machine()} | Python {platform.python_version()}",
+        "resultados": baselines,
+    }
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(conteudo, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compara(resultado, baselines, tolerancia_tempo, tolerancia_memoria):
+    """Situação da etapa frente à baseline: "ok", "sem baseline" ou a piora"""
+    base = baselines.get(str(resultado.linhas), {}).get(resultado.etapa)
+    if base is None:
+        return "sem baseline"
+    pioras = []
+    if resultado.segundos > base["segundos"] * (1 + tolerancia_tempo) + FOLGA_SEGUNDOS:
+        pioras.append(f"tempo {resultado.segundos / max(base['segundos'], 1e-9):.1f}x")
+    if resultado.pico_mb > base["pico_mb"] * (1 + tolerancia_memoria) + FOLGA_MB:
+        pioras.append(f"memória {resultado.pico_mb / max(base['pico_mb'], 1e-9):.1f}x")
+    return "PIOROU: " + ", ".join(pioras) if pioras else "ok"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o pipeline das páginas contra as baselines")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--sem-exportacao", action="store_true", help="não mede a exportação xlsx")
+    parser.add_argument("--grava-baseline", action="store_true", help="grava os resultados como baseline")
+    parser.add_argument("--tolerancia-tempo", type=float, default=0.5, help="piora aceita (0.5 = +50%%)")
+    parser.add_argument("--tolerancia-memoria", type=float, default=0.25)
+    parser.add_argument("--json", help="grava também os resultados neste arquivo")
+    args = parser.parse_args()
+
+    baselines = carrega_baselines()
+    resultados, pioras = [], 0
+    print(f"{'linhas':>8}  {'etapa':<36}{'segundos':>10}{'pico MB':>10}  situação")
+    for linhas in args.linhas:
+        repeticoes = 1 if linhas >= 100000 else args.repeticoes
+        for r in executa(linhas, repeticoes, exporta=not args.sem_exportacao):
+            situacao = compara(r, baselines, args.tolerancia_tempo, args.tolerancia_memoria)
+            pioras += situacao.startswith("PIOROU")
+            resultados.append(r)
+            print(f"{linhas:>8}  {r.etapa:<36}{r.segundos:>10.3f}{r.pico_mb:>10.1f}  {situacao}")
+
+    if resource is not None:
+        # ru_maxrss: KiB no Linux, bytes no macOS
+        maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        maximo_mb = maximo / 1024 / 1024 if sys.platform == "darwin" else maximo / 1024
+        print(f"\nMemória máxima do processo (RSS): {maximo_mb:.0f} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({str(r.linhas) + ":" + r.etapa: r.como_dict() for r in resultados}, f, ensure_ascii=False, indent=2)
+    if args.grava_baseline:
+        grava_baselines(resultados)
+        print(f"Baseline gravada em {ARQUIVO_BASELINE.name}")
+    elif pioras:
+        print(f"{pioras} etapa(s) pioraram além da tolerância")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+# ============================================================================
+# BENCHMARK - SESSÕES SIMULTÂNEAS
+# N sessões do aplicativo (AppTest) no mesmo processo, como no servidor
+# Streamlit (caches compartilhados): cada uma faz login, percorre as páginas
+# do menu e aplica filtros (escritório, CONSOLIDADO, busca de empresa e,
+# com --grid-servidor, o filtro do grid paginado). Mede a latência de cada
+# rerun (p50/p90/p99), CPU (% do processo e média por sessão, medida nas
+# threads de cada uma) e memória (RSS do processo e, com
+# --memoria, o que cada sessão retém). A planilha é servida localmente.
+# Uso: python benchmarks/bench_sessoes.py [--linhas 10000] [--sessoes 1 5 10 20]
+#      [--rodadas 2] [--pausa 0.5] [--escritorios 2] [--grid-servidor 0] [--memoria]
+# Ajusta detalhes internos do Streamlit (_servidor_compartilhado): só roda
+# com a versão em STREAMLIT_SUPORTADO (o aplicativo aceita outras)
+# ============================================================================
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RAIZ = Path(__file__).resolve().parent.parent
+DIRETORIO_DADOS = Path(__file__).resolve().parent / ".dados"
+sys.path.insert(0, str(RAIZ))
+
+# Senha da tela de login do aplicativo
+SENHA = "VIDAL"
+
+# Termos da busca de empresas (nomes do gerador sintético e códigos)
+TERMOS_BUSCA = ("comercio", "vitoria", "transportes", "capixaba", "12", "3")
+
+MB = 1024 * 1024
+
+# Versão do Streamlit cujos internos _servidor_compartilhado conhece
+STREAMLIT_SUPORTADO = "1.65."
+
+# CPU das threads de script do AppTest, pela thread da sessão que as disparou
+_CPU_SCRIPTS = {}
+_LOCK_CPU = threading.Lock()
+
+
+def _rss_mb() -> float:
+    """Memória residente atual do processo (Linux); fora dele, o pico"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, AttributeError):
+        return _pico_mb()
+
+
+def _pico_mb() -> float:
+    if resource is None:
+        return 0.0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / MB if sys.platform == "darwin" else pico / 1024
+
+
+def _percentil(valores, p) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))] if ordenados else 0.0
+
+
+def _servidor_compartilhado():
+    """Deixa o AppTest com o estado único por processo que o servidor tem:
+
+    - Runtime._instance é trocado (global) a cada run e zerado no fim: com
+      sessões em threads, a que termina apagaria o das outras. A última
+      instância criada continua valendo.
+    - Cada run cria um ScriptCache e recompila o script; ast.parse em threads
+      simultâneas falha no Python 3.11 ("AST constructor recursion depth
+      mismatch"). O bytecode passa a ser compilado uma vez, como no servidor.
+    - global.appTest é ligado só durante cada run (patch de config.get_option):
+      a sessão que termina desliga o das outras e os widgets deixam de guardar
+      o format_func que o AppTest lê. Fica ligado de vez.
+
+    Também soma a CPU de cada run (o script roda numa thread do
+    LocalScriptRunner) em _CPU_SCRIPTS, pela sessão que o disparou.
+    """
+    import streamlit
+    if not streamlit.__version__.startswith(STREAMLIT_SUPORTADO):
+        raise SystemExit(
+            f"bench_sessoes depende de internos do Streamlit {STREAMLIT_SUPORTADO}x; "
+            f"instalado: {streamlit.__version__}"
+        )
+
+    from streamlit import config
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+    ultima = {}
+
+    def atual(cls):
+        if cls._instance is not None:
+            ultima["runtime"] = cls._instance
+        return ultima.get("runtime")
+
+    def instance(cls):
+        runtime = atual(cls)
+        if runtime is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return runtime
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: atual(cls) is not None)
+
+    unico = ScriptCache()
+    ScriptCache.__init__ = lambda self: self.__dict__.update(unico.__dict__)
+
+    config.set_option("global.appTest", True)
+
+    run = LocalScriptRunner.run
+    thread_script = LocalScriptRunner._run_script_thread
+
+    def run_da_sessao(self, *args, **kwargs):
+        self._sessao = threading.get_ident()
+        return run(self, *args, **kwargs)
+
+    def thread_script_medida(self):
+        inicio = time.thread_time()
+        try:
+            thread_script(self)
+        finally:
+            gasto = time.thread_time() - inicio
+            with _LOCK_CPU:
+                _CPU_SCRIPTS[self._sessao] = _CPU_SCRIPTS.get(self._sessao, 0.0) + gasto
+
+    LocalScriptRunner.run = run_da_sessao
+    LocalScriptRunner._run_script_thread = thread_script_medida
+
+
+class Sessao:
+    """Um usuário: login, páginas do menu e filtros, com pausas entre as ações"""
+
+    def __init__(self, app: str, numero: int, rodadas: int, pausa: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(app, default_timeout=600)
+        self.rng = random.Random(numero)
+        self.rodadas = rodadas
+        self.pausa = pausa
+        self.medicoes = []   # (ação, segundos)
+        self.erros = []
+        self.cpu = 0.0       # segundos de CPU: thread da sessão + threads de script
+
+    def _roda(self, acao: str, prepara=None):
+        if prepara is not None:
+            prepara(self.at)
+        inicio = time.perf_counter()
+        self.at.run()
+        self.medicoes.append((acao, time.perf_counter() - inicio))
+        problemas = [str(e.value) for e in self.at.exception] + [str(e.value) for e in self.at.error]
+        self.erros += [f"{acao}: {p}" for p in problemas]
+        if self.pausa:
+            time.sleep(self.rng.uniform(0, 2 * self.pausa))
+
+    def _widget(self, tipo: str, chave: str):
+        elementos = [e for e in getattr(self.at, tipo) if e.key == chave]
+        return elementos[0] if elementos else None
+
+    def _filtros(self, pagina: str):
+        escritorio = self._widget("selectbox", f"escritorio_{pagina}")
+        if escritorio is not None and len(escritorio.options) > 1:
+            escolha = self.rng.choice(escritorio.options)
+            self._roda("filtro_escritorio", lambda at: escritorio.set_value(escolha))
+        filtro = self._widget("selectbox", "filtro_consolidado")
+        if filtro is not None:
+            escolha = self.rng.choice(filtro.options)
+            self._roda("filtro_consolidado", lambda at: filtro.set_value(escolha))
+        termos = [e for e in self.at.text_input if e.key and e.key.endswith("_termo")]
+        if termos:
+            termo = self.rng.choice(TERMOS_BUSCA)
+            self._roda("filtro_grid", lambda at: termos[0].input(termo))
+
+    def executa(self):
+        from luatech.paginas import MENU
+
+        inicio = time.thread_time()
+        try:
+            self._roda("tela_login")
+            self._roda("login", lambda at: (at.text_input[0].input(SENHA), at.button[0].click()))
+            if not self.at.sidebar.radio:
+                # O login não dá st.rerun(): o menu só aparece no rerun seguinte
+                self._roda("login_menu")
+            for _ in range(self.rodadas):
+                paginas = list(MENU)
+                self.rng.shuffle(paginas)
+                for pagina in paginas:
+                    if not self.at.sidebar.radio:
+                        raise RuntimeError("menu ausente (login ou rerun anterior falhou)")
+                    self._roda("pagina", lambda at: at.sidebar.radio[0].set_value(pagina))
+                    self._filtros(pagina)
+                busca = self._widget("text_input", "busca_empresa")
+                if busca is not None:
+                    termo = self.rng.choice(TERMOS_BUSCA)
+                    self._roda("busca_empresa", lambda at: busca.input(termo))
+                    self._roda("busca_limpa", lambda at: self._widget("text_input", "busca_empresa").input(""))
+        except Exception as e:
+            self.erros.append(f"sessão interrompida: {type(e).__name__}: {e}")
+        finally:
+            with _LOCK_CPU:
+                scripts = _CPU_SCRIPTS.pop(threading.get_ident(), 0.0)
+            self.cpu = time.thread_time() - inicio + scripts
+
+
+def rodada(app: str, sessoes: int, rodadas: int, pausa: float, memoria=False) -> dict:
+    """N sessões em paralelo (threads, como o servidor Streamlit); devolve as medições.
+
+    Com `memoria`, o tracemalloc mede o que cada sessão retém (e deixa os reruns mais lentos).
+    """
+    gc.collect()
+    rss_inicial = _rss_mb()
+    if memoria:
+        tracemalloc.start()
+    cpu_inicial = time.process_time()
+    inicio = time.perf_counter()
+
+    usuarios = [Sessao(app, i, rodadas, pausa) for i in range(sessoes)]
+    threads = [threading.Thread(target=u.executa, name=f"sessao-{i}") for i, u in enumerate(usuarios)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    duracao = time.perf_counter() - inicio
+    cpu = time.process_time() - cpu_inicial
+    gc.collect()
+    rss_vivas = _rss_mb()
+    medicoes = [m for u in usuarios for m in u.medicoes]
+    cpu_sessoes = [u.cpu for u in usuarios]
+    erros = [e for u in usuarios for e in u.erros]
+    retido = None
+    if memoria:
+        # O que as sessões retêm (session_state, widgets) sai com elas; os
+        # caches compartilhados ficam. O RSS não serve aqui: o alocador não
+        # devolve as páginas ao sistema
+        vivas = tracemalloc.get_traced_memory()[0]
+        del usuarios, threads
+        gc.collect()
+        retido = (vivas - tracemalloc.get_traced_memory()[0]) / MB
+        tracemalloc.stop()
+    return {
+        "sessoes": sessoes,
+        "duracao": duracao,
+        "medicoes": medicoes,
+        "erros": erros,
+        "cpu": cpu,
+        "cpu_sessoes": cpu_sessoes,
+        "rss_inicial": rss_inicial,
+        "rss_vivas": rss_vivas,
+        "retido": retido,
+    }
+
+
+def imprime(resultados):
+    print(
+        f"{'Sessões':>7}{'reruns':>8}{'rerun/s':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'máx ms':>9}"
+        f"{'CPU %':>8}{'CPU s/sessão':>14}{'RSS MB':>9}{'ΔRSS MB':>9}{'MB/sessão':>11}{'erros':>7}"
+    )
+    for r in resultados:
+        tempos = [s for _, s in r["medicoes"]]
+        print(
+            f"{r['sessoes']:>7}{len(tempos):>8}{len(tempos) / r['duracao']:>9.1f}"
+            f"{_percentil(tempos, 0.5) * 1000:>9.0f}{_percentil(tempos, 0.9) * 1000:>9.0f}"
+            f"{_percentil(tempos, 0.99) * 1000:>9.0f}{max(tempos, default=0) * 1000:>9.0f}"
+            f"{100 * r['cpu'] / r['duracao']:>8.0f}{sum(r['cpu_sessoes']) / r['sessoes']:>14.2f}"
+            f"{r['rss_vivas']:>9.0f}{r['rss_vivas'] - r['rss_inicial']:>9.0f}"
+            f"{'-' if r['retido'] is None else format(r['retido'] / r['sessoes'], '.2f'):>11}{len(r['erros']):>7}"
+        )
+
+    # Latência por ação na maior carga
+    maior = resultados[-1]
+    print(f"\nPor ação ({maior['sessoes']} sessões):")
+    acoes = {}
+    for acao, segundos in maior["medicoes"]:
+        acoes.setdefault(acao, []).append(segundos)
+    for acao, tempos in acoes.items():
+        print(
+            f"  {acao:<20}{len(tempos):>6} | p50 {_percentil(tempos, 0.5) * 1000:7.0f} ms"
+            f" | p99 {_percentil(tempos, 0.99) * 1000:7.0f} ms"
+        )
+    for r in resultados:
+        for erro in r["erros"][:5]:
+            print(f"Erro ({r['sessoes']} sessões): {erro[:200]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência, CPU e memória com N sessões simultâneas do aplicativo")
+    parser.add_argument("--linhas", type=int, default=10000)
+    parser.add_argument("--sessoes", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--rodadas", type=int, default=2, help="voltas pelo menu em cada sessão")
+    parser.add_argument("--pausa", type=float, default=0.5, help="pausa média entre ações (s)")
+    parser.add_argument("--escritorios", type=int, default=2, help="planilhas (mesmo arquivo) no registro")
+    parser.add_argument("--grid-servidor", type=int, default=0, help="GESTOR_FISCAL_GRID_SERVIDOR (0 = desligado)")
+    parser.add_argument("--memoria", action="store_true", help="mede o retido por sessão (tracemalloc, reruns mais lentos)")
+    parser.add_argument("--app", default=str(RAIZ / "Gestor_Fiscal.py"))
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from bench_fontes import _servidor_arquivos
+    from gera_geral import planilha_em_cache
+
+    planilha = planilha_em_cache(args.linhas, DIRETORIO_DADOS)
+    servidor = _servidor_arquivos(str(planilha.parent))
+    registro = Path(tempfile.mkdtemp(), "escritorios.json")
+    registro.write_text(json.dumps([
+        {"nome": f"ESCRITÓRIO {i + 1}", "url": f"http://127.0.0.1:{servidor.server_port}/{planilha.name}?e={i}", "aba": "GERAL"}
+        for i in range(args.escritorios)
+    ]))
+    # Antes de importar o aplicativo: os módulos leem as variáveis na importação
+    os.environ.update({
+        "GESTOR_FISCAL_ESCRITORIOS": str(registro),
+        "GESTOR_FISCAL_CACHE_DIR": tempfile.mkdtemp(),
+        "GESTOR_FISCAL_LOG_DESEMPENHO": "off",
+        "GESTOR_FISCAL_GRID_SERVIDOR": str(args.grid_servidor),
+    })
+    _servidor_compartilhado()
+
+    try:
+        # Primeira sessão: download, leitura e caches compartilhados (fora da tabela)
+        aquecimento = rodada(args.app, 1, 1, 0)
+        tempos = [s for _, s in aquecimento["medicoes"]]
+        print(
+            f"Aquecimento (1 sessão, caches vazios): {sum(tempos):.1f} s em {len(tempos)} reruns | "
+            f"RSS {aquecimento['rss_vivas']:.0f} MB | erros: {len(aquecimento['erros'])}"
+        )
+        for erro in aquecimento["erros"][:5]:
+            print(f"  {erro[:200]}")
+        print(
+            f"Linhas: {args.linhas} | escritórios: {args.escritorios} | rodadas: {args.rodadas} | "
+            f"pausa média: {args.pausa} s | núcleos: {os.cpu_count()}\n"
+        )
+        resultados = [rodada(args.app, n, args.rodadas, args.pausa, args.memoria) for n in args.sessoes]
+    finally:
+        servidor.shutdown()
+
+    imprime(resultados)
+    print(f"\nPico de memória do processo: {_pico_mb():.0f} MB")
+    if any(r["erros"] for r in resultados):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
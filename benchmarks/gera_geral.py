@@ -0,0 +1,207 @@
+# ============================================================================
+# GERADOR DA ABA GERAL
+# Planilha sintética com todas as colunas lidas pelas páginas, vocabulários
+# reais de status e grupos Matriz/Filial (mesma raiz de CNPJ)
+# Uso: python benchmarks/gera_geral.py --linhas 100000 --saida geral.xlsx
+# ============================================================================
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from luatech.exportacao import escreve_xlsx_streaming  # noqa: E402
+from luatech.leitura_xlsx import COLUNAS_USADAS  # noqa: E402
+
+# Colunas que nenhuma página exibe (o restante da aba GERAL)
+COLUNAS_EXTRAS = 25
+
+COMPETENCIA = pd.Timestamp("2024-05-01")
+
+# Vocabulários como aparecem na planilha (com as variações de caixa reais)
+SITUACOES = (["ATIVA", "Ativa", "INATIVA", "BAIXADA", "SUSPENSA"], [0.70, 0.08, 0.12, 0.06, 0.04])
+REGIMES = (["SIMPLES NACIONAL", "Simples Nacional", "LUCRO PRESUMIDO", "LUCRO REAL", "MEI"],
+           [0.45, 0.05, 0.30, 0.12, 0.08])
+MUNICIPIOS = ["Vitória", "Vila Velha", "Serra", "Cariacica", "Guarapari", "Linhares",
+              "Colatina", "São Mateus", "Aracruz", "Cachoeiro de Itapemirim"]
+ESTADOS = (["ES", "RJ", "MG", "BA", "SP"], [0.80, 0.06, 0.06, 0.04, 0.04])
+SIMPLES_GERADO = (["OK", "", "Ok", "GERADO"], [0.65, 0.25, 0.05, 0.05])
+TRANSMISSAO = (["OK", "", "ok"], [0.60, 0.35, 0.05])
+ORIGENS = ["eSocial", "Reinf", "eSocial/Reinf", "MIT"]
+TIPOS = (["Original", "Retificadora"], [0.9, 0.1])
+SITUACOES_DCTF = (["ATIVA", "SEM PROCURAÇÃO", "EM ANDAMENTO", ""], [0.45, 0.15, 0.10, 0.30])
+STATUS_XML = (["OK", ""], [0.7, 0.3])
+DMS = (["DMS SALVA", "SEM ACESSO", "SEM MOVIMENTO", ""], [0.50, 0.12, 0.13, 0.25])
+GUIA_ISS = (["OK", "", "N/A"], [0.55, 0.35, 0.10])
+REST = (["REST SALVA", "SEM ACESSO", "", "Rest salva"], [0.50, 0.15, 0.30, 0.05])
+IMPORTACAO = (["CONCLUÍDO", "EM ANDAMENTO", "OUTRO ESTADO", "SEM MOVIMENTO", ""],
+              [0.40, 0.20, 0.10, 0.15, 0.15])
+
+_PALAVRAS_RAZAO = ["Comércio", "Indústria", "Serviços", "Transportes", "Construções", "Alimentação",
+                   "Distribuidora", "Tecnologia", "Consultoria", "Açougue", "Padaria", "Clínica",
+                   "Logística", "Auto Peças", "Móveis", "Materiais Elétricos", "Confecções", "Informática"]
+_NOMES_RAZAO = ["São José", "Capixaba", "Vitória", "Atlântico", "Três Irmãos", "Boa Esperança",
+                "Pinheiro", "Conceição", "Aurora", "Itapoã", "Jardim Camburi", "Praia do Canto",
+                "Goiabeiras", "Santa Lúcia", "Maruípe", "Ilha do Frade", "Nova Almeida", "Jacaraípe"]
+_SUFIXOS_RAZAO = ["Ltda", "Ltda ME", "EIRELI", "S.A.", "ME", "EPP"]
+
+
+def _escolhe(rng, opcoes, linhas):
+    """Amostra de um vocabulário ([valores] ou ([valores], [probabilidades]))"""
+    if isinstance(opcoes, tuple):
+        valores, pesos = opcoes
+        return rng.choice(np.array(valores, dtype=object), linhas, p=pesos)
+    return rng.choice(np.array(opcoes, dtype=object), linhas)
+
+
+def _com_textos(rng, valores: np.ndarray, textos, proporcao: float) -> np.ndarray:
+    """Coluna numérica com uma parte das células trocada por textos"""
+    coluna = valores.astype(object)
+    trocadas = rng.random(len(valores)) < proporcao
+    coluna[trocadas] = _escolhe(rng, textos, int(trocadas.sum()))
+    return coluna
+
+
+def _digitos_cnpj(base: np.ndarray) -> np.ndarray:
+    """Dígitos verificadores de bases de 12 dígitos (matriz [n, 12])"""
+    pesos1 = np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+    pesos2 = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+    resto = (base * pesos1).sum(axis=1) % 11
+    d1 = np.where(resto < 2, 0, 11 - resto)
+    com_d1 = np.column_stack([base, d1])
+    resto = (com_d1 * pesos2).sum(axis=1) % 11
+    d2 = np.where(resto < 2, 0, 11 - resto)
+    return np.column_stack([com_d1, d2])
+
+
+def _cnpjs(raizes: np.ndarray, ordens: np.ndarray) -> np.ndarray:
+    """CNPJs formatados (00.000.000/0000-00) com dígitos verificadores válidos"""
+    base = np.column_stack([
+        (raizes[:, None] // 10 ** np.arange(7, -1, -1)) % 10,
+        (ordens[:, None] // 10 ** np.arange(3, -1, -1)) % 10,
+    ])
+    numeros = _digitos_cnpj(base) @ (10 ** np.arange(13, -1, -1, dtype=np.int64))
+    texto = pd.Series(numeros).astype(str).str.zfill(14)
+    return (texto.str[:2] + "." + texto.str[2:5] + "." + texto.str[5:8] + "/"
+            + texto.str[8:12] + "-" + texto.str[12:]).to_numpy(dtype=object)
+
+
+def gera_geral(linhas: int, semente: int = 42, extras: int = COLUNAS_EXTRAS,
+               proporcao_filiais: float = 0.25) -> pd.DataFrame:
+    """Aba GERAL sintética com `linhas` empresas.
+
+    Cerca de `proporcao_filiais` das linhas são filiais: repetem a raiz do
+    CNPJ, a razão social e o regime da matriz logo acima e trazem "FILIAL"
+    nas colunas de status em que a planilha real marca filiais.
+    """
+    rng = np.random.default_rng(semente)
+
+    # Grupos: uma matriz seguida de 0..n filiais
+    eh_filial = rng.random(linhas) < proporcao_filiais
+    eh_filial[0] = False
+    grupo = np.cumsum(~eh_filial) - 1
+    grupos = int(grupo[-1]) + 1 if linhas else 0
+    ordem = np.arange(linhas) - np.searchsorted(grupo, grupo)
+
+    raizes = rng.choice(10 ** 8, grupos, replace=False) if grupos <= 10 ** 7 else rng.integers(0, 10 ** 8, grupos)
+    razoes = (
+        _escolhe(rng, _PALAVRAS_RAZAO, grupos) + " " + _escolhe(rng, _NOMES_RAZAO, grupos) + " "
+        + _escolhe(rng, _SUFIXOS_RAZAO, grupos)
+    )
+    regimes = _escolhe(rng, REGIMES, grupos)
+
+    matriz_filial = np.where(eh_filial, "Filial", "Matriz").astype(object)
+    filial_maiusculo = np.where(eh_filial, "FILIAL", "MATRIZ").astype(object)
+
+    def _status(vocabulario, marca_filial=True):
+        valores = _escolhe(rng, vocabulario, linhas)
+        return np.where(eh_filial, "FILIAL", valores).astype(object) if marca_filial else valores
+
+    periodo = np.where(rng.random(linhas) < 0.85, COMPETENCIA - pd.DateOffset(months=1), pd.NaT)
+
+    dados = {
+        "Código": np.arange(1, linhas + 1),
+        "Razão Social": razoes[grupo],
+        "CNPJ": _cnpjs(raizes[grupo], ordem + 1),
+        "Regime": regimes[grupo],
+        "Município": _escolhe(rng, MUNICIPIOS, linhas),
+        "Estado": _escolhe(rng, ESTADOS, linhas),
+        "Matriz / Filial": matriz_filial,
+        "MATRIZ / FILIAL": filial_maiusculo,
+        "Situação": _escolhe(rng, SITUACOES, linhas),
+        "Insc. Estadual": np.where(
+            rng.random(linhas) < 0.2, "ISENTO", rng.integers(10 ** 7, 10 ** 8, linhas).astype(str)
+        ).astype(object),
+        "PERÍODO DE COMPETÊNCIA": COMPETENCIA,
+        "SIMPLES GERADO": _status(SIMPLES_GERADO),
+        "TRANSMISSÃO": _status(TRANSMISSAO),
+        "PERÍODO": pd.to_datetime(periodo),
+        "ORIGEM": _escolhe(rng, ORIGENS, linhas),
+        "TIPO": _escolhe(rng, TIPOS, linhas),
+        "SITUAÇÃO DCTF": _escolhe(rng, SITUACOES_DCTF, linhas),
+        "FATURAMENTO SERVIÇOS": rng.lognormal(10, 1.5, linhas).round(2),
+        # Como na planilha: alguns valores digitados como texto ou em branco
+        "BASE DE CÁLCULO ISS": _com_textos(rng, rng.lognormal(9, 1.5, linhas).round(2), ["", "-"], 0.1),
+        "XML DMS": _escolhe(rng, STATUS_XML, linhas),
+        "DMS": _escolhe(rng, DMS, linhas),
+        "GUIA ISS DMS": _escolhe(rng, GUIA_ISS, linhas),
+        "REST": _escolhe(rng, REST, linhas),
+        "XML REST": _escolhe(rng, STATUS_XML, linhas),
+        "GUIA ISS REST": _escolhe(rng, GUIA_ISS, linhas),
+        "XML ENTRADA": _escolhe(rng, STATUS_XML, linhas),
+        "XML SAÍDA": _escolhe(rng, STATUS_XML, linhas),
+        "IMPORTAÇÃO": _escolhe(rng, IMPORTACAO, linhas),
+        "TOTAL ENTRADA": rng.lognormal(11, 1.2, linhas).round(2),
+        "TOTAL SAÍDA": rng.lognormal(11, 1.2, linhas).round(2),
+        "TOTAL DOMÍNIO": rng.lognormal(11, 1.2, linhas).round(2),
+    }
+    for i in range(extras):
+        dados[f"CONTROLE {i + 1}"] = _escolhe(rng, ["OK", "PENDENTE", "", "N/A"], linhas)
+
+    df = pd.DataFrame(dados)
+    # Células vazias da planilha chegam como ausentes
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].mask(df[col].eq(""))
+
+    faltando = set(COLUNAS_USADAS) - set(df.columns)
+    assert not faltando, f"Gerador sem as colunas {sorted(faltando)}"
+    return df
+
+
+def escreve_xlsx(df: pd.DataFrame, destino, aba: str = "GERAL"):
+    """Grava a aba em xlsx (linha a linha, em memória constante, com o xlsxwriter)"""
+    try:
+        escreve_xlsx_streaming(df, destino, aba)
+    except ImportError:
+        df.to_excel(destino, sheet_name=aba, index=False, engine="openpyxl")
+
+
+def planilha_em_cache(linhas: int, diretorio, semente: int = 42) -> Path:
+    """Caminho do xlsx de `linhas` linhas, gerado só na primeira vez"""
+    caminho = Path(diretorio) / f"geral_{linhas}_{semente}.xlsx"
+    if not caminho.exists():
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = caminho.with_suffix(".tmp")
+        escreve_xlsx(gera_geral(linhas, semente), temporario)
+        temporario.replace(caminho)
+    return caminho
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera uma aba GERAL sintética")
+    parser.add_argument("--linhas", type=int, default=10000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="geral.xlsx")
+    args = parser.parse_args()
+
+    escreve_xlsx(gera_geral(args.linhas, args.semente), args.saida)
+    print(f"{args.linhas} linhas gravadas em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
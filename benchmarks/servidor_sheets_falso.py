@@ -0,0 +1,121 @@
+# ============================================================================
+# SERVIDOR FALSO DA SHEETS API
+# Atende values:batchGet localmente a partir de DataFrames, para testar e
+# medir a FonteSheetsAPI sem credenciais nem rede
+# ============================================================================
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import pandas as pd
+import requests
+
+ORIGEM_SERIAL = pd.Timestamp("1899-12-30")
+URL_SHEETS = "https://sheets.googleapis.com"
+URL_PLANILHA_FALSA = "https://docs.google.com/spreadsheets/d/planilha-falsa/export?format=xlsx"
+
+
+def _indice_coluna(letras: str) -> int:
+    indice = 0
+    for letra in letras:
+        indice = indice * 26 + ord(letra) - 64
+    return indice - 1
+
+
+def _valor_api(valor):
+    """Valor como a API devolve com UNFORMATTED_VALUE / SERIAL_NUMBER"""
+    if valor is None or (not isinstance(valor, str) and pd.isna(valor)):
+        return ""
+    if isinstance(valor, pd.Timestamp):
+        return (valor - ORIGEM_SERIAL) / pd.Timedelta(days=1)
+    if hasattr(valor, "item"):
+        return valor.item()
+    return valor
+
+
+def _sem_vazios_no_fim(valores):
+    while valores and valores[-1] == "":
+        valores.pop()
+    return valores
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        encontrado = re.fullmatch(r"/v4/spreadsheets/([^/]+)/values:batchGet", url.path)
+        if encontrado is None:
+            return self._responde(404, {"error": {"code": 404, "message": "not found"}})
+        parametros = parse_qs(url.query)
+        if parametros.get("majorDimension", ["ROWS"])[0] != "COLUMNS":
+            return self._responde(400, {"error": {"code": 400, "message": "only COLUMNS"}})
+
+        faixas = []
+        for faixa in parametros.get("ranges", []):
+            aba, a1 = unquote(faixa).rsplit("!", 1)
+            aba = aba.strip("'")
+            if aba not in self.server.abas:
+                return self._responde(400, {"error": {"code": 400, "message": f"Unable to parse range: {faixa}"}})
+            faixas.append({"range": faixa, "majorDimension": "COLUMNS", "values": self._valores(aba, a1)})
+        self._responde(200, {"spreadsheetId": encontrado.group(1), "valueRanges": faixas})
+
+    def _valores(self, aba, a1):
+        df = self.server.abas[aba]
+        if a1 == "1:1":
+            return [[str(c)] for c in df.columns]
+        inicio, fim = re.fullmatch(r"([A-Z]+)2:([A-Z]+)", a1).groups()
+        colunas = []
+        for i in range(_indice_coluna(inicio), min(_indice_coluna(fim) + 1, df.shape[1])):
+            colunas.append(_sem_vazios_no_fim([_valor_api(v) for v in df.iloc[:, i].tolist()]))
+        # Como na API real, colunas vazias no fim da faixa são omitidas
+        while colunas and not colunas[-1]:
+            colunas.pop()
+        return colunas
+
+    def _responde(self, status, corpo):
+        conteudo = json.dumps(corpo).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(conteudo)))
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+
+class _SessaoLocal(requests.Session):
+    """Sessão que redireciona as URLs da Sheets API para o servidor falso"""
+
+    def __init__(self, base: str):
+        super().__init__()
+        self.base = base
+
+    def request(self, method, url, *args, **kwargs):
+        return super().request(method, url.replace(URL_SHEETS, self.base), *args, **kwargs)
+
+
+class ServidorSheetsFalso:
+    """Servidor local com as abas informadas ({nome: DataFrame})"""
+
+    def __init__(self, abas: dict):
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Manipulador)
+        self.servidor.abas = abas
+        self.base = f"http://127.0.0.1:{self.servidor.server_port}"
+        self._thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+    def cliente(self):
+        """Cliente gspread apontando para este servidor (sem credenciais)"""
+        import gspread
+
+        return gspread.Client(auth=None, session=_SessaoLocal(self.base))
@@ -0,0 +1 @@
+"""Módulos de apoio do Gestor Fiscal (dados, cache e regras das obrigações)."""
@@ -0,0 +1,150 @@
+# ============================================================================
+# ATUALIZAÇÃO EM SEGUNDO PLANO
+# Stale-while-revalidate: os usuários leem a versão atual enquanto uma
+# thread recarrega a planilha pouco antes de ela vencer
+# ============================================================================
+
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger("gestor_fiscal.atualizacao")
+
+
+class AtualizadorPlanilha:
+    """Guarda os dados atuais e os recarrega periodicamente em segundo plano.
+
+    - `carregar(tolera_falha)`: devolve o DataFrame bruto (com attrs["versao"]).
+    - `preparar(df)`: transforma o DataFrame no objeto servido às páginas;
+      só é chamado quando a versão dos dados muda.
+    - `inicial()`: opcional, devolve sem rede o último DataFrame salvo (ou
+      None); é preparado e servido enquanto a primeira carga não termina.
+    - `intervalo`: validade dos dados (s); a recarga começa `antecedencia`
+      segundos antes de vencer.
+    - Falhas são repetidas até `tentativas` vezes com espera exponencial e
+      jitter; enquanto isso os dados anteriores continuam sendo servidos.
+
+    A thread começa na construção (`iniciar=False` adia até o primeiro
+    `atual()`); nenhuma leitura espera pela carga.
+    """
+
+    def __init__(self, carregar, preparar, intervalo=600, antecedencia=60, tentativas=3, espera_base=5.0,
+                 inicial=None, iniciar=True):
+        self._carregar = carregar
+        self._preparar = preparar
+        self._inicial = inicial
+        self.intervalo = intervalo
+        self.antecedencia = min(antecedencia, intervalo / 2)
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+
+        self._lock_carga = threading.Lock()
+        self._lock_thread = threading.Lock()
+        self._parar = threading.Event()
+        self._pronto = threading.Event()   # dados disponíveis ou primeira carga encerrada
+        self._thread = None
+        self._atual = None
+        self._versao = None
+        self.atualizado_em = None   # epoch da última consulta bem-sucedida à origem
+        self.ultimo_erro = None
+        if iniciar:
+            self._garante_thread()
+
+    # ------------------------------------------------------------------
+    # Leitura (caminho das páginas)
+    # ------------------------------------------------------------------
+
+    def atual(self):
+        """Dados atuais, sem esperar; None enquanto não há nada carregado (ver `aguarda`)"""
+        self._garante_thread()
+        return self._atual
+
+    def aguarda(self, timeout=None) -> bool:
+        """Espera até haver dados ou a primeira carga terminar (sucesso ou falha)"""
+        self._garante_thread()
+        return self._pronto.wait(timeout)
+
+    # ------------------------------------------------------------------
+    # Recarga
+    # ------------------------------------------------------------------
+
+    def _atualiza(self, tolera_falha=False):
+        df = self._carregar(tolera_falha=tolera_falha)
+        versao = df.attrs.get("versao")
+        if self._atual is None or versao is None or versao != self._versao:
+            preparado = self._preparar(df)
+            # Troca atômica: uma única atribuição de referência
+            self._atual, self._versao = preparado, versao
+        self.atualizado_em = df.attrs.get("consultado_em", time.time())
+        self.ultimo_erro = None
+
+    def _carrega_inicial(self):
+        """Prepara o último DataFrame salvo, se ainda não há dados no ar"""
+        try:
+            df = self._inicial()
+            if df is None:
+                return
+            with self._lock_carga:
+                if self._atual is None:
+                    self._atual, self._versao = self._preparar(df), df.attrs.get("versao")
+                    self.atualizado_em = df.attrs.get("consultado_em")
+        except Exception as e:
+            logger.warning("Falha ao preparar os dados salvos: %s", e)
+
+    def recarrega(self, tolera_falha=False) -> bool:
+        """Recarrega com tentativas e jitter; devolve False se todas falharem"""
+        for tentativa in range(self.tentativas):
+            try:
+                with self._lock_carga:
+                    self._atualiza(tolera_falha=tolera_falha)
+                return True
+            except Exception as e:
+                self.ultimo_erro = e
+                logger.warning("Falha ao atualizar a planilha (tentativa %d): %s", tentativa + 1, e)
+                if tentativa + 1 < self.tentativas:
+                    espera = self.espera_base * 2 ** tentativa * random.uniform(0.5, 1.5)
+                    if self._parar.wait(espera):
+                        return False
+        return False
+
+    def _proxima_espera(self) -> float:
+        """Segundos até o início da próxima recarga (um pouco antes de vencer)"""
+        if self.atualizado_em is None:
+            return self.espera_base
+        vence_em = self.atualizado_em + self.intervalo - time.time()
+        return max(vence_em - self.antecedencia, 1.0)
+
+    def _laco(self):
+        if self._atual is None:
+            # Primeiro os dados salvos (disco), depois a carga da origem
+            if self._inicial is not None:
+                self._carrega_inicial()
+            if self._atual is not None:
+                self._pronto.set()
+            self.recarrega(tolera_falha=True)
+            self._pronto.set()
+        espera = self._proxima_espera()
+        while not self._parar.wait(espera):
+            if self.recarrega():
+                espera = self._proxima_espera()
+            else:
+                # Dados antigos continuam no ar; novo ciclo de tentativas mais tarde
+                espera = self.espera_base * 2 ** self.tentativas * random.uniform(0.5, 1.5)
+
+    def _garante_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock_thread:
+            if self._thread is None or not self._thread.is_alive():
+                self._parar.clear()
+                self._thread = threading.Thread(
+                    target=self._laco, name="atualizador-planilha", daemon=True
+                )
+                self._thread.start()
+
+    def para(self):
+        """Interrompe a thread de recarga"""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
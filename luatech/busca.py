@@ -0,0 +1,146 @@
+# ============================================================================
+# BUSCA DE EMPRESAS
+# Índice montado uma vez por versão dos dados: Código, dígitos do CNPJ e
+# palavras da Razão Social sem acentos, com busca por prefixo e aproximada
+# ============================================================================
+
+import difflib
+import re
+
+import numpy as np
+import pandas as pd
+
+LIMITE_RESULTADOS = 20
+
+# Semelhança mínima (0 a 1) de uma palavra na busca aproximada
+SEMELHANCA_MINIMA = 0.75
+
+_SEPARADORES = re.compile(r"[^A-Z0-9]+")
+_FIM_PREFIXO = "\U0010ffff"
+
+
+def dobra_texto(serie: pd.Series) -> pd.Series:
+    """Texto em maiúsculas, sem acentos (ausentes viram vazio)"""
+    texto = serie.astype(object).where(serie.notna(), "").astype(str)
+    return (
+        texto.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii").str.upper()
+    )
+
+
+def so_digitos(serie: pd.Series) -> pd.Series:
+    """Somente os dígitos (CNPJ numérico recupera os zeros à esquerda)"""
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype("Int64").astype(str).str.zfill(14).where(serie.notna(), "")
+    texto = serie.astype(object).where(serie.notna(), "").astype(str)
+    return texto.str.replace(r"\D", "", regex=True)
+
+
+def _codigo_texto(serie: pd.Series) -> pd.Series:
+    """Código como texto sem ".0" (a planilha às vezes traz o código como float)"""
+    numeros = pd.to_numeric(serie, errors="coerce")
+    inteiros = numeros.round().astype("Int64").astype(str)
+    texto = serie.astype(object).where(serie.notna(), "").astype(str).str.strip()
+    return inteiros.where(numeros.notna(), texto)
+
+
+class _IndicePrefixo:
+    """Valores ordenados + posições, para buscar por prefixo com searchsorted"""
+
+    def __init__(self, valores: pd.Series):
+        ordenados = valores.reset_index(drop=True).sort_values(kind="stable")
+        self.valores = ordenados.to_numpy(dtype=object)
+        self.posicoes = ordenados.index.to_numpy()
+
+    def faixa(self, prefixo: str):
+        inicio = np.searchsorted(self.valores, prefixo, side="left")
+        fim = np.searchsorted(self.valores, prefixo + _FIM_PREFIXO, side="left")
+        return inicio, fim
+
+    def prefixo(self, prefixo: str) -> np.ndarray:
+        inicio, fim = self.faixa(prefixo)
+        return self.posicoes[inicio:fim]
+
+    def exato(self, valor: str) -> np.ndarray:
+        inicio = np.searchsorted(self.valores, valor, side="left")
+        fim = np.searchsorted(self.valores, valor, side="right")
+        return self.posicoes[inicio:fim]
+
+
+class IndiceEmpresas:
+    """Índice de busca sobre as linhas de `df` (posições 0..n-1).
+
+    - Consulta só com dígitos (pontuação do CNPJ é ignorada): Código exato,
+      prefixo do Código e prefixo do CNPJ.
+    - Texto: cada palavra da consulta precisa ser prefixo de alguma palavra
+      da Razão Social (sem acentos). Sem resultado, cada palavra é trocada
+      pelas palavras mais parecidas do vocabulário (mesma inicial).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        n = len(df)
+        vazio = pd.Series([""] * n, dtype=object)
+
+        self.codigos = _IndicePrefixo(_codigo_texto(df["Código"]) if "Código" in df.columns else vazio)
+        self.cnpjs = _IndicePrefixo(so_digitos(df["CNPJ"]) if "CNPJ" in df.columns else vazio)
+
+        # Palavras por Razão Social distinta (filiais repetem o nome da matriz)
+        nomes = dobra_texto(df["Razão Social"]) if "Razão Social" in df.columns else vazio
+        codigos_nome, unicos = pd.factorize(nomes.to_numpy(dtype=object))
+        palavras = pd.Series(unicos, dtype=object).str.split(_SEPARADORES).explode()
+        palavras = palavras[palavras.astype(bool)]
+        self.palavras = _IndicePrefixo(pd.Series(palavras.to_numpy(dtype=object), index=palavras.index.to_numpy()))
+        # posições do _IndicePrefixo de palavras = índice do nome distinto
+        self.palavras.posicoes = palavras.index.to_numpy()[self.palavras.posicoes]
+        self.vocabulario = np.unique(palavras.to_numpy(dtype=object)) if len(palavras) else np.array([], dtype=object)
+
+        # Linhas de cada nome distinto
+        self._ordem_nomes = np.argsort(codigos_nome, kind="stable")
+        self._inicio_nomes = np.searchsorted(codigos_nome[self._ordem_nomes], np.arange(len(unicos) + 1))
+
+    def _linhas_dos_nomes(self, nomes) -> np.ndarray:
+        partes = [self._ordem_nomes[self._inicio_nomes[i]:self._inicio_nomes[i + 1]] for i in nomes]
+        return np.concatenate(partes) if partes else np.array([], dtype=np.int64)
+
+    def _parecidas(self, palavra: str) -> list:
+        """Palavras do vocabulário parecidas com `palavra` (mesma letra inicial)"""
+        inicio = np.searchsorted(self.vocabulario, palavra[0], side="left")
+        fim = np.searchsorted(self.vocabulario, palavra[0] + _FIM_PREFIXO, side="left")
+        return difflib.get_close_matches(palavra, self.vocabulario[inicio:fim].tolist(), n=5, cutoff=SEMELHANCA_MINIMA)
+
+    def _por_palavras(self, palavras, aproximada: bool) -> np.ndarray:
+        nomes = None
+        for palavra in palavras:
+            if aproximada:
+                encontrados = [self.palavras.exato(p) for p in self._parecidas(palavra)]
+                achados = np.concatenate(encontrados) if encontrados else np.array([], dtype=np.int64)
+            else:
+                achados = self.palavras.prefixo(palavra)
+            achados = np.unique(achados)
+            nomes = achados if nomes is None else np.intersect1d(nomes, achados, assume_unique=True)
+            if not len(nomes):
+                break
+        return np.sort(self._linhas_dos_nomes(nomes if nomes is not None else []))
+
+    def busca(self, consulta: str, limite: int = LIMITE_RESULTADOS):
+        """(posições das linhas encontradas, se a busca foi aproximada)"""
+        consulta = (consulta or "").strip()
+        if not consulta:
+            return [], False
+
+        digitos = re.sub(r"[.\-/\s]", "", consulta)
+        if digitos.isdigit():
+            # Código exato primeiro, depois prefixos do Código e do CNPJ (na ordem da planilha)
+            exatos = self.codigos.exato(digitos)
+            prefixos = np.sort(np.concatenate([self.codigos.prefixo(digitos), self.cnpjs.prefixo(digitos)]))
+            posicoes = pd.unique(np.concatenate([exatos, prefixos]))
+            return posicoes[:limite].tolist(), False
+
+        palavras = [p for p in _SEPARADORES.split(dobra_texto(pd.Series([consulta])).iat[0]) if p]
+        if not palavras:
+            return [], False
+        posicoes = self._por_palavras(palavras, aproximada=False)
+        if len(posicoes):
+            return posicoes[:limite].tolist(), False
+        posicoes = self._por_palavras(palavras, aproximada=True)
+        return posicoes[:limite].tolist(), bool(len(posicoes))
@@ -0,0 +1,249 @@
+# ============================================================================
+# CACHE EM DISCO DA PLANILHA
+# Download condicional (ETag / If-Modified-Since / hash) com snapshot local
+# ============================================================================
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+from luatech.cliente_http import ClienteHTTP
+from luatech.instrumentacao import etapa
+from luatech.leitura_xlsx import ler_xlsx
+
+# Diretório padrão do cache (pode ser trocado pela variável de ambiente)
+DIRETORIO_CACHE_PADRAO = Path(
+    os.environ.get(
+        "GESTOR_FISCAL_CACHE_DIR",
+        Path(__file__).resolve().parent.parent / ".cache_gestor_fiscal"
+    )
+)
+
+
+def _grava_atomico(destino: Path, escreve):
+    """Grava um arquivo via temporário + rename, evitando arquivos pela metade"""
+    temporario = destino.with_name(destino.name + ".tmp")
+    try:
+        escreve(temporario)
+        os.replace(temporario, destino)
+    finally:
+        if temporario.exists():
+            temporario.unlink()
+
+
+def _copia(download, destino: Path):
+    with open(destino, "wb") as f:
+        download.copia_para(f)
+
+
+class CachePlanilha:
+    """Cache persistente da planilha: payload bruto + snapshot colunar por (url, aba).
+
+    A cada consulta envia uma requisição condicional. Se o servidor responder
+    304, ou se o conteúdo baixado tiver o mesmo hash do que já está em disco,
+    o snapshot salvo é devolvido sem reprocessar o xlsx.
+
+    Snapshot confirmado pela origem há menos de `janela_revalidacao` segundos
+    (p. ex. logo após um reinício) é devolvido sem consultar a rede; a
+    consulta seguinte, depois da janela, revalida. 0 = sempre revalida.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_CACHE_PADRAO, leitor=ler_xlsx, versao_leitor="", cliente=None,
+                 janela_revalidacao=0):
+        self.diretorio = Path(diretorio)
+        # Cliente HTTP com pool, timeouts e novas tentativas (compartilhável)
+        self.cliente = cliente or ClienteHTTP()
+        self.leitor = leitor
+        # Trocar o leitor (motor/colunas) invalida os snapshots anteriores
+        self.versao_leitor = versao_leitor
+        self.janela_revalidacao = janela_revalidacao
+        # Um lock por (url, aba): planilhas diferentes são baixadas em paralelo;
+        # `_lock` protege o registro desses locks e as estatísticas
+        self._lock = threading.Lock()
+        self._locks = {}
+        self.estatisticas = {
+            "acertos": 0,        # snapshot em disco reaproveitado
+            "faltas": 0,         # payload novo precisou ser lido
+            "revalidacoes": 0,   # requisições condicionais enviadas
+            "erros": 0,          # falhas de rede atendidas com o snapshot
+        }
+
+    # ------------------------------------------------------------------
+    # Caminhos e metadados
+    # ------------------------------------------------------------------
+
+    def _chave(self, url: str, aba: str) -> str:
+        return hashlib.sha256(f"{url}\0{aba}\0{self.versao_leitor}".encode("utf-8")).hexdigest()[:24]
+
+    def _caminhos(self, url: str, aba: str):
+        base = self.diretorio / self._chave(url, aba)
+        return {
+            "meta": base.with_suffix(".json"),
+            "bruto": base.with_suffix(".xlsx"),
+            "parquet": base.with_suffix(".parquet"),
+            "pickle": base.with_suffix(".pkl"),
+        }
+
+    def _lock_da(self, url: str, aba: str):
+        with self._lock:
+            return self._locks.setdefault((url, aba), threading.Lock())
+
+    def _conta(self, nome: str):
+        with self._lock:
+            self.estatisticas[nome] += 1
+
+    def _le_meta(self, caminhos):
+        try:
+            with open(caminhos["meta"], encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    # ------------------------------------------------------------------
+    # Snapshot
+    # ------------------------------------------------------------------
+
+    def carrega_snapshot(self, url: str, aba: str):
+        """Devolve o último snapshot salvo em disco (ou None), sem acessar a rede"""
+        caminhos = self._caminhos(url, aba)
+        meta = self._le_meta(caminhos)
+        if meta is None:
+            return None
+        try:
+            if meta.get("formato") == "parquet":
+                df = pd.read_parquet(caminhos["parquet"])
+            else:
+                df = pd.read_pickle(caminhos["pickle"])
+        except Exception:
+            return None
+        df.attrs["versao"] = meta.get("sha256")
+        # Última vez que a origem confirmou este conteúdo
+        df.attrs["consultado_em"] = meta.get("validado_em", meta.get("salvo_em"))
+        return df
+
+    def versao_snapshot(self, url: str, aba: str):
+        """Hash do snapshot salvo (ou None), lendo só os metadados"""
+        meta = self._le_meta(self._caminhos(url, aba))
+        return None if meta is None else meta.get("sha256")
+
+    def _salva(self, caminhos, download, df, meta: dict):
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        _grava_atomico(caminhos["bruto"], lambda p: _copia(download, p))
+
+        # Parquet quando possível; colunas com tipos mistos (comum em planilhas)
+        # não são aceitas pelo Arrow, então caímos para pickle.
+        try:
+            _grava_atomico(caminhos["parquet"], lambda p: df.to_parquet(p, index=False))
+            meta["formato"] = "parquet"
+        except Exception:
+            _grava_atomico(caminhos["pickle"], lambda p: df.to_pickle(p))
+            meta["formato"] = "pickle"
+
+        # Metadados por último: só apontam para snapshots completos
+        self._grava_meta(caminhos, meta)
+
+    def _grava_meta(self, caminhos, meta: dict):
+        _grava_atomico(
+            caminhos["meta"],
+            lambda p: p.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        )
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def obtem(self, url: str, aba: str, tolera_falha=True):
+        """Retorna o DataFrame da aba, baixando e lendo o xlsx só se ele mudou.
+
+        Com `tolera_falha`, erros de rede devolvem o último snapshot salvo;
+        sem ela o erro é propagado (quem chama decide se tenta de novo).
+        """
+        with self._lock_da(url, aba):
+            agora = time.time()
+            caminhos = self._caminhos(url, aba)
+            meta = self._le_meta(caminhos)
+
+            # Ainda dentro da janela: nem a requisição condicional é feita
+            if meta is not None and 0 <= agora - meta.get("validado_em", 0) < self.janela_revalidacao:
+                snapshot = self.carrega_snapshot(url, aba)
+                if snapshot is not None:
+                    self._conta("acertos")
+                    return snapshot
+
+            headers = {}
+            if meta is not None:
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+                self._conta("revalidacoes")
+
+            try:
+                download = self._baixa(url, headers)
+            except requests.RequestException:
+                if not tolera_falha:
+                    raise
+                snapshot = self.carrega_snapshot(url, aba) if meta is not None else None
+                if snapshot is None:
+                    raise
+                self._conta("erros")
+                return snapshot
+
+            try:
+                if download.status_code == 304:
+                    snapshot = self.carrega_snapshot(url, aba)
+                    if snapshot is not None:
+                        meta["validado_em"] = agora
+                        self._grava_meta(caminhos, meta)
+                        snapshot.attrs["consultado_em"] = agora
+                        self._conta("acertos")
+                        return snapshot
+                    # Snapshot sumiu do disco: refaz o download completo (o 304 é fechado antes)
+                    download.fecha()
+                    download = self._baixa(url)
+
+                novo_meta = {
+                    "url": url,
+                    "aba": aba,
+                    "etag": download.headers.get("ETag"),
+                    "last_modified": download.headers.get("Last-Modified"),
+                    "sha256": download.sha256,
+                    "salvo_em": agora,
+                    "validado_em": agora,
+                }
+
+                # Mesmo conteúdo sem suporte a 304: aproveita o snapshot existente
+                if meta is not None and meta.get("sha256") == download.sha256:
+                    snapshot = self.carrega_snapshot(url, aba)
+                    if snapshot is not None:
+                        novo_meta["formato"] = meta.get("formato")
+                        self._grava_meta(caminhos, novo_meta)
+                        snapshot.attrs["consultado_em"] = agora
+                        self._conta("acertos")
+                        return snapshot
+
+                return self._le_e_salva(caminhos, download, aba, novo_meta, agora)
+            finally:
+                download.fecha()
+
+    def _baixa(self, url: str, headers=None):
+        with etapa("download"):
+            download = self.cliente.baixa(url, headers=headers)
+        return download
+
+    def _le_e_salva(self, caminhos, download, aba, meta, agora):
+        with etapa("leitura_xlsx") as medicao:
+            df = self.leitor(download.conteudo(), aba)
+            medicao.linhas = len(df)
+        # Hash do conteúdo identifica a versão dos dados para os caches derivados
+        df.attrs["versao"] = download.sha256
+        df.attrs["consultado_em"] = agora
+        self._salva(caminhos, download, df, meta)
+        self._conta("faltas")
+        return df
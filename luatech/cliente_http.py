@@ -0,0 +1,177 @@
+# ============================================================================
+# CLIENTE HTTP
+# Sessão com pool de conexões, timeouts, novas tentativas com backoff e
+# download em streaming para um buffer em memória/disco
+# ============================================================================
+
+import hashlib
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Status que valem uma nova tentativa (limite de taxa e falhas do servidor)
+STATUS_REPETIVEIS = (429, 500, 502, 503, 504)
+
+# Erros de rede que valem uma nova tentativa
+ERROS_REPETIVEIS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class DownloadGrandeDemais(requests.RequestException):
+    """O corpo da resposta passou do limite configurado"""
+
+
+class Download:
+    """Resposta baixada: status, cabeçalhos e corpo em buffer temporário"""
+
+    def __init__(self, status_code, headers, arquivo=None, tamanho=0, sha256=None, duracao=0.0, tentativas=1):
+        self.status_code = status_code
+        self.headers = headers
+        self.arquivo = arquivo
+        self.tamanho = tamanho
+        self.sha256 = sha256
+        self.duracao = duracao
+        self.tentativas = tentativas
+
+    def conteudo(self) -> bytes:
+        """Corpo inteiro em bytes (vazio em respostas 304)"""
+        if self.arquivo is None:
+            return b""
+        self.arquivo.seek(0)
+        return self.arquivo.read()
+
+    def copia_para(self, destino):
+        """Copia o corpo para um arquivo aberto, sem carregá-lo inteiro na memória"""
+        if self.arquivo is not None:
+            self.arquivo.seek(0)
+            shutil.copyfileobj(self.arquivo, destino)
+
+    def fecha(self):
+        if self.arquivo is not None:
+            self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fecha()
+
+
+class ClienteHTTP:
+    """Cliente compartilhado entre sessões e threads (uma requests.Session com pool).
+
+    - `timeout`: (conexão, leitura) em segundos.
+    - `tentativas`: total de tentativas por download; a espera entre elas
+      cresce exponencialmente a partir de `espera_base`, até `espera_maxima`,
+      com jitter.
+    - O corpo é lido em blocos para um SpooledTemporaryFile: fica em memória
+      até `limite_memoria` bytes e vai para disco acima disso.
+    """
+
+    def __init__(self, timeout=(5, 60), tentativas=3, espera_base=0.5, espera_maxima=8.0,
+                 conexoes=4, limite_memoria=8 * 1024 * 1024, limite_bytes=200 * 1024 * 1024):
+        self.timeout = timeout
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.limite_memoria = limite_memoria
+        self.limite_bytes = limite_bytes
+
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes)
+        self.sessao.mount("https://", adaptador)
+        self.sessao.mount("http://", adaptador)
+
+        self._lock = threading.Lock()
+        self.metricas = {
+            "downloads": 0,
+            "bytes": 0,
+            "segundos": 0.0,
+            "novas_tentativas": 0,
+            "falhas": 0,
+        }
+        self.ultimo = None
+
+    def _espera(self, tentativa: int, resposta=None) -> float:
+        """Backoff exponencial com jitter (respeita Retry-After, dentro do máximo)"""
+        if resposta is not None and resposta.headers.get("Retry-After", "").isdigit():
+            return min(float(resposta.headers["Retry-After"]), self.espera_maxima)
+        return min(self.espera_base * 2 ** tentativa, self.espera_maxima) * random.uniform(0.5, 1.0)
+
+    def _registra(self, download=None, novas_tentativas=0, falhou=False):
+        with self._lock:
+            self.metricas["novas_tentativas"] += novas_tentativas
+            if falhou:
+                self.metricas["falhas"] += 1
+                return
+            self.metricas["downloads"] += 1
+            self.metricas["bytes"] += download.tamanho
+            self.metricas["segundos"] += download.duracao
+            self.ultimo = {
+                "status": download.status_code,
+                "bytes": download.tamanho,
+                "segundos": round(download.duracao, 3),
+                "tentativas": download.tentativas,
+            }
+
+    def _baixa_corpo(self, resposta):
+        """Lê o corpo em blocos para o buffer, calculando o hash no caminho"""
+        arquivo = tempfile.SpooledTemporaryFile(max_size=self.limite_memoria)
+        resumo = hashlib.sha256()
+        tamanho = 0
+        try:
+            for bloco in resposta.iter_content(chunk_size=64 * 1024):
+                tamanho += len(bloco)
+                if tamanho > self.limite_bytes:
+                    raise DownloadGrandeDemais(f"Resposta maior que {self.limite_bytes} bytes")
+                resumo.update(bloco)
+                arquivo.write(bloco)
+        except BaseException:
+            arquivo.close()
+            raise
+        arquivo.seek(0)
+        return arquivo, tamanho, resumo.hexdigest()
+
+    def baixa(self, url: str, headers=None) -> Download:
+        """GET com novas tentativas; respostas 304 voltam sem corpo"""
+        inicio = time.perf_counter()
+        tentativa = 0
+        while True:
+            resposta = None
+            try:
+                resposta = self.sessao.get(url, headers=headers, timeout=self.timeout, stream=True)
+                if resposta.status_code in STATUS_REPETIVEIS and tentativa + 1 < self.tentativas:
+                    raise requests.HTTPError(f"{resposta.status_code} em {url}", response=resposta)
+                resposta.raise_for_status()
+                if resposta.status_code == 304:
+                    arquivo, tamanho, sha256 = None, 0, None
+                else:
+                    arquivo, tamanho, sha256 = self._baixa_corpo(resposta)
+                break
+            except (*ERROS_REPETIVEIS, requests.HTTPError) as e:
+                repetivel = isinstance(e, ERROS_REPETIVEIS) or (
+                    resposta is not None and resposta.status_code in STATUS_REPETIVEIS
+                )
+                if not repetivel or tentativa + 1 >= self.tentativas:
+                    self._registra(novas_tentativas=tentativa, falhou=True)
+                    raise
+                time.sleep(self._espera(tentativa, resposta))
+                tentativa += 1
+            finally:
+                if resposta is not None:
+                    resposta.close()
+
+        download = Download(
+            resposta.status_code, resposta.headers, arquivo, tamanho, sha256,
+            duracao=time.perf_counter() - inicio, tentativas=tentativa + 1
+        )
+        self._registra(download, novas_tentativas=tentativa)
+        return download
@@ -0,0 +1,146 @@
+# ============================================================================
+# ESCRITÓRIOS
+# Registro das planilhas de cada escritório, carregadas em paralelo e
+# juntadas em um único DataFrame com a coluna "Escritório"
+# ============================================================================
+
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+
+COLUNA_ESCRITORIO = "Escritório"
+
+logger = logging.getLogger("gestor_fiscal.escritorios")
+
+
+class Escritorio:
+    """Uma planilha de origem (nome exibido, URL de exportação e aba)"""
+
+    def __init__(self, nome, url, aba="GERAL"):
+        self.nome = nome
+        self.url = url
+        self.aba = aba
+
+
+# Planilha usada quando não há registro de escritórios
+PLANILHA_PADRAO = Escritorio(
+    "VIDAL",
+    "https://docs.google.com/spreadsheets/d/1bp7qtkKvsMHMvHjGznT6OwyX_YSQWMa3jVvylOJWSxM/export?format=xlsx",
+    "GERAL"
+)
+
+
+def carrega_registro(caminho, padrao: Escritorio = PLANILHA_PADRAO) -> list:
+    """Escritórios do arquivo JSON ([{"nome", "url", "aba"}]); sem arquivo, só o padrão"""
+    caminho = Path(caminho)
+    if not caminho.exists():
+        return [padrao]
+    with open(caminho, encoding="utf-8") as f:
+        itens = json.load(f)
+    return [Escritorio(i["nome"], i["url"], i.get("aba", padrao.aba)) for i in itens]
+
+
+class CargaEscritorios:
+    """Carregador das planilhas de todos os escritórios (interface do atualizador).
+
+    Cada escritório é buscado em uma thread do pool; o tempo total fica
+    perto do da planilha mais lenta. Um escritório que falha, ou que passa
+    de `timeout` segundos, não bloqueia os demais: entra com a última
+    versão boa (se houver) e fica registrado em `falhas`. A busca atrasada
+    segue no pool e a carga seguinte a espera de novo em vez de repeti-la.
+
+    `salvo(url, aba)`, opcional, devolve sem rede o último DataFrame salvo
+    do escritório (ou None); é a base de `salvos()`.
+    """
+
+    def __init__(self, escritorios, obtem, max_workers=8, timeout=120, salvo=None):
+        self.escritorios = list(escritorios)
+        self._obtem = obtem
+        self._salvo = salvo
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(self.escritorios))),
+            thread_name_prefix="escritorio"
+        )
+        self._ultimos = {}
+        self._pendentes = {}   # nome -> busca que passou do timeout
+        self.falhas = {}
+
+    def __call__(self, tolera_falha=True) -> pd.DataFrame:
+        futuros = {}
+        for e in self.escritorios:
+            pendente = self._pendentes.pop(e.nome, None)
+            if pendente is not None and not pendente.done():
+                # Ainda presa: não ocupa outra thread do pool com a mesma planilha
+                futuros[pendente] = e
+                continue
+            if pendente is not None and pendente.exception() is None and pendente.result() is not None:
+                # Terminou depois do timeout anterior: vale como última versão boa
+                self._ultimos[e.nome] = pendente.result()
+            futuros[self._pool.submit(self._obtem, e.url, e.aba, tolera_falha=tolera_falha)] = e
+        wait(futuros, timeout=self.timeout)
+
+        partes, falhas = [], {}
+        for futuro, escritorio in futuros.items():
+            if futuro.done() and futuro.exception() is None and futuro.result() is not None:
+                self._ultimos[escritorio.nome] = futuro.result()
+            elif futuro.done():
+                falhas[escritorio.nome] = str(futuro.exception() or "planilha vazia")
+            else:
+                # Segue no pool: a próxima carga a recolhe em vez de submeter outra
+                self._pendentes[escritorio.nome] = futuro
+                falhas[escritorio.nome] = f"sem resposta em {self.timeout} s"
+            if escritorio.nome in self._ultimos:
+                partes.append((escritorio.nome, self._ultimos[escritorio.nome]))
+
+        self.falhas = falhas
+        for nome, erro in falhas.items():
+            logger.warning("Falha ao carregar o escritório %s: %s", nome, erro)
+        if not partes:
+            raise RuntimeError("Nenhuma planilha de escritório disponível: " + "; ".join(
+                f"{nome}: {erro}" for nome, erro in falhas.items()
+            ))
+        return junta(partes)
+
+    def salvos(self):
+        """Planilhas salvas em disco de todos os escritórios (None se não houver nenhuma)"""
+        if self._salvo is None:
+            return None
+        partes = []
+        for escritorio in self.escritorios:
+            try:
+                df = self._salvo(escritorio.url, escritorio.aba)
+            except Exception as e:
+                logger.warning("Falha ao ler a planilha salva do escritório %s: %s", escritorio.nome, e)
+                continue
+            if df is not None:
+                # Vale como última versão boa se a primeira carga falhar
+                self._ultimos.setdefault(escritorio.nome, df)
+                partes.append((escritorio.nome, df))
+        return junta(partes) if partes else None
+
+    def fecha(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def junta(partes) -> pd.DataFrame:
+    """Concatena [(escritório, DataFrame)] com a coluna do escritório na frente"""
+    frames = []
+    for nome, df in partes:
+        df = df.copy(deep=False)
+        df.insert(0, COLUNA_ESCRITORIO, nome)
+        frames.append(df)
+    junto = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    # Versão do conjunto = versões de cada escritório
+    assinatura = "|".join(f"{nome}:{df.attrs.get('versao')}" for nome, df in partes)
+    junto.attrs["versao"] = hashlib.sha256(assinatura.encode("utf-8")).hexdigest()
+    consultas = [df.attrs.get("consultado_em") for _, df in partes if df.attrs.get("consultado_em")]
+    # Consulta mais recente (quem ficou para trás aparece em CargaEscritorios.falhas)
+    junto.attrs["consultado_em"] = max(consultas) if consultas else time.time()
+    return junto
@@ -0,0 +1,232 @@
+# ============================================================================
+# ESQUEMA DA ABA GERAL
+# Tipo, formatos de data, obrigatoriedade e status aceitos de cada coluna,
+# aplicados uma vez por versão dos dados: as páginas recebem as colunas já
+# tipadas e o que não pôde ser convertido vai para o relatório de validação
+# ============================================================================
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from luatech.escritorios import COLUNA_ESCRITORIO
+
+TEXTO = "texto"
+NUMERO = "numero"
+DATA = "data"
+
+# Formatos tentados, em ordem, para datas digitadas como texto
+FORMATOS_DATA = ("%d/%m/%Y", "%m/%Y", "%Y-%m-%d", "%m-%Y", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S")
+
+# Datas como número de série do Excel/Sheets
+ORIGEM_SERIAL = pd.Timestamp("1899-12-30")
+
+# Textos tratados como célula vazia em colunas de número/data
+VAZIOS = ("", "-")
+
+# Problemas do relatório
+AUSENTE = "coluna obrigatória ausente"
+NUMERO_INVALIDO = "número inválido"
+DATA_INVALIDA = "data inválida"
+FORA_DA_LISTA = "status fora da lista"
+
+# Linhas guardadas no relatório (o resumo conta todas)
+LIMITE_PROBLEMAS = 5000
+
+_COLUNAS_IDENTIFICACAO = (COLUNA_ESCRITORIO, "Código", "Razão Social")
+
+
+class Coluna:
+    """Declaração de uma coluna da aba GERAL.
+
+    - `tipo`: TEXTO (mantida como veio), NUMERO (float) ou DATA (datetime).
+    - `obrigatoria`: a ausência entra no relatório (as páginas seguem sem ela).
+    - `valores`: status aceitos, comparados em maiúsculas; vazio é sempre aceito.
+    """
+
+    def __init__(self, nome, tipo=TEXTO, obrigatoria=False, valores=None, formatos=FORMATOS_DATA):
+        self.nome = nome
+        self.tipo = tipo
+        self.obrigatoria = obrigatoria
+        self.valores = None if valores is None else frozenset(valores)
+        self.formatos = tuple(formatos)
+
+
+ESQUEMA_GERAL = (
+    Coluna("Código", obrigatoria=True),
+    Coluna("Razão Social", obrigatoria=True),
+    Coluna("CNPJ", obrigatoria=True),
+    Coluna("Regime", valores=["SIMPLES NACIONAL", "LUCRO PRESUMIDO", "LUCRO REAL", "MEI"]),
+    Coluna("Município"),
+    Coluna("Estado"),
+    Coluna("Matriz / Filial", valores=["MATRIZ", "FILIAL"]),
+    Coluna("MATRIZ / FILIAL", valores=["MATRIZ", "FILIAL"]),
+    Coluna("Situação", obrigatoria=True, valores=["ATIVA", "INATIVA", "BAIXADA", "SUSPENSA"]),
+    Coluna("Insc. Estadual"),
+    Coluna("PERÍODO DE COMPETÊNCIA", DATA, obrigatoria=True),
+    # SIMPLES NACIONAL / REINF
+    Coluna("SIMPLES GERADO", valores=["OK", "GERADO", "FILIAL"]),
+    Coluna("TRANSMISSÃO", valores=["OK", "FILIAL"]),
+    # DCTF WEB
+    Coluna("PERÍODO", DATA),
+    Coluna("ORIGEM"),
+    Coluna("TIPO"),
+    Coluna("SITUAÇÃO DCTF", valores=["ATIVA", "SEM PROCURAÇÃO", "EM ANDAMENTO", "FILIAL"]),
+    # DMS
+    Coluna("FATURAMENTO SERVIÇOS", NUMERO),
+    Coluna("BASE DE CÁLCULO ISS", NUMERO),
+    Coluna("XML DMS", valores=["OK"]),
+    Coluna("DMS", valores=["DMS SALVA", "SEM ACESSO", "SEM MOVIMENTO", "FILIAL"]),
+    Coluna("GUIA ISS DMS", valores=["OK", "N/A"]),
+    # SERVIÇOS TOMADOS
+    Coluna("REST", valores=["REST SALVA", "SEM ACESSO", "FILIAL"]),
+    Coluna("XML REST", valores=["OK"]),
+    Coluna("GUIA ISS REST", valores=["OK", "N/A"]),
+    # SEFAZ
+    Coluna("XML ENTRADA", valores=["OK"]),
+    Coluna("XML SAÍDA", valores=["OK"]),
+    Coluna("IMPORTAÇÃO", valores=["CONCLUÍDO", "EM ANDAMENTO", "OUTRO ESTADO", "SEM MOVIMENTO", "FILIAL"]),
+    Coluna("TOTAL ENTRADA", NUMERO),
+    Coluna("TOTAL SAÍDA", NUMERO),
+    Coluna("TOTAL DOMÍNIO", NUMERO),
+)
+
+
+class ValidacaoPlanilha:
+    """Relatório da aplicação do esquema: colunas ausentes e células rejeitadas"""
+
+    def __init__(self, colunas_ausentes, problemas: pd.DataFrame, contagem: pd.DataFrame):
+        self.colunas_ausentes = list(colunas_ausentes)
+        self.problemas = problemas      # Escritório?, Código, Razão Social, Coluna, Valor, Problema
+        self.contagem = contagem        # Coluna, Problema, Linhas (sem o limite de LIMITE_PROBLEMAS)
+
+    @property
+    def vazia(self) -> bool:
+        return not self.colunas_ausentes and self.contagem.empty
+
+    def resumo(self) -> dict:
+        """{problema: linhas} para logs e painéis"""
+        totais = self.contagem.groupby("Problema", sort=False)["Linhas"].sum().to_dict() if len(self.contagem) else {}
+        if self.colunas_ausentes:
+            totais[AUSENTE] = len(self.colunas_ausentes)
+        return {k: int(v) for k, v in totais.items()}
+
+
+# ============================================================================
+# CONVERSÕES
+# ============================================================================
+
+def _numero(serie: pd.Series):
+    """(float64, inválidas); texto em pt-BR (R$ 1.234,56) também é aceito"""
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        return serie.astype(np.float64), np.zeros(len(serie), dtype=bool)
+    valores = serie.astype(object)
+    numeros = pd.to_numeric(valores, errors="coerce").astype(np.float64)
+    invalidas = np.zeros(len(serie), dtype=bool)
+
+    # Só o que o to_numeric recusou é tratado como texto
+    posicoes = np.flatnonzero(numeros.isna().to_numpy() & valores.notna().to_numpy())
+    if len(posicoes):
+        texto = valores.iloc[posicoes].astype(str).str.replace("R$", "", regex=False).str.strip()
+        virgula = texto.str.contains(",", regex=False)
+        texto = texto.where(~virgula, texto.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+        convertidos = pd.to_numeric(texto, errors="coerce").to_numpy(np.float64)
+        numeros.iloc[posicoes] = convertidos
+        invalidas[posicoes] = np.isnan(convertidos) & ~texto.isin(VAZIOS).to_numpy()
+    return numeros, invalidas
+
+
+def _data(serie: pd.Series, formatos):
+    """(datetime64, inválidas): datas, números de série ou texto em um dos `formatos`"""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie, np.zeros(len(serie), dtype=bool)
+    valores = serie.to_numpy(dtype=object)
+    datas = np.full(len(valores), np.datetime64("NaT"), dtype="datetime64[ns]")
+    tipos = pd.Series(valores).map(type)
+
+    # Datas já reconhecidas pelo leitor e números de série
+    eh_data = tipos.map(lambda t: issubclass(t, (datetime.date, np.datetime64))).to_numpy()
+    if eh_data.any():
+        datas[eh_data] = pd.to_datetime(pd.Series(valores[eh_data]), errors="coerce").to_numpy("datetime64[ns]")
+    eh_numero = tipos.map(lambda t: issubclass(t, (int, float, np.number)) and not issubclass(t, bool)).to_numpy()
+    eh_numero = eh_numero & ~pd.isna(valores)
+    if eh_numero.any():
+        dias = pd.to_numeric(pd.Series(valores[eh_numero]), errors="coerce")
+        datas[eh_numero] = (ORIGEM_SERIAL + pd.to_timedelta(dias, unit="D")).to_numpy("datetime64[ns]")
+
+    # Texto: cada formato só tenta o que os anteriores não converteram
+    posicoes = np.flatnonzero(~(eh_data | eh_numero) & ~pd.isna(valores))
+    texto = pd.Series(valores[posicoes]).astype(str).str.strip()
+    preenchidas = ~texto.isin(VAZIOS).to_numpy()
+    posicoes, texto = posicoes[preenchidas], texto[preenchidas]
+    for formato in formatos:
+        if not len(posicoes):
+            break
+        convertidas = pd.to_datetime(texto, format=formato, errors="coerce")
+        ok = convertidas.notna().to_numpy()
+        datas[posicoes[ok]] = convertidas[ok].to_numpy("datetime64[ns]")
+        posicoes, texto = posicoes[~ok], texto[~ok]
+
+    invalidas = (eh_data | eh_numero) & np.isnat(datas)
+    invalidas[posicoes] = True
+    return pd.Series(datas, index=serie.index, name=serie.name), invalidas
+
+
+def _fora_da_lista(serie: pd.Series, aceitos) -> np.ndarray:
+    """Status fora de `aceitos` (em maiúsculas); compara só os valores distintos"""
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    if not len(unicos):
+        return np.zeros(len(serie), dtype=bool)
+    normalizados = (str(v).strip().upper() for v in unicos)
+    fora = np.array([v != "" and v not in aceitos for v in normalizados], dtype=bool)
+    return np.where(codigos >= 0, fora[np.maximum(codigos, 0)], False)
+
+
+# ============================================================================
+# APLICAÇÃO
+# ============================================================================
+
+def aplica(df: pd.DataFrame, esquema=ESQUEMA_GERAL):
+    """Converte as colunas para os tipos declarados e valida os status.
+
+    Devolve (DataFrame tipado, ValidacaoPlanilha). Valores que não puderam
+    ser convertidos ficam ausentes e vão para o relatório; status fora da
+    lista são mantidos (as regras das obrigações decidem o que fazer).
+    """
+    tipado = df.copy(deep=False)
+    ausentes = [c.nome for c in esquema if c.obrigatoria and c.nome not in df.columns]
+    ocorrencias = []   # (coluna, problema, máscara)
+    for coluna in esquema:
+        if coluna.nome not in df.columns:
+            continue
+        serie = df[coluna.nome]
+        if coluna.tipo == NUMERO:
+            tipado[coluna.nome], invalidas = _numero(serie)
+            ocorrencias.append((coluna.nome, NUMERO_INVALIDO, invalidas))
+        elif coluna.tipo == DATA:
+            tipado[coluna.nome], invalidas = _data(serie, coluna.formatos)
+            ocorrencias.append((coluna.nome, DATA_INVALIDA, invalidas))
+        if coluna.valores is not None:
+            ocorrencias.append((coluna.nome, FORA_DA_LISTA, _fora_da_lista(serie, coluna.valores)))
+    tipado.attrs = dict(df.attrs)
+
+    contagem = pd.DataFrame(
+        [(nome, problema, int(mascara.sum())) for nome, problema, mascara in ocorrencias if mascara.any()],
+        columns=["Coluna", "Problema", "Linhas"]
+    )
+    identificacao = [c for c in _COLUNAS_IDENTIFICACAO if c in df.columns]
+    partes, guardadas = [], 0
+    for nome, problema, mascara in ocorrencias:
+        if guardadas >= LIMITE_PROBLEMAS or not mascara.any():
+            continue
+        posicoes = np.flatnonzero(mascara)[:LIMITE_PROBLEMAS - guardadas]
+        guardadas += len(posicoes)
+        parte = df[identificacao].iloc[posicoes].astype(object)
+        parte["Coluna"] = nome
+        parte["Valor"] = df[nome].iloc[posicoes].astype(object).astype(str).to_numpy()
+        parte["Problema"] = problema
+        partes.append(parte)
+    colunas = identificacao + ["Coluna", "Valor", "Problema"]
+    problemas = pd.concat(partes) if partes else pd.DataFrame(columns=colunas)
+    return tipado, ValidacaoPlanilha(ausentes, problemas[colunas], contagem)
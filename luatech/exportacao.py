@@ -0,0 +1,97 @@
+# ============================================================================
+# EXPORTAÇÃO
+# Geração dos arquivos de download (xlsx / csv / parquet)
+# ============================================================================
+
+from datetime import date
+from io import BytesIO
+
+import pandas as pd
+
+# Formato -> (extensão, mime, rótulo do botão)
+FORMATOS = {
+    "xlsx": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "Baixar Excel"),
+    "csv": ("csv", "text/csv", "Baixar CSV"),
+    "parquet": ("parquet", "application/vnd.apache.parquet", "Baixar Parquet"),
+}
+
+# A partir deste tamanho o xlsx é escrito linha a linha em memória constante
+LIMITE_LINHAS_MEMORIA_CONSTANTE = 20000
+
+
+def _tem_xlsxwriter() -> bool:
+    try:
+        import xlsxwriter  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _valor_celula(valor):
+    """Converte valores do pandas para tipos aceitos pelo xlsxwriter"""
+    if valor is None or (not isinstance(valor, str) and pd.isna(valor)):
+        return None
+    if isinstance(valor, pd.Timestamp):
+        return valor.to_pydatetime()
+    return valor
+
+
+def _escreve_aba(wb, aba: str, df: pd.DataFrame, formato_data, cabecalho):
+    ws = wb.add_worksheet(aba[:31])
+    ws.write_row(0, 0, [str(c) for c in df.columns], cabecalho)
+    for linha, valores in enumerate(df.itertuples(index=False, name=None), start=1):
+        for col, valor in enumerate(valores):
+            valor = _valor_celula(valor)
+            if valor is None:
+                continue
+            if isinstance(valor, date):
+                ws.write_datetime(linha, col, valor, formato_data)
+            else:
+                ws.write(linha, col, valor)
+
+
+def escreve_xlsx_abas(abas: dict, saida):
+    """Escreve {aba: DataFrame} em um único xlsx, linha a linha (constant_memory)"""
+    import xlsxwriter
+
+    wb = xlsxwriter.Workbook(saida, {"constant_memory": True, "in_memory": False})
+    formato_data = wb.add_format({"num_format": "dd/mm/yyyy"})
+    cabecalho = wb.add_format({"bold": True})
+    for aba, df in abas.items():
+        _escreve_aba(wb, aba, df, formato_data, cabecalho)
+    wb.close()
+
+
+def escreve_xlsx_streaming(df: pd.DataFrame, saida, aba: str = "Sheet1"):
+    """Escreve o xlsx linha a linha com o modo constant_memory do xlsxwriter"""
+    escreve_xlsx_abas({aba: df}, saida)
+
+
+def _para_parquet(df: pd.DataFrame) -> pd.DataFrame:
+    """Colunas de texto (ou categorias) com tipos mistos viram texto (o Arrow não aceita mistura)"""
+    ajustado = df.copy()
+    for col in ajustado.columns:
+        serie = ajustado[col]
+        if isinstance(serie.dtype, pd.CategoricalDtype) and serie.cat.categories.dtype == object:
+            serie = serie.astype(object)
+        if serie.dtype == object:
+            ajustado[col] = serie.where(serie.isna(), serie.astype(str))
+    return ajustado
+
+
+def gera_arquivo(df: pd.DataFrame, formato: str = "xlsx") -> bytes:
+    """Gera o conteúdo do arquivo de download no formato pedido"""
+    saida = BytesIO()
+    if formato == "xlsx":
+        if len(df) >= LIMITE_LINHAS_MEMORIA_CONSTANTE and _tem_xlsxwriter():
+            escreve_xlsx_streaming(df, saida)
+        else:
+            df.to_excel(saida, index=False)
+    elif formato == "csv":
+        # Separador ';' e BOM para o Excel em pt-BR abrir direto
+        df.to_csv(saida, index=False, sep=";", decimal=",", encoding="utf-8-sig")
+    elif formato == "parquet":
+        _para_parquet(df).to_parquet(saida, index=False)
+    else:
+        raise ValueError(f"Formato de exportação desconhecido: {formato}")
+    return saida.getvalue()
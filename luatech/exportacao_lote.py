@@ -0,0 +1,137 @@
+# ============================================================================
+# EXPORTAÇÃO EM LOTE
+# Todos os relatórios a partir de uma única carga da planilha, sem navegador:
+# um xlsx com uma aba por relatório (mais o RESUMO dos totalizadores) ou um
+# diretório de arquivos Parquet/CSV. Pode ser agendado (cron, Agendador de
+# Tarefas); usa o mesmo cache em disco do aplicativo.
+# Uso: python -m luatech.exportacao_lote --saida relatorios.xlsx
+#      python -m luatech.exportacao_lote --saida relatorios/ --formato parquet
+# ============================================================================
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Logs JSON por etapa só quando pedidos (a saída do comando é o resumo)
+os.environ.setdefault("GESTOR_FISCAL_LOG_DESEMPENHO", "off")
+
+from luatech.cache_planilha import CachePlanilha  # noqa: E402
+from luatech.cliente_http import ClienteHTTP  # noqa: E402
+from luatech.escritorios import COLUNA_ESCRITORIO, PLANILHA_PADRAO, CargaEscritorios, Escritorio, carrega_registro  # noqa: E402
+from luatech.exportacao import FORMATOS, escreve_xlsx_abas, gera_arquivo  # noqa: E402
+from luatech.historico import HistoricoCompetencias  # noqa: E402
+from luatech.leitura_xlsx import assinatura_leitura, ler_xlsx  # noqa: E402
+from luatech.normalizacao import DadosNormalizados  # noqa: E402
+from luatech.relatorios import RELATORIOS, monta_todos, resumo  # noqa: E402
+
+ABA_RESUMO = "RESUMO"
+
+
+def carrega_planilha(arquivo=None, url=None, aba=PLANILHA_PADRAO.aba, registro=None) -> pd.DataFrame:
+    """Aba GERAL de um xlsx local, de uma URL ou de todos os escritórios do registro"""
+    if arquivo:
+        return ler_xlsx(Path(arquivo).read_bytes(), aba)
+
+    if url:
+        escritorios = [Escritorio(PLANILHA_PADRAO.nome, url, aba)]
+    else:
+        escritorios = carrega_registro(registro or "escritorios.json")
+    cache = CachePlanilha(leitor=ler_xlsx, versao_leitor=assinatura_leitura(), cliente=ClienteHTTP())
+    carga = CargaEscritorios(escritorios, cache.obtem)
+    # Escritórios que falharem são avisados pelo log de luatech.escritorios
+    try:
+        return carga(tolera_falha=True)
+    finally:
+        carga.fecha()
+
+
+def grava(relatorios: dict, tabela_resumo: pd.DataFrame, saida, formato="xlsx") -> list:
+    """Grava os relatórios; devolve os caminhos escritos"""
+    saida = Path(saida)
+    if formato == "xlsx":
+        abas = {ABA_RESUMO: tabela_resumo}
+        abas.update({pagina: relatorio.df for pagina, relatorio in relatorios.items()})
+        saida.parent.mkdir(parents=True, exist_ok=True)
+        # Arquivo temporário + troca: quem abrir o xlsx nunca o vê pela metade
+        temporario = saida.with_name(saida.name + ".tmp")
+        try:
+            escreve_xlsx_abas(abas, str(temporario))
+        except ImportError:
+            with pd.ExcelWriter(temporario, engine="openpyxl") as writer:
+                for aba, df in abas.items():
+                    df.to_excel(writer, sheet_name=aba[:31], index=False)
+        os.replace(temporario, saida)
+        return [saida]
+
+    extensao = FORMATOS[formato][0]
+    saida.mkdir(parents=True, exist_ok=True)
+    arquivos = {"resumo": tabela_resumo}
+    arquivos.update({relatorio.nome_arquivo: relatorio.df for relatorio in relatorios.values()})
+    escritos = []
+    for nome, df in arquivos.items():
+        caminho = saida / f"{nome}.{extensao}"
+        caminho.write_bytes(gera_arquivo(df, formato))
+        escritos.append(caminho)
+    return escritos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera todos os relatórios do Gestor Fiscal de uma vez")
+    parser.add_argument("--saida", required=True, help="arquivo .xlsx ou diretório (parquet/csv)")
+    parser.add_argument("--formato", choices=list(FORMATOS), help="padrão: pela extensão da saída")
+    origem = parser.add_mutually_exclusive_group()
+    origem.add_argument("--arquivo", help="xlsx local em vez da planilha online")
+    origem.add_argument("--url", help="URL de exportação de uma única planilha")
+    origem.add_argument("--competencia", help="competência do histórico (MM/AAAA)")
+    parser.add_argument("--aba", default=PLANILHA_PADRAO.aba)
+    parser.add_argument(
+        "--escritorios", default=os.environ.get("GESTOR_FISCAL_ESCRITORIOS", "escritorios.json"),
+        help="registro de escritórios (JSON); sem ele, a planilha padrão"
+    )
+    parser.add_argument("--escritorio", help="somente este escritório")
+    parser.add_argument("--paginas", nargs="+", choices=list(RELATORIOS), help="padrão: todas")
+    args = parser.parse_args(argv)
+
+    formato = args.formato or ("xlsx" if args.saida.lower().endswith(".xlsx") else None)
+    if formato is None:
+        parser.error("informe --formato para saídas que não terminam em .xlsx")
+
+    inicio = time.perf_counter()
+    try:
+        if args.competencia:
+            df = HistoricoCompetencias().carrega(args.competencia)
+        else:
+            df = carrega_planilha(args.arquivo, args.url, args.aba, args.escritorios)
+    except Exception as e:
+        print(f"Erro ao ler a planilha: {e}", file=sys.stderr)
+        return 1
+    if args.escritorio:
+        if COLUNA_ESCRITORIO not in df.columns:
+            print("A planilha não tem a coluna de escritório", file=sys.stderr)
+            return 1
+        df = df[(df[COLUNA_ESCRITORIO] == args.escritorio).to_numpy()]
+    carregado = time.perf_counter()
+
+    dados = DadosNormalizados(df)
+    relatorios = monta_todos(dados, args.paginas)
+    escritos = grava(relatorios, resumo(relatorios, dados.competencia), args.saida, formato)
+
+    for pagina, relatorio in relatorios.items():
+        print(f"{pagina:<20}{len(relatorio.df):>8} linhas")
+    if not dados.validacao.vazia:
+        print("Validação da planilha: " + " | ".join(f"{k}: {v}" for k, v in dados.validacao.resumo().items()))
+    print(
+        f"Competência {dados.competencia or '-'} | leitura {carregado - inicio:.1f} s | "
+        f"relatórios e gravação {time.perf_counter() - carregado:.1f} s"
+    )
+    for caminho in escritos:
+        print(caminho)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
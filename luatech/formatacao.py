@@ -0,0 +1,90 @@
+# ============================================================================
+# FORMATAÇÃO PT-BR
+# Moeda (R$) e datas: as colunas seguem numéricas/datas até o navegador e
+# os formatadores do AgGrid montam o texto
+# ============================================================================
+
+import pandas as pd
+from st_aggrid import JsCode
+
+# Formatos aceitos em `formatos={coluna: formato}` dos grids
+MOEDA = "moeda"   # R$ 1.234,56
+DATA = "data"     # 31/12/2024
+MES = "mes"       # 12-2024
+
+
+# ============================================================================
+# SERVIDOR
+# ============================================================================
+
+def datas_iso(df: pd.DataFrame) -> pd.DataFrame:
+    """Colunas de data em AAAA-MM-DD para o grid (o st_aggrid converteria linha a linha)"""
+    colunas = [c for c, dtype in df.dtypes.items() if dtype.kind == "M"]
+    if not colunas:
+        return df
+    convertido = df.copy(deep=False)  # só as colunas de data são trocadas
+    for col in colunas:
+        texto = convertido[col].dt.strftime("%Y-%m-%d")
+        convertido[col] = texto.astype(object).where(texto.notna(), None)
+    return convertido
+
+
+def formatos_padrao(df: pd.DataFrame, formatos=None) -> dict:
+    """Formatos informados + DD/MM/AAAA para as demais colunas de data"""
+    padrao = {str(c): DATA for c, dtype in df.dtypes.items() if dtype.kind == "M"}
+    padrao.update(formatos or {})
+    return padrao
+
+
+# ============================================================================
+# NAVEGADOR (AGGRID)
+# ============================================================================
+
+FORMATADOR_MOEDA = JsCode("""
+function(params) {
+    if (params.value === null || params.value === undefined || params.value === '') return '';
+    return Number(params.value).toLocaleString('pt-BR', {style: 'currency', currency: 'BRL'});
+}
+""")
+
+FORMATADOR_DATA = JsCode("""
+function(params) {
+    if (!params.value) return '';
+    const [ano, mes, dia] = String(params.value).slice(0, 10).split('-');
+    return dia + '/' + mes + '/' + ano;
+}
+""")
+
+FORMATADOR_MES = JsCode("""
+function(params) {
+    if (!params.value) return '';
+    const [ano, mes] = String(params.value).slice(0, 10).split('-');
+    return mes + '-' + ano;
+}
+""")
+
+# Comparador do filtro de data sobre os textos AAAA-MM-DD enviados ao grid
+COMPARADOR_DATA = JsCode("""
+function(filtro, valor) {
+    if (!valor) return -1;
+    const [ano, mes, dia] = String(valor).slice(0, 10).split('-').map(Number);
+    const data = new Date(ano, mes - 1, dia);
+    return data < filtro ? -1 : (data > filtro ? 1 : 0);
+}
+""")
+
+_FORMATADORES = {MOEDA: FORMATADOR_MOEDA, DATA: FORMATADOR_DATA, MES: FORMATADOR_MES}
+
+
+def configura_formatos(gb, formatos: dict, filtros=True):
+    """Aplica os formatadores pt-BR às colunas do GridOptionsBuilder"""
+    for col, formato in formatos.items():
+        opcoes = {"valueFormatter": _FORMATADORES[formato]}
+        if formato == MOEDA:
+            opcoes["type"] = ["numericColumn"]
+            if filtros:
+                opcoes["filter"] = "agNumberColumnFilter"
+        elif filtros:
+            opcoes["filter"] = "agDateColumnFilter"
+            opcoes["filterParams"] = {"comparator": COMPARADOR_DATA}
+        gb.configure_column(col, **opcoes)
@@ -0,0 +1,101 @@
+# ============================================================================
+# GRID
+# gridOptions padrão do AgGrid (filtros por tipo, formatos pt-BR e textos
+# em português), sem depender do Streamlit
+# ============================================================================
+
+import pandas as pd
+from st_aggrid import GridOptionsBuilder, JsCode
+
+from luatech import formatacao
+from luatech.mudancas import COLUNA_ALTERADAS, TODAS
+
+# Tradução do AgGrid para português (criada uma vez só)
+LOCALE_PT_BR = {
+    'filterOoo': 'Filtrar...',
+    'searchOoo': 'Pesquisar...',
+    'contains': 'Contém',
+    'notContains': 'Não contém',
+    'equals': 'Igual',
+    'notEqual': 'Diferente',
+    'startsWith': 'Começa com',
+    'endsWith': 'Termina com',
+    'blank': 'Em branco',
+    'notBlank': 'Não em branco',
+    'andCondition': 'E',
+    'orCondition': 'OU',
+    'applyFilter': 'Aplicar',
+    'resetFilter': 'Limpar',
+    'clearFilter': 'Limpar filtro',
+    'lessThan': 'Menor que',
+    'greaterThan': 'Maior que',
+    'lessThanOrEqual': 'Menor ou igual',
+    'greaterThanOrEqual': 'Maior ou igual',
+    'inRange': 'Entre',
+    'pinColumn': 'Fixar coluna',
+    'autosizeThiscolumn': 'Ajustar esta coluna',
+    'autosizeAllColumns': 'Ajustar todas as colunas',
+    'groupBy': 'Agrupar por',
+    'resetColumns': 'Resetar colunas',
+    'noRowsToShow': 'Nenhum registro para mostrar',
+    'loadingOoo': 'Carregando...',
+}
+
+
+# Células alteradas desde a atualização anterior (linha inserida: todas)
+DESTAQUE_ALTERADAS = JsCode(f"""
+function(params) {{
+    const alteradas = params.data && params.data.{COLUNA_ALTERADAS};
+    if (!alteradas) return null;
+    if (alteradas.includes('|{TODAS}|') || alteradas.includes('|' + params.colDef.field + '|')) {{
+        return {{backgroundColor: '#fff3b0'}};
+    }}
+    return null;
+}}
+""")
+
+
+def monta_opcoes_grid(df_vazio: pd.DataFrame, paginado=False, formatos=()) -> dict:
+    """Monta o gridOptions padrão (filtros por tipo e textos em português)"""
+    gb = GridOptionsBuilder.from_dataframe(df_vazio)
+
+    # Configuração padrão para todas as colunas
+    # (paginado: filtro e ordenação são feitos no servidor, sobre todas as linhas)
+    gb.configure_default_column(
+        filter=not paginado,
+        sortable=not paginado,
+        editable=False,
+        resizable=True
+    )
+
+    # Configura filtros corretos por tipo de coluna
+    for col, dtype in df_vazio.dtypes.items():
+        if paginado:
+            break
+        if pd.api.types.is_numeric_dtype(dtype):
+            gb.configure_column(col, filter="agNumberColumnFilter")
+        else:
+            gb.configure_column(col, filter="agTextColumnFilter")
+
+    # Coluna oculta com as colunas alteradas de cada linha (destaque das células)
+    if COLUNA_ALTERADAS in df_vazio.columns:
+        gb.configure_column(COLUNA_ALTERADAS, hide=True)
+        gb.configure_default_column(cellStyle=DESTAQUE_ALTERADAS)
+
+    # Moeda e datas formatadas no navegador (o valor continua cru: filtro e ordenação corretos)
+    formatacao.configura_formatos(gb, dict(formatos), filtros=not paginado)
+
+    # Configurações gerais do grid com localização em português
+    gb.configure_grid_options(
+        domLayout="normal",
+        floatingFilter=not paginado,
+        headerHeight=40,
+        rowHeight=30,
+        enableBrowserTooltips=True,
+        enableCellTextSelection=True,
+        suppressMenuHide=True,
+        # Tradução para português
+        localeText=LOCALE_PT_BR
+    )
+
+    return gb.build()
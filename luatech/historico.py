@@ -0,0 +1,205 @@
+# ============================================================================
+# HISTÓRICO POR COMPETÊNCIA
+# Snapshots da planilha GERAL em SQLite, uma partição por competência,
+# gravando a cada atualização só as linhas que mudaram
+# ============================================================================
+
+import json
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from luatech.cache_planilha import DIRETORIO_CACHE_PADRAO
+from luatech.escritorios import COLUNA_ESCRITORIO
+from luatech.normalizacao import formata_competencia
+
+# Colunas que identificam uma empresa na planilha (a ordem de repetição
+# desempata códigos iguais, como Matriz e Filial)
+COLUNAS_CHAVE = (COLUNA_ESCRITORIO, "Código", "CNPJ")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS competencias (
+    competencia TEXT PRIMARY KEY,
+    colunas     TEXT NOT NULL,
+    datas       TEXT NOT NULL,
+    versao      TEXT,
+    ingerido_em REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS linhas (
+    competencia TEXT NOT NULL,
+    chave       TEXT NOT NULL,
+    ordem       INTEGER NOT NULL,
+    hash        INTEGER NOT NULL,
+    dados       TEXT NOT NULL,
+    PRIMARY KEY (competencia, chave)
+);
+"""
+
+
+def como_texto(df: pd.DataFrame) -> pd.DataFrame:
+    """Valores como texto, ausentes viram "".
+
+    Cada coluna vira categórica sobre os textos distintos: cada valor é
+    convertido (e hasheado) uma vez só, com o mesmo hash do texto puro.
+    """
+    colunas = {}
+    for col, serie in df.items():
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            codigos, distintos = serie.cat.codes.to_numpy(), serie.cat.categories
+        else:
+            codigos, distintos = pd.factorize(serie)
+        distintos = pd.Index(distintos)
+        if pd.api.types.is_string_dtype(distintos.dtype) and distintos.dtype != object:
+            textos = list(distintos.to_numpy(dtype=object)) + [""]
+        else:
+            textos = [str(v) for v in distintos.astype(object)] + [""]
+        # Valores diferentes com o mesmo texto (1 e "1") viram a mesma categoria
+        recodificados, categorias = pd.factorize(np.array(textos, dtype=object))
+        colunas[col] = pd.Categorical.from_codes(recodificados[codigos], categories=categorias)
+    return pd.DataFrame(colunas, index=df.index)
+
+
+def chaves_linhas(df: pd.DataFrame) -> pd.Series:
+    """Chave estável de cada linha: Código|CNPJ|ocorrência"""
+    colunas = [c for c in COLUNAS_CHAVE if c in df.columns]
+    if not colunas:
+        return pd.Series(range(len(df)), index=df.index).astype(str)
+    texto = como_texto(df[colunas]).astype(object)
+    base = texto.iloc[:, 0].str.cat([texto[c] for c in colunas[1:]], sep="|") if len(colunas) > 1 else texto.iloc[:, 0]
+    return base + "|" + base.groupby(base).cumcount().astype(str)
+
+
+def hashes_linhas(df: pd.DataFrame) -> pd.Series:
+    """Hash do conteúdo de cada linha (int64, para caber no SQLite)"""
+    hashes = pd.util.hash_pandas_object(como_texto(df), index=False).to_numpy()
+    return pd.Series(hashes.view("int64"), index=df.index)
+
+
+def _ordena_competencias(competencias):
+    """MM/AAAA da mais recente para a mais antiga"""
+    return sorted(competencias, key=lambda c: (c[3:], c[:2]), reverse=True)
+
+
+class HistoricoCompetencias:
+    """Armazém local de snapshots da planilha, particionado por competência"""
+
+    def __init__(self, caminho=DIRETORIO_CACHE_PADRAO / "historico.sqlite3"):
+        self.caminho = Path(caminho)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._conecta()) as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(_ESQUEMA)
+
+    def _conecta(self):
+        return sqlite3.connect(self.caminho, timeout=30)
+
+    # ------------------------------------------------------------------
+    # Gravação
+    # ------------------------------------------------------------------
+
+    def ingere(self, df: pd.DataFrame) -> dict:
+        """Grava o snapshot na partição da sua competência (só linhas alteradas)"""
+        competencia = formata_competencia(df)
+        if not competencia:
+            return {"inseridas": 0, "alteradas": 0, "removidas": 0}
+
+        df = df.reset_index(drop=True)
+        chaves = chaves_linhas(df)
+        hashes = hashes_linhas(df)
+        datas = [str(c) for c, dtype in df.dtypes.items() if pd.api.types.is_datetime64_any_dtype(dtype)]
+
+        with closing(self._conecta()) as con, con:
+            anteriores = {
+                chave: (ordem, h) for chave, ordem, h in con.execute(
+                    "SELECT chave, ordem, hash FROM linhas WHERE competencia = ?", (competencia,)
+                )
+            }
+
+            novas, reordenadas, inseridas = [], [], 0
+            for posicao, (chave, h) in enumerate(zip(chaves, hashes)):
+                anterior = anteriores.pop(chave, None)
+                if anterior is None:
+                    inseridas += 1
+                if anterior is None or anterior[1] != h:
+                    novas.append(posicao)
+                elif anterior[0] != posicao:
+                    reordenadas.append((posicao, competencia, chave))
+
+            # Serializa só as linhas novas/alteradas
+            if novas:
+                valores = json.loads(df.iloc[novas].to_json(
+                    orient="values", date_format="iso", date_unit="s", double_precision=15
+                ))
+                con.executemany(
+                    "INSERT OR REPLACE INTO linhas (competencia, chave, ordem, hash, dados) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (competencia, chaves.iat[p], p, int(hashes.iat[p]), json.dumps(v, ensure_ascii=False))
+                        for p, v in zip(novas, valores)
+                    ]
+                )
+            if reordenadas:
+                con.executemany(
+                    "UPDATE linhas SET ordem = ? WHERE competencia = ? AND chave = ?", reordenadas
+                )
+            if anteriores:
+                con.executemany(
+                    "DELETE FROM linhas WHERE competencia = ? AND chave = ?",
+                    [(competencia, chave) for chave in anteriores]
+                )
+            con.execute(
+                "INSERT OR REPLACE INTO competencias (competencia, colunas, datas, versao, ingerido_em) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    competencia,
+                    json.dumps([str(c) for c in df.columns], ensure_ascii=False),
+                    json.dumps(datas, ensure_ascii=False),
+                    df.attrs.get("versao"),
+                    time.time(),
+                )
+            )
+
+        return {
+            "inseridas": inseridas,
+            "alteradas": len(novas) - inseridas,
+            "removidas": len(anteriores),
+        }
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def competencias(self) -> list:
+        """Competências armazenadas, da mais recente para a mais antiga"""
+        with closing(self._conecta()) as con:
+            return _ordena_competencias([c for (c,) in con.execute("SELECT competencia FROM competencias")])
+
+    def versao(self, competencia: str):
+        """Versão dos dados da última ingestão da competência (ou None)"""
+        with closing(self._conecta()) as con:
+            linha = con.execute(
+                "SELECT versao FROM competencias WHERE competencia = ?", (competencia,)
+            ).fetchone()
+        return linha[0] if linha else None
+
+    def carrega(self, competencia: str) -> pd.DataFrame:
+        """Snapshot da competência, na ordem da planilha e com as datas restauradas"""
+        with closing(self._conecta()) as con:
+            meta = con.execute(
+                "SELECT colunas, datas, versao FROM competencias WHERE competencia = ?", (competencia,)
+            ).fetchone()
+            if meta is None:
+                return pd.DataFrame()
+            linhas = con.execute(
+                "SELECT dados FROM linhas WHERE competencia = ? ORDER BY ordem", (competencia,)
+            ).fetchall()
+
+        colunas, datas, versao = json.loads(meta[0]), json.loads(meta[1]), meta[2]
+        df = pd.DataFrame([json.loads(d) for (d,) in linhas], columns=colunas)
+        for col in datas:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+        df.attrs["versao"] = versao
+        return df
@@ -0,0 +1,165 @@
+# ============================================================================
+# INSTRUMENTAÇÃO
+# Tempo por etapa de renderização, logs JSON e percentis por página
+# ============================================================================
+
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+
+import pandas as pd
+
+# Destino dos logs JSON: "stderr" (padrão), caminho de arquivo ou "off"
+DESTINO_LOG = os.environ.get("GESTOR_FISCAL_LOG_DESEMPENHO", "stderr")
+
+logger = logging.getLogger("gestor_fiscal.desempenho")
+
+# Medição da página em andamento (as etapas internas são atribuídas a ela)
+_medicao_pagina = contextvars.ContextVar("medicao_pagina", default=None)
+_dentro_de_etapa = contextvars.ContextVar("dentro_de_etapa", default=False)
+
+
+def _configura_logger():
+    if logger.handlers or DESTINO_LOG == "off":
+        return
+    if DESTINO_LOG == "stderr":
+        handler = logging.StreamHandler(sys.stderr)
+    else:
+        handler = logging.FileHandler(DESTINO_LOG, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+_configura_logger()
+
+
+class Medicao:
+    """Duração e quantidade de linhas de uma etapa"""
+
+    def __init__(self, etapa, pagina=None, linhas=None):
+        self.etapa = etapa
+        self.pagina = pagina
+        self.linhas = linhas
+        self.duracao = None
+        self.filhos = 0.0  # tempo das etapas internas (só para páginas)
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    posicao = max(0, min(len(ordenados) - 1, round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[posicao]
+
+
+class Metricas:
+    """Janela das últimas medições por (página, etapa), compartilhada entre sessões"""
+
+    def __init__(self, janela=500):
+        self._lock = threading.Lock()
+        self._amostras = defaultdict(lambda: deque(maxlen=janela))
+
+    def registra(self, medicao: Medicao):
+        with self._lock:
+            self._amostras[(medicao.pagina or "-", medicao.etapa)].append(
+                (medicao.duracao, medicao.linhas)
+            )
+        if logger.handlers:
+            logger.info(json.dumps({
+                "ts": round(time.time(), 3),
+                "pagina": medicao.pagina,
+                "etapa": medicao.etapa,
+                "ms": round(medicao.duracao * 1000, 2),
+                "linhas": medicao.linhas,
+            }, ensure_ascii=False))
+
+    def resumo(self) -> pd.DataFrame:
+        """p50/p95 (ms) e última contagem de linhas por página e etapa"""
+        with self._lock:
+            itens = {chave: list(amostras) for chave, amostras in self._amostras.items()}
+        linhas = []
+        for (pagina, etapa), amostras in sorted(itens.items()):
+            duracoes = [d * 1000 for d, _ in amostras]
+            linhas.append({
+                "Página": pagina,
+                "Etapa": etapa,
+                "Amostras": len(duracoes),
+                "p50 (ms)": round(_percentil(duracoes, 50), 1),
+                "p95 (ms)": round(_percentil(duracoes, 95), 1),
+                "Linhas": amostras[-1][1],
+            })
+        return pd.DataFrame(linhas)
+
+    def limpa(self):
+        with self._lock:
+            self._amostras.clear()
+
+
+METRICAS = Metricas()
+
+
+@contextmanager
+def etapa(nome: str, pagina=None, linhas=None):
+    """Mede um trecho; use `medicao.linhas = ...` dentro do bloco para anotar linhas"""
+    pai = _medicao_pagina.get()
+    medicao = Medicao(nome, pagina or (pai.pagina if pai else None), linhas)
+    # Só etapas de primeiro nível descontam do tempo próprio da página
+    externa = not _dentro_de_etapa.get()
+    token = _dentro_de_etapa.set(True)
+    inicio = time.perf_counter()
+    try:
+        yield medicao
+    finally:
+        medicao.duracao = time.perf_counter() - inicio
+        _dentro_de_etapa.reset(token)
+        if pai is not None and externa:
+            pai.filhos += medicao.duracao
+        METRICAS.registra(medicao)
+
+
+def _conta_linhas(args, resultado):
+    for valor in (*args[:1], resultado):
+        if isinstance(valor, pd.DataFrame):
+            return len(valor)
+    return None
+
+
+def cronometrado(nome: str):
+    """Decorador: registra a duração da função como uma etapa"""
+    def decorador(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with etapa(nome) as medicao:
+                resultado = func(*args, **kwargs)
+                medicao.linhas = _conta_linhas(args, resultado)
+            return resultado
+        return wrapper
+    return decorador
+
+
+def pagina_instrumentada(nome: str):
+    """Decorador das páginas: mede o total e o tempo próprio (transformações)"""
+    def decorador(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            medicao = Medicao("pagina", nome)
+            token = _medicao_pagina.set(medicao)
+            inicio = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _medicao_pagina.reset(token)
+                medicao.duracao = time.perf_counter() - inicio
+                METRICAS.registra(medicao)
+                proprio = Medicao("transformacao", nome)
+                proprio.duracao = max(medicao.duracao - medicao.filhos, 0.0)
+                METRICAS.registra(proprio)
+        return wrapper
+    return decorador
@@ -0,0 +1,192 @@
+# ============================================================================
+# LEITURA VIA SHEETS API
+# Fonte alternativa à exportação xlsx: só as colunas usadas da aba, em uma
+# requisição batchGet, sem decodificar xlsx
+# ============================================================================
+
+import hashlib
+import json
+import re
+import threading
+import time
+
+import pandas as pd
+
+from luatech.instrumentacao import etapa
+from luatech.leitura_xlsx import COLUNAS_USADAS
+
+# Colunas de data (a API devolve o número serial do Sheets)
+COLUNAS_DATA = ("PERÍODO DE COMPETÊNCIA", "PERÍODO")
+ORIGEM_SERIAL = pd.Timestamp("1899-12-30")
+
+PARAMETROS_LEITURA = {
+    "majorDimension": "COLUMNS",
+    "valueRenderOption": "UNFORMATTED_VALUE",
+    "dateTimeRenderOption": "SERIAL_NUMBER",
+}
+
+# Consultas seguidas aceitas com o cabeçalho mudando antes de desistir
+CONSULTAS_CABECALHO = 3
+
+
+def chave_planilha(url: str) -> str:
+    """ID da planilha a partir da URL (export, edit ou o próprio ID)"""
+    encontrado = re.search(r"/spreadsheets/d/([a-zA-Z0-9_-]+)", url)
+    return encontrado.group(1) if encontrado else url
+
+
+def letra_coluna(indice: int) -> str:
+    """Índice 0-based -> letra A1 (0 = A, 26 = AA)"""
+    letras = ""
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def _grupos(indices) -> list:
+    """Índices de coluna agrupados em blocos vizinhos [início, fim]"""
+    grupos = []
+    for i in sorted(indices):
+        if grupos and grupos[-1][1] == i - 1:
+            grupos[-1][1] = i
+        else:
+            grupos.append([i, i])
+    return grupos
+
+
+def faixas_colunas(aba: str, indices) -> list:
+    """Faixas A1 abertas, uma por bloco de colunas vizinhas ('GERAL'!C2:F)"""
+    return [f"'{aba}'!{letra_coluna(a)}2:{letra_coluna(b)}" for a, b in _grupos(indices)]
+
+
+def _colunas_por_indice(indices: dict, faixas_valores: list) -> dict:
+    """Índice da coluna -> valores, a partir das faixas devolvidas pelo batchGet"""
+    colunas = {}
+    for (inicio, _), faixa in zip(_grupos(indices.values()), faixas_valores):
+        # Colunas vazias no fim da faixa simplesmente não vêm na resposta
+        for deslocamento, valores in enumerate(faixa.get("values", [])):
+            colunas[inicio + deslocamento] = valores
+    return colunas
+
+
+def _indices_usados(cabecalho, colunas):
+    """Nome -> índice das colunas mantidas (primeira ocorrência de cada nome)"""
+    conjunto = None if colunas is None else set(colunas)
+    indices = {}
+    for i, nome in enumerate(cabecalho):
+        nome = str(nome).strip()
+        if not nome or nome in indices or (conjunto is not None and nome not in conjunto):
+            continue
+        indices[nome] = i
+    return indices
+
+
+def monta_dataframe(indices: dict, colunas_valores: dict) -> pd.DataFrame:
+    """DataFrame a partir das colunas devolvidas pela API (índice -> valores)"""
+    total = max((len(v) for v in colunas_valores.values()), default=0)
+    dados = {}
+    for nome, i in indices.items():
+        valores = colunas_valores.get(i, [])
+        valores = [None if v == "" else v for v in valores] + [None] * (total - len(valores))
+        serie = pd.Series(valores, dtype=object)
+        if nome in COLUNAS_DATA:
+            numeros = pd.to_numeric(serie, errors="coerce")
+            serie = ORIGEM_SERIAL + pd.to_timedelta(numeros, unit="D")
+        else:
+            serie = serie.infer_objects()
+        dados[nome] = serie
+    df = pd.DataFrame(dados)
+    # Linhas totalmente vazias (a faixa aberta pode incluir formatação sem dado)
+    return df.dropna(how="all").reset_index(drop=True)
+
+
+class FonteSheetsAPI:
+    """Fonte da planilha via Sheets API (gspread), com a mesma interface do CachePlanilha.
+
+    O cabeçalho da aba fica memorizado: cada consulta é um único batchGet com
+    a linha 1 + as faixas das colunas usadas. Se o cabeçalho mudou, as faixas
+    são recalculadas e a consulta é refeita até o cabeçalho se repetir.
+
+    Um lock por (planilha, aba): escritórios diferentes consultam em paralelo.
+    """
+
+    def __init__(self, cliente, colunas=COLUNAS_USADAS):
+        self.cliente = cliente
+        self.colunas = colunas
+        self._lock = threading.Lock()   # protege _locks e estatisticas
+        self._locks = {}
+        self._cabecalhos = {}
+        self._ultimos = {}
+        self.estatisticas = {
+            "acertos": 0,        # conteúdo igual ao da última consulta
+            "faltas": 0,         # DataFrame novo montado
+            "revalidacoes": 0,   # consultas à API
+            "erros": 0,          # falhas atendidas com o último resultado
+        }
+
+    def _lock_da(self, chave: str, aba: str):
+        with self._lock:
+            return self._locks.setdefault((chave, aba), threading.Lock())
+
+    def _conta(self, nome: str):
+        with self._lock:
+            self.estatisticas[nome] += 1
+
+    def _consulta(self, chave: str, aba: str, cabecalho):
+        """batchGet da linha 1 + colunas usadas; índices None = cabeçalho mudou"""
+        indices = _indices_usados(cabecalho or [], self.colunas)
+        faixas = [f"'{aba}'!1:1"] + (faixas_colunas(aba, indices.values()) if indices else [])
+        resposta = self.cliente.http_client.values_batch_get(chave, faixas, params=dict(PARAMETROS_LEITURA))
+        faixas_valores = resposta.get("valueRanges", [])
+
+        # Linha 1 em COLUMNS: uma lista de um valor por coluna
+        novo_cabecalho = [coluna[0] if coluna else "" for coluna in faixas_valores[0].get("values", [])]
+        if novo_cabecalho != cabecalho:
+            return novo_cabecalho, None, faixas_valores
+
+        return novo_cabecalho, indices, faixas_valores
+
+    def obtem(self, url: str, aba: str, tolera_falha=True):
+        """Retorna o DataFrame da aba; só remonta o DataFrame se o conteúdo mudou"""
+        chave = chave_planilha(url)
+        with self._lock_da(chave, aba):
+            agora = time.time()
+            self._conta("revalidacoes")
+            try:
+                with etapa("download"):
+                    cabecalho = self._cabecalhos.get((chave, aba))
+                    for _ in range(CONSULTAS_CABECALHO):
+                        # Cabeçalho novo (ou primeira consulta): refaz com as faixas certas
+                        cabecalho, indices, faixas_valores = self._consulta(chave, aba, cabecalho)
+                        if indices is not None:
+                            break
+                    else:
+                        raise RuntimeError(
+                            f"Cabeçalho da aba {aba} mudou em {CONSULTAS_CABECALHO} consultas seguidas"
+                        )
+            except Exception:
+                anterior = self._ultimos.get((chave, aba))
+                if not tolera_falha or anterior is None:
+                    raise
+                self._conta("erros")
+                return anterior
+            self._cabecalhos[(chave, aba)] = cabecalho
+
+            bruto = json.dumps(faixas_valores, ensure_ascii=False, sort_keys=True).encode("utf-8")
+            versao = hashlib.sha256(bruto).hexdigest()
+            anterior = self._ultimos.get((chave, aba))
+            if anterior is not None and anterior.attrs.get("versao") == versao:
+                anterior.attrs["consultado_em"] = agora
+                self._conta("acertos")
+                return anterior
+
+            with etapa("leitura_sheets") as medicao:
+                df = monta_dataframe(indices, _colunas_por_indice(indices, faixas_valores[1:]))
+                medicao.linhas = len(df)
+            df.attrs["versao"] = versao
+            df.attrs["consultado_em"] = agora
+            self._ultimos[(chave, aba)] = df
+            self._conta("faltas")
+            return df
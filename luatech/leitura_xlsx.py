@@ -0,0 +1,137 @@
+# ============================================================================
+# LEITURA DO XLSX
+# Motores de leitura plugáveis com poda de colunas
+# ============================================================================
+
+import hashlib
+from io import BytesIO
+
+import pandas as pd
+
+# União das colunas lidas pelas páginas (o restante da aba GERAL é ignorado)
+COLUNAS_USADAS = (
+    "Código", "Razão Social", "CNPJ", "Regime", "Município", "Estado",
+    "Matriz / Filial", "MATRIZ / FILIAL", "Situação", "Insc. Estadual",
+    "PERÍODO DE COMPETÊNCIA",
+    # SIMPLES NACIONAL / REINF
+    "SIMPLES GERADO", "TRANSMISSÃO",
+    # DCTF WEB
+    "PERÍODO", "ORIGEM", "TIPO", "SITUAÇÃO DCTF",
+    # DMS
+    "FATURAMENTO SERVIÇOS", "BASE DE CÁLCULO ISS", "XML DMS", "DMS", "GUIA ISS DMS",
+    # SERVIÇOS TOMADOS
+    "REST", "XML REST", "GUIA ISS REST",
+    # SEFAZ
+    "XML ENTRADA", "XML SAÍDA", "IMPORTAÇÃO", "TOTAL ENTRADA", "TOTAL SAÍDA", "TOTAL DOMÍNIO",
+)
+
+# Ordem de preferência quando nenhum motor é informado
+MOTORES_PREFERIDOS = ("calamine", "openpyxl_streaming", "openpyxl")
+
+# Textos lidos como célula vazia: os na_values padrão do pandas, que o
+# read_excel (calamine/openpyxl) já aplica; o motor streaming aplica os mesmos
+VALORES_AUSENTES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+
+# Muda quando o resultado da leitura muda (invalida os snapshots em disco)
+VERSAO_LEITURA = 2
+
+
+def _filtro_colunas(colunas):
+    """Callable de usecols que compara os nomes já sem espaços nas bordas"""
+    if colunas is None:
+        return None
+    conjunto = set(colunas)
+    return lambda nome: str(nome).strip() in conjunto
+
+
+def _ler_pandas(conteudo: bytes, aba: str, colunas, engine: str):
+    return pd.read_excel(
+        BytesIO(conteudo), sheet_name=aba, engine=engine, usecols=_filtro_colunas(colunas)
+    )
+
+
+def _ler_calamine(conteudo: bytes, aba: str, colunas):
+    return _ler_pandas(conteudo, aba, colunas, "calamine")
+
+
+def _ler_openpyxl(conteudo: bytes, aba: str, colunas):
+    return _ler_pandas(conteudo, aba, colunas, "openpyxl")
+
+
+def _ler_openpyxl_streaming(conteudo: bytes, aba: str, colunas):
+    """Lê linha a linha em modo read-only, guardando só as colunas pedidas"""
+    from openpyxl import load_workbook
+
+    conjunto = None if colunas is None else set(colunas)
+    wb = load_workbook(BytesIO(conteudo), read_only=True, data_only=True)
+    try:
+        linhas = wb[aba].iter_rows(values_only=True)
+        cabecalho = next(linhas, None)
+        if cabecalho is None:
+            return pd.DataFrame()
+
+        # Índices das colunas mantidas (primeira ocorrência de cada nome)
+        indices = {}
+        for i, nome in enumerate(cabecalho):
+            if nome is None:
+                continue
+            nome = str(nome).strip()
+            if nome in indices or (conjunto is not None and nome not in conjunto):
+                continue
+            indices[nome] = i
+
+        dados = {nome: [] for nome in indices}
+        pares = list(indices.items())
+        for linha in linhas:
+            valores = [linha[i] if i < len(linha) else None for _, i in pares]
+            if all(v is None or v == "" for v in valores):
+                continue
+            for (nome, _), valor in zip(pares, valores):
+                dados[nome].append(None if valor in VALORES_AUSENTES else valor)
+    finally:
+        wb.close()
+
+    return pd.DataFrame(dados)
+
+
+MOTORES = {
+    "calamine": _ler_calamine,
+    "openpyxl_streaming": _ler_openpyxl_streaming,
+    "openpyxl": _ler_openpyxl,
+}
+
+
+def motor_disponivel(motor: str) -> bool:
+    """Indica se as dependências do motor estão instaladas"""
+    if motor == "calamine":
+        try:
+            import python_calamine  # noqa: F401
+        except ImportError:
+            return False
+    return motor in MOTORES
+
+
+def assinatura_leitura(motor=None, colunas=COLUNAS_USADAS) -> str:
+    """Identifica a configuração de leitura (entra na chave do cache em disco)"""
+    texto = f"{VERSAO_LEITURA}|{motor or 'auto'}|{'*' if colunas is None else '|'.join(sorted(colunas))}"
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:12]
+
+
+def ler_xlsx(conteudo: bytes, aba: str, motor=None, colunas=COLUNAS_USADAS):
+    """Converte o conteúdo xlsx em DataFrame usando o motor mais rápido disponível.
+
+    `colunas=None` lê a aba inteira. Se o motor escolhido falhar, a leitura
+    é refeita com o openpyxl padrão.
+    """
+    escolhido = motor or next(m for m in MOTORES_PREFERIDOS if motor_disponivel(m))
+    try:
+        df = MOTORES[escolhido](conteudo, aba, colunas)
+    except Exception:
+        if escolhido == "openpyxl":
+            raise
+        df = _ler_openpyxl(conteudo, aba, colunas)
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
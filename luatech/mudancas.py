@@ -0,0 +1,182 @@
+# ============================================================================
+# MUDANÇAS ENTRE ATUALIZAÇÕES
+# Hash por empresa (mesma chave e hash do histórico) guardado entre as
+# versões da planilha: empresas inseridas, alteradas (com as células que
+# mudaram) e removidas, e o feed das últimas atualizações
+# ============================================================================
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from luatech.escritorios import COLUNA_ESCRITORIO
+from luatech.historico import chaves_linhas, como_texto, hashes_linhas
+from luatech.normalizacao import formata_competencia
+
+# Coluna oculta do grid com as colunas alteradas da linha ("|Col A|Col B|";
+# "|*|" = linha inserida)
+COLUNA_ALTERADAS = "_alteradas"
+TODAS = "*"
+
+INSERIDA = "Inserida"
+ALTERADA = "Alterada"
+REMOVIDA = "Removida"
+
+# Atualizações guardadas no feed
+LIMITE_FEED = 20
+
+_COLUNAS_IDENTIFICACAO = (COLUNA_ESCRITORIO, "Código", "Razão Social")
+
+
+class Mudancas:
+    """Diferença entre duas versões da planilha, por empresa.
+
+    Rótulos são os do índice da versão nova (inseridas/alteradas); as
+    removidas só existem na anterior e ficam no `feed`.
+    """
+
+    def __init__(self, versao_anterior, versao, inseridas, alteradas, origem, removidas, feed, mesmas_colunas):
+        self.versao_anterior = versao_anterior
+        self.versao = versao
+        self.em = time.time()
+        self.inseridas = inseridas          # Index de rótulos da versão nova
+        self.alteradas = alteradas          # {rótulo: (colunas alteradas, ...)}
+        self.removidas = removidas          # quantidade
+        self.feed = feed                    # DataFrame: Mudança, identificação, Colunas
+        self.mesmas_colunas = mesmas_colunas
+        self._origem = origem               # rótulo novo -> rótulo anterior (linhas iguais)
+
+    @property
+    def vazia(self) -> bool:
+        return not (len(self.inseridas) or self.alteradas or self.removidas)
+
+    def contagem(self) -> dict:
+        return {INSERIDA: len(self.inseridas), ALTERADA: len(self.alteradas), REMOVIDA: self.removidas}
+
+    def rotulos_anteriores(self, rotulos) -> np.ndarray:
+        """Rótulo na versão anterior de cada linha igual; -1 nas inseridas/alteradas"""
+        return self._origem.reindex(rotulos, fill_value=-1).to_numpy()
+
+    def marcacoes(self, rotulos, colunas=None) -> np.ndarray:
+        """Valores da COLUNA_ALTERADAS para as linhas de `rotulos` ("" = sem mudança).
+
+        Com `colunas`, só contam as alterações nessas colunas (as exibidas).
+        """
+        marcas = pd.Series("", index=pd.Index(rotulos), dtype=object)
+        if len(self.inseridas):
+            marcas[marcas.index.isin(self.inseridas)] = f"|{TODAS}|"
+        if self.alteradas:
+            visiveis = None if colunas is None else set(colunas)
+            presentes = marcas.index.isin(list(self.alteradas))
+            alteradas = [
+                [c for c in self.alteradas[r] if visiveis is None or c in visiveis]
+                for r in marcas.index[presentes]
+            ]
+            marcas[presentes] = ["|" + "|".join(c) + "|" if c else "" for c in alteradas]
+        return marcas.to_numpy()
+
+
+def assinatura(df: pd.DataFrame) -> tuple:
+    """(chave, hash) de cada linha, guardados entre uma versão e a seguinte"""
+    return chaves_linhas(df).to_numpy(), hashes_linhas(df).to_numpy()
+
+
+def compara(anterior: pd.DataFrame, atual: pd.DataFrame, assinatura_anterior=None, assinatura_atual=None) -> Mudancas:
+    """Inseridas, alteradas (célula a célula) e removidas de `anterior` para `atual`"""
+    mesmas_colunas = list(anterior.columns) == list(atual.columns)
+    comuns = [c for c in atual.columns if c in anterior.columns]
+    if not mesmas_colunas or assinatura_anterior is None:
+        assinatura_anterior = assinatura(anterior[comuns])
+    if not mesmas_colunas or assinatura_atual is None:
+        assinatura_atual = assinatura(atual[comuns])
+    chaves_anteriores, hashes_anteriores = assinatura_anterior
+    chaves_atuais, hashes_atuais = assinatura_atual
+    hashes_anteriores = pd.Series(hashes_anteriores, index=chaves_anteriores)
+
+    # Posição de cada empresa da versão nova na anterior (-1 = inserida)
+    posicoes = hashes_anteriores.index.get_indexer(chaves_atuais)
+    existentes = posicoes >= 0
+    iguais = existentes.copy()
+    iguais[existentes] = hashes_anteriores.to_numpy()[posicoes[existentes]] == hashes_atuais[existentes]
+    alteradas = np.flatnonzero(existentes & ~iguais)
+    vistas = np.zeros(len(anterior), dtype=bool)
+    vistas[posicoes[existentes]] = True
+    removidas = np.flatnonzero(~vistas)
+
+    # Células alteradas: só as linhas alteradas são convertidas em texto
+    colunas_alteradas = {}
+    if len(alteradas):
+        diferentes = (
+            como_texto(atual[comuns].iloc[alteradas]).to_numpy(dtype=object)
+            != como_texto(anterior[comuns].iloc[posicoes[alteradas]]).to_numpy(dtype=object)
+        )
+        rotulos = atual.index[alteradas]
+        colunas_alteradas = {
+            rotulo: tuple(comuns[j] for j in np.flatnonzero(linha))
+            for rotulo, linha in zip(rotulos, diferentes)
+        }
+
+    origem = pd.Series(anterior.index.to_numpy()[posicoes[iguais]], index=atual.index[iguais])
+
+    # Feed legível: identificação da empresa + colunas alteradas
+    identificacao = [c for c in _COLUNAS_IDENTIFICACAO if c in atual.columns and c in anterior.columns]
+    partes = [
+        atual[identificacao].iloc[~existentes].assign(**{"Mudança": INSERIDA, "Colunas": ""}),
+        atual[identificacao].iloc[alteradas].assign(**{
+            "Mudança": ALTERADA, "Colunas": [", ".join(c) for c in colunas_alteradas.values()]
+        }),
+        anterior[identificacao].iloc[removidas].assign(**{"Mudança": REMOVIDA, "Colunas": ""}),
+    ]
+    feed = pd.concat([p.astype(object) for p in partes], ignore_index=True)
+    feed = feed[["Mudança"] + identificacao + ["Colunas"]]
+
+    return Mudancas(
+        anterior.attrs.get("versao"), atual.attrs.get("versao"),
+        inseridas=atual.index[~existentes],
+        alteradas=colunas_alteradas,
+        origem=origem,
+        removidas=len(removidas),
+        feed=feed,
+        mesmas_colunas=mesmas_colunas,
+    )
+
+
+class RastreadorMudancas:
+    """Guarda a última versão vista da planilha e o feed de mudanças entre versões.
+
+    Uma troca de competência recomeça a comparação (o mês novo não é
+    "alteração" do anterior).
+    """
+
+    def __init__(self, limite=LIMITE_FEED):
+        self._lock = threading.Lock()
+        self._anterior = None               # (DataFrame, assinatura) da última versão
+        self._feed = deque(maxlen=limite)
+
+    def registra(self, df: pd.DataFrame):
+        """Compara `df` com a versão anterior; devolve as Mudancas (ou None)"""
+        atual = (df, assinatura(df))
+        with self._lock:
+            anterior, self._anterior = self._anterior, atual
+        if anterior is None or formata_competencia(anterior[0]) != formata_competencia(df):
+            return None
+        mudancas = compara(anterior[0], df, anterior[1], atual[1])
+        if not mudancas.vazia:
+            with self._lock:
+                self._feed.appendleft(mudancas)
+        return mudancas
+
+    def feed(self) -> list:
+        """Mudanças das últimas atualizações, da mais recente para a mais antiga"""
+        with self._lock:
+            return list(self._feed)
+
+    def da_versao(self, versao):
+        """Mudanças que levaram à `versao` (None se não houver)"""
+        for mudancas in self.feed():
+            if mudancas.versao == versao:
+                return mudancas
+        return None
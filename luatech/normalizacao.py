@@ -0,0 +1,164 @@
+# ============================================================================
+# NORMALIZAÇÃO DA PLANILHA
+# Trabalho de texto feito uma única vez por versão dos dados
+# ============================================================================
+
+import numpy as np
+import pandas as pd
+
+from luatech import esquema
+from luatech.escritorios import COLUNA_ESCRITORIO
+
+# Colunas de status comparadas em maiúsculas pelas páginas
+COLUNAS_STATUS = (
+    "Situação", "Regime", "Matriz / Filial", "MATRIZ / FILIAL",
+    "SIMPLES GERADO", "TRANSMISSÃO", "SITUAÇÃO DCTF",
+    "DMS", "GUIA ISS DMS", "REST", "GUIA ISS REST", "IMPORTAÇÃO",
+)
+
+
+# Colunas de poucos valores distintos, guardadas como categoria
+COLUNAS_CATEGORICAS = COLUNAS_STATUS + (
+    COLUNA_ESCRITORIO, "Estado", "Município", "ORIGEM", "TIPO",
+    "XML DMS", "XML REST", "XML ENTRADA", "XML SAÍDA",
+)
+
+# pandas 2.x: visões sem cópia defensiva dependem do Copy-on-Write (padrão no 3.x)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+def compacta(df: pd.DataFrame) -> pd.DataFrame:
+    """Categorias nas colunas de poucos valores e números no menor tipo sem perda"""
+    compacto = df.copy(deep=False)
+    for col in df.columns:
+        serie = df[col]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            continue
+        if col in COLUNAS_CATEGORICAS and not pd.api.types.is_numeric_dtype(serie) \
+                and not pd.api.types.is_datetime64_any_dtype(serie):
+            compacto[col] = serie.astype("category")
+        elif pd.api.types.is_integer_dtype(serie):
+            compacto[col] = pd.to_numeric(serie, downcast="integer")
+        elif pd.api.types.is_float_dtype(serie):
+            # float32 só quando todos os valores voltam idênticos (centavos raramente voltam)
+            reduzida = serie.astype(np.float32)
+            if np.array_equal(reduzida.to_numpy(np.float64), serie.to_numpy(np.float64), equal_nan=True):
+                compacto[col] = reduzida
+    compacto.attrs = dict(df.attrs)
+    return compacto
+
+
+def texto_maiusculo(serie: pd.Series, maiusculo=True) -> pd.Series:
+    """Converte a coluna em categoria maiúscula; valores ausentes viram vazio.
+
+    `maiusculo=False` mantém o texto exatamente como está na planilha.
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # Só as categorias são convertidas; o código -1 (ausente) cai no "" do fim
+        rotulos = serie.cat.categories.astype(str)
+        if maiusculo:
+            rotulos = rotulos.str.upper()
+        remapeamento, categorias = pd.factorize(np.append(rotulos.to_numpy(object), ""))
+        codigos = remapeamento[serie.cat.codes.to_numpy()]
+        return pd.Series(pd.Categorical.from_codes(codigos, categories=categorias), index=serie.index)
+    texto = serie.astype(object).where(serie.notna(), "").astype(str)
+    return (texto.str.upper() if maiusculo else texto).astype("category")
+
+
+def sem_ausentes(df: pd.DataFrame, colunas=None) -> pd.DataFrame:
+    """Troca ausentes por "" nas colunas (categorias ganham a categoria vazia)"""
+    for col in (df.columns if colunas is None else colunas):
+        serie = df[col]
+        if not serie.isna().any():
+            continue
+        if isinstance(serie.dtype, pd.CategoricalDtype) and "" not in serie.cat.categories:
+            serie = serie.cat.add_categories([""])
+        df[col] = serie.fillna("")
+    return df
+
+
+def formata_competencia(df: pd.DataFrame) -> str:
+    """PERÍODO DE COMPETÊNCIA da primeira linha no formato MM/AAAA"""
+    if "PERÍODO DE COMPETÊNCIA" not in df.columns or df.empty:
+        return ""
+    data = pd.to_datetime(df["PERÍODO DE COMPETÊNCIA"].iloc[0], errors="coerce")
+    return "" if pd.isna(data) else data.strftime("%m/%Y")
+
+
+class DadosNormalizados:
+    """Planilha GERAL já normalizada, compartilhada entre páginas e sessões.
+
+    Os atributos são somente leitura: as páginas obtêm recortes próprios
+    com `visao`, nunca alteram `df`/`ativas` diretamente.
+    """
+
+    def __init__(self, df: pd.DataFrame, compacto=True):
+        # Uma cópia tipada (esquema da aba GERAL) e compacta por versão; a
+        # planilha crua pode ser liberada. compacto=False: `df` já passou por aqui.
+        self.validacao = None
+        if compacto:
+            df, self.validacao = esquema.aplica(df)
+            df = compacta(df)
+        self.df = df
+        self.versao = df.attrs.get("versao")
+        self.competencia = formata_competencia(df)
+
+        self.status = pd.DataFrame(
+            {col: texto_maiusculo(df[col]) for col in COLUNAS_STATUS if col in df.columns},
+            index=df.index
+        )
+
+        # Escritórios presentes (a coluna só aparece nas visões quando há mais de um)
+        if COLUNA_ESCRITORIO in df.columns:
+            self.escritorios = sorted(df[COLUNA_ESCRITORIO].dropna().unique().tolist())
+        else:
+            self.escritorios = []
+
+        self.tem_situacao = "Situação" in df.columns
+        if self.tem_situacao:
+            self.mascara_ativas = (self.status["Situação"] == "ATIVA").to_numpy()
+        else:
+            self.mascara_ativas = np.zeros(len(df), dtype=bool)
+        self.ativas = df[self.mascara_ativas]
+        self.status_ativas = self.status[self.mascara_ativas]
+        self.indice_ativas = self.ativas.index
+        self._exatos = {}
+
+        # PERÍODO da DCTF já como data pelo esquema (o grid exibe MM-AAAA)
+        if "PERÍODO" in df.columns:
+            self.periodo_ativas = self.ativas["PERÍODO"]
+        else:
+            self.periodo_ativas = None
+
+    def maiusculas(self, coluna: str) -> pd.Series:
+        """Status em maiúsculas da coluna, restrito às empresas ATIVAS"""
+        return self.status_ativas[coluna]
+
+    def texto_exato(self, coluna: str) -> pd.Series:
+        """Status da coluna sem conversão de caixa, restrito às ATIVAS (calculado no 1º uso)"""
+        if coluna not in self._exatos:
+            self._exatos[coluna] = texto_maiusculo(self.ativas[coluna], maiusculo=False)
+        return self._exatos[coluna]
+
+    def do_escritorio(self, escritorio: str) -> "DadosNormalizados":
+        """Recorte de um escritório; o esquema e a compactação já feitos aqui não são repetidos"""
+        df = self.df[(self.df[COLUNA_ESCRITORIO] == escritorio).to_numpy()]
+        df.attrs = {**self.df.attrs, "versao": None if self.versao is None else f"{self.versao}:{escritorio}"}
+        return DadosNormalizados(df, compacto=False)
+
+    def colunas_visao(self, colunas) -> list:
+        """Colunas pedidas, precedidas do escritório quando há mais de um"""
+        if len(self.escritorios) > 1 and COLUNA_ESCRITORIO not in colunas:
+            return [COLUNA_ESCRITORIO] + list(colunas)
+        return list(colunas)
+
+    def visao(self, colunas, mascara=None) -> pd.DataFrame:
+        """Recorte das ATIVAS com as colunas existentes.
+
+        Sem cópia: com Copy-on-Write, a página pode atribuir colunas ao
+        recorte e só a coluna alterada é copiada; os dados compartilhados
+        não mudam.
+        """
+        base = self.ativas if mascara is None else self.ativas[mascara]
+        return base[[c for c in self.colunas_visao(colunas) if c in base.columns]]
@@ -0,0 +1,203 @@
+# ============================================================================
+# OBRIGAÇÕES
+# Regras declarativas de status e totalizadores de cada obrigação
+# ============================================================================
+
+import numpy as np
+import pandas as pd
+
+
+class Contador:
+    """Totalizador exibido no cabeçalho de uma página.
+
+    - `valores`: status (já mapeados) somados neste contador; None soma todos
+      os status não cobertos pelos demais contadores da mesma coluna.
+    - `coluna`: conta `valores` em outra coluna (maiúsculas) em vez do status.
+    - `desconta`: rótulo de outro contador subtraído deste (mínimo zero).
+    """
+
+    def __init__(self, rotulo, valores=None, coluna=None, desconta=None):
+        self.rotulo = rotulo
+        self.valores = None if valores is None else tuple(valores)
+        self.coluna = coluna
+        self.desconta = desconta
+
+
+class Obrigacao:
+    """Descrição de uma obrigação: coluna de origem, mapeamento e contadores.
+
+    O mapeamento é aplicado sobre o status em maiúsculas (vazio = não
+    preenchido); com `maiusculas=False`, sobre o texto exato da planilha.
+    Valores fora do mapa recebem `outros`, ou permanecem como estão quando
+    `outros` é None.
+
+    No consolidado, status (já mapeados) em `concluidos` contam como feitos,
+    em `dispensados` como "não se aplica" e os demais como pendência.
+    """
+
+    def __init__(self, nome, coluna, mapa=None, outros=None, contadores=(), concluidos=(), dispensados=(),
+                 maiusculas=True):
+        self.nome = nome
+        self.coluna = coluna
+        self.maiusculas = maiusculas
+        self.mapa = dict(mapa or {})
+        self.outros = outros
+        self.contadores = tuple(contadores)
+        self.concluidos = tuple(concluidos)
+        self.dispensados = tuple(dispensados)
+
+    def classifica(self, valor: str) -> str:
+        if valor in self.mapa:
+            return self.mapa[valor]
+        return valor if self.outros is None else self.outros
+
+
+class ResultadoObrigacao:
+    """Coluna de status mapeada + totais de uma obrigação"""
+
+    def __init__(self, status, contagem, totais):
+        self.status = status
+        self.contagem = contagem
+        self.totais = totais
+
+
+# ============================================================================
+# DEFINIÇÕES
+# ============================================================================
+
+SIMPLES = Obrigacao(
+    "SIMPLES NACIONAL", "SIMPLES GERADO",
+    mapa={"FILIAL": "Filial", "": "Não"},
+    outros="Concluída",
+    contadores=[
+        Contador("Concluídas", ["Concluída", "Filial"]),
+        Contador("Filial", ["Filial"]),
+        Contador("Não concluídas", ["Não"]),
+    ],
+    concluidos=["Concluída", "Filial"]
+)
+
+REINF = Obrigacao(
+    "REINF", "TRANSMISSÃO",
+    mapa={"OK": "Transmitida", "FILIAL": "FILIAL", "": "Não"},
+    contadores=[
+        Contador("Filial", ["FILIAL"]),
+        Contador("Transmitida", ["Transmitida"]),
+        Contador("Não transmitida", ["Não"]),
+    ],
+    concluidos=["Transmitida", "FILIAL"]
+)
+
+DCTF_WEB = Obrigacao(
+    "DCTF WEB", "SITUAÇÃO DCTF",
+    contadores=[
+        Contador("Concluídas", ["ATIVA"]),
+        Contador("Sem Procuração", ["SEM PROCURAÇÃO"]),
+        Contador("Filiais", ["FILIAL"], coluna="MATRIZ / FILIAL"),
+        Contador("Não concluídas", desconta="Filiais"),
+    ],
+    concluidos=["ATIVA"]
+)
+
+DMS = Obrigacao(
+    "DMS", "DMS",
+    contadores=[
+        Contador("Concluídas", ["DMS SALVA"]),
+        Contador("Sem acesso", ["SEM ACESSO"]),
+        Contador("Não concluídas"),
+    ],
+    concluidos=["DMS SALVA"]
+)
+
+GUIA_ISS_DMS = Obrigacao(
+    "GUIA ISS DMS", "GUIA ISS DMS",
+    mapa={"OK": "Guia salva", "": "Não"}
+)
+
+# A página sempre comparou o REST com a caixa exata ("Rest salva" não conta)
+SERVICOS_TOMADOS = Obrigacao(
+    "SERVIÇOS TOMADOS", "REST",
+    mapa={"REST SALVA": "Concluído", "SEM ACESSO": "Sem acesso", "": "Não concluído"},
+    contadores=[
+        Contador("Concluídas", ["Concluído"]),
+        Contador("Sem acesso", ["Sem acesso"]),
+        Contador("Não concluídas", ["Não concluído"]),
+    ],
+    concluidos=["Concluído"],
+    maiusculas=False
+)
+
+SEFAZ = Obrigacao(
+    "SEFAZ", "IMPORTAÇÃO",
+    contadores=[
+        Contador("Em andamento", ["EM ANDAMENTO"]),
+        Contador("Outro Estado", ["OUTRO ESTADO"]),
+        Contador("Sem movimento", ["SEM MOVIMENTO"]),
+        Contador("Concluído", ["CONCLUÍDO"]),
+    ],
+    concluidos=["CONCLUÍDO", "SEM MOVIMENTO"],
+    dispensados=["OUTRO ESTADO"]
+)
+
+
+# ============================================================================
+# MOTOR
+# ============================================================================
+
+def _categorias_e_codigos(dados, coluna, mascara, maiusculas=True):
+    """Categorias e códigos da coluna em maiúsculas ou exata (coluna ausente = tudo vazio)"""
+    n = int(mascara.sum()) if mascara is not None else len(dados.ativas)
+    if coluna not in (dados.status_ativas.columns if maiusculas else dados.ativas.columns):
+        indice = dados.indice_ativas if mascara is None else dados.indice_ativas[mascara]
+        return pd.Index([""]), np.zeros(n, dtype=np.int64), indice
+    serie = dados.maiusculas(coluna) if maiusculas else dados.texto_exato(coluna)
+    if mascara is not None:
+        serie = serie[mascara]
+    return serie.cat.categories, serie.cat.codes.to_numpy(), serie.index
+
+
+def _conta(dados, coluna, mascara, valores) -> int:
+    categorias, codigos, _ = _categorias_e_codigos(dados, coluna, mascara)
+    por_categoria = np.bincount(codigos, minlength=len(categorias))
+    return int(sum(n for cat, n in zip(categorias, por_categoria) if cat in valores))
+
+
+def avalia(obrigacao: Obrigacao, dados, mascara=None) -> ResultadoObrigacao:
+    """Calcula a coluna mapeada e todos os totais em uma única passada.
+
+    O mapeamento é feito por categoria (poucos valores distintos) e os totais
+    saem de um único bincount sobre os códigos categóricos.
+    """
+    categorias, codigos, indice = _categorias_e_codigos(dados, obrigacao.coluna, mascara, obrigacao.maiusculas)
+
+    # Mapeia cada categoria e reagrupa as que caem no mesmo status
+    rotulos = [obrigacao.classifica(str(cat)) for cat in categorias]
+    remapeamento, novos = pd.factorize(pd.Index(rotulos, dtype=object))
+    codigos_novos = remapeamento[codigos]
+    status = pd.Series(
+        pd.Categorical.from_codes(codigos_novos, categories=novos),
+        index=indice,
+        name=obrigacao.coluna
+    )
+    contagem = dict(zip(novos, np.bincount(codigos_novos, minlength=len(novos)).tolist()))
+
+    # Totalizadores na ordem declarada
+    cobertos = set()
+    for c in obrigacao.contadores:
+        if c.coluna is None and c.valores is not None:
+            cobertos.update(c.valores)
+
+    total = len(codigos)
+    totais = {}
+    for c in obrigacao.contadores:
+        if c.coluna is not None:
+            totais[c.rotulo] = _conta(dados, c.coluna, mascara, c.valores)
+        elif c.valores is None:
+            totais[c.rotulo] = total - sum(contagem.get(v, 0) for v in cobertos)
+        else:
+            totais[c.rotulo] = sum(contagem.get(v, 0) for v in c.valores)
+    for c in obrigacao.contadores:
+        if c.desconta is not None:
+            totais[c.rotulo] = max(totais[c.rotulo] - totais[c.desconta], 0)
+
+    return ResultadoObrigacao(status, contagem, totais)
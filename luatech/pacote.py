@@ -0,0 +1,168 @@
+# ============================================================================
+# PACOTE DE RELATÓRIOS
+# Todos os relatórios de uma carga dos dados em um único zip (xlsx e,
+# opcionalmente, CSV/Parquet), gerado em segundo plano por um pool de
+# processos (a escrita do xlsx é Python puro: threads não paralelizam) e
+# guardado por versão dos dados
+# ============================================================================
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from io import BytesIO
+
+from luatech.exportacao import FORMATOS, gera_arquivo
+from luatech.instrumentacao import etapa
+from luatech.relatorios import monta_todos, resumo
+
+logger = logging.getLogger("gestor_fiscal.pacote")
+
+NOME_RESUMO = "resumo"
+
+# Pacotes prontos guardados (por versão dos dados x formatos)
+LIMITE_PACOTES = 4
+
+# Processos que geram os arquivos (com um núcleo só, uma thread basta)
+WORKERS_PACOTE = min(4, os.cpu_count() or 1)
+
+# xlsx e parquet já são comprimidos: vão para o zip sem recomprimir
+_SEM_COMPRESSAO = {"xlsx", "parquet"}
+
+
+def _ordena(formatos) -> tuple:
+    """Formatos na ordem de FORMATOS (a mesma escolha sempre dá a mesma chave)"""
+    return tuple(f for f in FORMATOS if f in formatos)
+
+
+def nome_pacote(competencia: str) -> str:
+    """Nome do zip baixado ("relatorios_05-2024.zip")"""
+    return f"relatorios_{(competencia or 'atual').replace('/', '-')}.zip"
+
+
+class TarefaPacote:
+    """Geração de um pacote em andamento (ou concluída); lida pelas sessões a cada rerun"""
+
+    def __init__(self, competencia: str, formatos: tuple):
+        self.competencia = competencia
+        self.formatos = formatos
+        self.nome_arquivo = nome_pacote(competencia)
+        self.total = 0
+        self.concluidos = 0
+        self.conteudo = None    # bytes do zip quando pronto
+        self.erro = None
+        self.inicio = time.time()
+        self.fim = None
+
+    @property
+    def pronta(self) -> bool:
+        return self.fim is not None
+
+    @property
+    def progresso(self) -> float:
+        if self.pronta:
+            return 1.0
+        # Montar os relatórios conta como o primeiro passo
+        return (self.concluidos + 1) / (self.total + 2) if self.total else 0.0
+
+
+def gera_pacote(dados, formatos=("xlsx",), executor=None, tarefa: TarefaPacote = None) -> bytes:
+    """Zip com todos os relatórios (e o RESUMO) de `dados` em cada formato pedido.
+
+    Os arquivos são gerados no `executor` (sem ele, um de cada vez).
+    """
+    relatorios = monta_todos(dados)
+    arquivos = {NOME_RESUMO: resumo(relatorios, dados.competencia)}
+    arquivos.update({relatorio.nome_arquivo: relatorio.df for relatorio in relatorios.values()})
+    trabalhos = [(nome, formato) for formato in formatos for nome in arquivos]
+    if tarefa is not None:
+        tarefa.total = len(trabalhos)
+
+    proprio = executor is None
+    if proprio:
+        executor = ThreadPoolExecutor(1, thread_name_prefix="pacote")
+    try:
+        futuros = {executor.submit(gera_arquivo, arquivos[nome], formato): (nome, formato) for nome, formato in trabalhos}
+        prontos = {}
+        for futuro in as_completed(futuros):
+            prontos[futuros[futuro]] = futuro.result()
+            if tarefa is not None:
+                tarefa.concluidos += 1
+    finally:
+        if proprio:
+            executor.shutdown()
+
+    saida = BytesIO()
+    with zipfile.ZipFile(saida, "w") as pacote:
+        # Ordem fixa dentro do zip (independe de qual worker terminou antes)
+        for nome, formato in trabalhos:
+            compressao = zipfile.ZIP_STORED if formato in _SEM_COMPRESSAO else zipfile.ZIP_DEFLATED
+            pacote.writestr(f"{nome}.{FORMATOS[formato][0]}", prontos[(nome, formato)], compress_type=compressao)
+    return saida.getvalue()
+
+
+class GeradorPacotes:
+    """Pacotes por (versão dos dados, formatos): um pedido repetido reaproveita a
+    tarefa em andamento ou o zip pronto, e nunca gera o mesmo pacote duas vezes.
+    """
+
+    def __init__(self, max_workers=WORKERS_PACOTE, limite=LIMITE_PACOTES):
+        self.max_workers = max_workers
+        self.limite = limite
+        self._lock = threading.Lock()
+        self._tarefas = OrderedDict()
+        self._executor = None
+
+    def _pool(self):
+        """Pool criado no primeiro pacote e mantido (os processos já sobem com o pandas importado)"""
+        with self._lock:
+            if self._executor is None:
+                if self.max_workers > 1:
+                    # spawn: fork de um servidor com threads pode travar nos locks herdados
+                    self._executor = ProcessPoolExecutor(
+                        self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(1, thread_name_prefix="pacote")
+            return self._executor
+
+    def fecha(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def tarefa(self, versao, formatos):
+        """Tarefa já pedida para esta versão e formatos (ou None)"""
+        with self._lock:
+            return self._tarefas.get((versao, _ordena(formatos)))
+
+    def solicita(self, dados, formatos=("xlsx",)) -> TarefaPacote:
+        """Inicia (se preciso) a geração em segundo plano; devolve a tarefa"""
+        formatos = _ordena(formatos)
+        chave = (dados.versao, formatos)
+        with self._lock:
+            tarefa = self._tarefas.get(chave)
+            # Pacotes com erro podem ser pedidos de novo
+            if tarefa is not None and tarefa.erro is None:
+                self._tarefas.move_to_end(chave)
+                return tarefa
+            tarefa = self._tarefas[chave] = TarefaPacote(dados.competencia, formatos)
+            while len(self._tarefas) > self.limite:
+                self._tarefas.popitem(last=False)
+        threading.Thread(target=self._gera, args=(tarefa, dados), name="pacote", daemon=True).start()
+        return tarefa
+
+    def _gera(self, tarefa: TarefaPacote, dados):
+        try:
+            with etapa("pacote", linhas=len(dados.ativas)):
+                tarefa.conteudo = gera_pacote(dados, tarefa.formatos, self._pool(), tarefa)
+        except Exception as e:
+            logger.warning("Falha ao gerar o pacote de relatórios: %s", e)
+            tarefa.erro = e
+        finally:
+            tarefa.fim = time.time()
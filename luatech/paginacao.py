@@ -0,0 +1,79 @@
+# ============================================================================
+# PAGINAÇÃO NO SERVIDOR
+# Filtro, ordenação e fatiamento em pandas; o navegador recebe só a página
+# ============================================================================
+
+import numpy as np
+import pandas as pd
+
+TODAS_AS_COLUNAS = "Todas as colunas"
+
+
+class IndiceGrid:
+    """Índices de um recorte de página, montados sob demanda e reaproveitados.
+
+    Guarda, por coluna, a ordem das linhas (argsort estável) e o texto em
+    minúsculas usado nos filtros, para que trocar de página, de ordenação ou
+    de filtro não refaça esse trabalho.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.reset_index(drop=True)
+        self._ordens = {}
+        self._textos = {}
+
+    def __len__(self):
+        return len(self.df)
+
+    def texto(self, coluna: str) -> pd.Series:
+        """Coluna como texto minúsculo (vazio para ausentes)"""
+        if coluna not in self._textos:
+            serie = self.df[coluna]
+            texto = serie.astype(object).where(serie.notna(), "").astype(str)
+            self._textos[coluna] = texto.str.lower()
+        return self._textos[coluna]
+
+    def ordem(self, coluna: str) -> np.ndarray:
+        """Posições das linhas em ordem crescente da coluna (ausentes no fim)"""
+        if coluna not in self._ordens:
+            serie = self.df[coluna]
+            try:
+                ordenada = serie.sort_values(kind="stable", na_position="last")
+            except TypeError:
+                # Tipos mistos: ordena pela representação em texto
+                ordenada = self.texto(coluna).sort_values(kind="stable")
+            self._ordens[coluna] = ordenada.index.to_numpy()
+        return self._ordens[coluna]
+
+    def filtra(self, termo: str, coluna=TODAS_AS_COLUNAS) -> np.ndarray:
+        """Máscara das linhas que contêm o termo (sem diferenciar maiúsculas)"""
+        termo = (termo or "").strip().lower()
+        if not termo:
+            return np.ones(len(self.df), dtype=bool)
+        colunas = self.df.columns if coluna == TODAS_AS_COLUNAS else [coluna]
+        mascara = np.zeros(len(self.df), dtype=bool)
+        for col in colunas:
+            mascara |= self.texto(col).str.contains(termo, regex=False).to_numpy()
+        return mascara
+
+    def posicoes(self, termo="", coluna=TODAS_AS_COLUNAS, ordenar_por=None, crescente=True) -> np.ndarray:
+        """Posições das linhas filtradas, na ordem pedida"""
+        mascara = self.filtra(termo, coluna)
+        if ordenar_por is None:
+            return np.flatnonzero(mascara)
+        ordem = self.ordem(ordenar_por)
+        if not crescente:
+            # Inverte só os preenchidos; ausentes continuam no fim
+            ausentes = int(self.df[ordenar_por].isna().sum())
+            corte = len(ordem) - ausentes
+            ordem = np.concatenate([ordem[:corte][::-1], ordem[corte:]])
+        return ordem[mascara[ordem]]
+
+    def pagina(self, posicoes: np.ndarray, numero: int, tamanho: int) -> pd.DataFrame:
+        """Fatia da página `numero` (a partir de 1) sobre as posições filtradas"""
+        inicio = max(numero - 1, 0) * tamanho
+        return self.df.iloc[posicoes[inicio:inicio + tamanho]]
+
+    def recorte(self, posicoes: np.ndarray) -> pd.DataFrame:
+        """Conjunto filtrado completo (usado na exportação)"""
+        return self.df.iloc[posicoes]
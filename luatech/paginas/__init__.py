@@ -0,0 +1,35 @@
+"""Páginas do Gestor Fiscal, importadas sob demanda (a tela de login não carrega pandas/AgGrid)."""
+
+import importlib
+
+# Página do menu -> módulo em luatech/paginas (na ordem do menu)
+MODULOS = {
+    "EMPRESAS": "empresas",
+    "CONSOLIDADO": "consolidado",
+    "SIMPLES NACIONAL": "simples",
+    "REINF": "reinf",
+    "DCTF WEB": "dctf_web",
+    "DMS": "dms",
+    "SERVIÇOS TOMADOS": "servicos_tomados",
+    "SEFAZ": "sefaz",
+}
+MENU = list(MODULOS)
+
+
+def _modulo(nome: str):
+    return importlib.import_module(f"{__name__}.{nome}")
+
+
+def exibe(pagina: str):
+    """Renderiza a página do menu (o módulo é importado uma vez por processo)"""
+    _modulo(MODULOS[pagina]).exibe()
+
+
+def barra_lateral():
+    """Busca de empresas, pacote de relatórios e feed de mudanças"""
+    _modulo("comum").barra_lateral()
+
+
+def painel_desempenho():
+    """Painel de desempenho (?admin=1)"""
+    _modulo("comum").painel_desempenho()
@@ -0,0 +1,635 @@
+# ============================================================================
+# PÁGINAS - PARTE COMUM
+# Acesso aos dados (cache compartilhado entre sessões), grid, downloads,
+# busca e feed da barra lateral: importado só depois do login
+# ============================================================================
+
+import logging
+import math
+import os
+
+import streamlit as st
+from st_aggrid import AgGrid, GridUpdateMode
+from copy import deepcopy
+from datetime import datetime
+from functools import partial
+from zoneinfo import ZoneInfo
+
+from luatech.atualizacao import AtualizadorPlanilha
+from luatech.busca import IndiceEmpresas
+from luatech.cache_planilha import CachePlanilha
+from luatech.cliente_http import ClienteHTTP
+from luatech.escritorios import COLUNA_ESCRITORIO, PLANILHA_PADRAO, CargaEscritorios, Escritorio, carrega_registro
+from luatech.grid import monta_opcoes_grid
+from luatech.historico import HistoricoCompetencias
+from luatech.leitura_xlsx import assinatura_leitura, ler_xlsx
+from luatech.mudancas import COLUNA_ALTERADAS, RastreadorMudancas
+from luatech.normalizacao import DadosNormalizados, compacta
+from luatech.pacote import GeradorPacotes
+from luatech import relatorios
+from luatech.exportacao import FORMATOS, gera_arquivo
+from luatech import formatacao
+from luatech.instrumentacao import METRICAS, cronometrado, etapa
+from luatech.paginacao import TODAS_AS_COLUNAS, IndiceGrid
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+# URL do Google Sheets (definida em luatech/escritorios.py, também usada pela
+# exportação em lote)
+GOOGLE_SHEET_URL = PLANILHA_PADRAO.url
+SHEET_EMPRESAS = PLANILHA_PADRAO.aba
+
+# Escritórios atendidos: JSON [{"nome": ..., "url": ..., "aba": "GERAL"}];
+# sem o arquivo, só a planilha acima (escritório padrão)
+ARQUIVO_ESCRITORIOS = os.environ.get("GESTOR_FISCAL_ESCRITORIOS", "escritorios.json")
+ESCRITORIO_PADRAO = PLANILHA_PADRAO.nome
+TODOS_ESCRITORIOS = "Todos"
+
+# Fonte da planilha: "xlsx" (exportação do workbook inteiro) ou "sheets_api"
+# (só as colunas usadas da aba, via gspread; exige GESTOR_FISCAL_CREDENCIAIS)
+FONTE_PLANILHA = os.environ.get("GESTOR_FISCAL_FONTE", "xlsx")
+CREDENCIAIS_SHEETS = os.environ.get("GESTOR_FISCAL_CREDENCIAIS", "credenciais.json")
+
+# Timeouts (conexão, leitura) em segundos e tentativas dos downloads
+TIMEOUT_HTTP = (5, 60)
+TENTATIVAS_HTTP = 3
+
+# Motor de leitura do xlsx (None = mais rápido disponível: calamine > openpyxl)
+MOTOR_XLSX = None
+
+# Validade dos dados (s); a planilha é recarregada em segundo plano um pouco
+# antes de vencer, sem que nenhum usuário espere pelo download
+INTERVALO_ATUALIZACAO = int(os.environ.get("GESTOR_FISCAL_INTERVALO_ATUALIZACAO", "600"))
+ANTECEDENCIA_ATUALIZACAO = 60
+
+# Snapshot em disco confirmado há menos que isto é servido sem consultar a
+# origem (reinícios); a recarga agendada, logo depois da janela, revalida
+JANELA_REVALIDACAO = INTERVALO_ATUALIZACAO - min(ANTECEDENCIA_ATUALIZACAO, INTERVALO_ATUALIZACAO / 2)
+
+# Fuso do horário "dados de HH:MM" exibido ao lado da competência
+FUSO_HORARIO = ZoneInfo("America/Sao_Paulo")
+
+# Grids com mais linhas que isto são paginados/filtrados no servidor
+# (0 = desligado: o grid inteiro vai para o navegador, como sempre foi)
+LINHAS_GRID_SERVIDOR = int(os.environ.get("GESTOR_FISCAL_GRID_SERVIDOR", "0"))
+TAMANHO_PAGINA_SERVIDOR = 100
+
+# ============================================================================
+# FUNÇÕES AUXILIARES
+# ============================================================================
+
+@st.cache_resource
+def escritorios():
+    """Registro dos escritórios (planilhas de origem)"""
+    padrao = Escritorio(ESCRITORIO_PADRAO, GOOGLE_SHEET_URL, SHEET_EMPRESAS)
+    return carrega_registro(ARQUIVO_ESCRITORIOS, padrao)
+
+
+@st.cache_resource
+def cliente_http():
+    """Sessão HTTP com pool de conexões, compartilhada entre sessões"""
+    # Uma conexão por escritório: as planilhas são baixadas em paralelo
+    return ClienteHTTP(
+        timeout=TIMEOUT_HTTP, tentativas=TENTATIVAS_HTTP, conexoes=max(4, len(escritorios()))
+    )
+
+
+@st.cache_resource
+def cache_planilha():
+    """Cache em disco compartilhado entre sessões (sobrevive a reinícios)"""
+    return CachePlanilha(
+        leitor=partial(ler_xlsx, motor=MOTOR_XLSX),
+        versao_leitor=assinatura_leitura(MOTOR_XLSX),
+        cliente=cliente_http(),
+        janela_revalidacao=JANELA_REVALIDACAO
+    )
+
+
+@st.cache_resource
+def fonte_planilha():
+    """Fonte configurada em FONTE_PLANILHA (ambas expõem obtem/estatisticas)"""
+    if FONTE_PLANILHA == "sheets_api":
+        import gspread
+        from luatech.leitura_sheets import FonteSheetsAPI
+        cliente = gspread.service_account(filename=CREDENCIAIS_SHEETS)
+        cliente.set_timeout(TIMEOUT_HTTP)
+        return FonteSheetsAPI(cliente)
+    return cache_planilha()
+
+
+@cronometrado("le_planilha_google")
+def le_planilha_google(url: str, aba: str, tolera_falha=True):
+    """Lê planilha do Google Sheets e retorna DataFrame"""
+    # xlsx: requisição condicional, se nada mudou usa o snapshot salvo em disco
+    return fonte_planilha().obtem(url, aba, tolera_falha=tolera_falha)
+
+
+@st.cache_resource
+def historico():
+    """Snapshots por competência em disco (SQLite), compartilhados entre sessões"""
+    return HistoricoCompetencias()
+
+
+@st.cache_resource
+def mudancas_planilha():
+    """Hashes por empresa da última versão e feed de mudanças entre atualizações"""
+    return RastreadorMudancas()
+
+
+def _normaliza(df):
+    """Normalização (chamada pelo atualizador só quando a versão muda)"""
+    # Cada versão nova entra no histórico da sua competência (só linhas alteradas)
+    try:
+        with etapa("historico_ingestao", linhas=len(df)) as medicao:
+            medicao.linhas = sum(historico().ingere(df).values())
+    except Exception as e:
+        logging.getLogger("gestor_fiscal").warning("Falha ao gravar o histórico: %s", e)
+    try:
+        with etapa("mudancas", linhas=len(df)) as medicao:
+            mudancas = mudancas_planilha().registra(df)
+            medicao.linhas = 0 if mudancas is None else sum(mudancas.contagem().values())
+    except Exception as e:
+        logging.getLogger("gestor_fiscal").warning("Falha ao comparar com a versão anterior: %s", e)
+    with etapa("normalizacao", linhas=len(df)):
+        dados = DadosNormalizados(df)
+    if not dados.validacao.vazia:
+        logging.getLogger("gestor_fiscal").warning("Validação da planilha: %s", dados.validacao.resumo())
+    return dados
+
+
+def _le_compacta(url: str, aba: str, tolera_falha=True):
+    """Planilha em tipos compactos (a última versão boa de cada escritório fica guardada assim)"""
+    return compacta(le_planilha_google(url, aba, tolera_falha=tolera_falha))
+
+
+def _salva_compacta(url: str, aba: str):
+    """Snapshot em disco da planilha (sem rede), nos mesmos tipos compactos"""
+    carrega_snapshot = getattr(fonte_planilha(), "carrega_snapshot", None)
+    df = carrega_snapshot(url, aba) if carrega_snapshot is not None else None
+    return None if df is None else compacta(df)
+
+
+@st.cache_resource
+def carga_escritorios():
+    """Busca paralela das planilhas de todos os escritórios"""
+    return CargaEscritorios(escritorios(), _le_compacta, salvo=_salva_compacta)
+
+
+@st.cache_resource(on_release=AtualizadorPlanilha.para)
+def atualizador_planilha():
+    """Atualizador em segundo plano das planilhas, um por processo (a thread já começa aqui)"""
+    carga = carga_escritorios()
+    return AtualizadorPlanilha(
+        carga,
+        _normaliza,
+        intervalo=INTERVALO_ATUALIZACAO,
+        antecedencia=ANTECEDENCIA_ATUALIZACAO,
+        inicial=carga.salvos
+    )
+
+
+def dados_planilha():
+    """Planilhas normalizadas, compartilhadas (somente leitura) entre páginas e sessões"""
+    atualizador = atualizador_planilha()
+    dados = atualizador.atual()
+    if dados is None:
+        # Nada salvo em disco: só a primeira carga do processo passa por aqui
+        with st.spinner("Carregando a planilha..."):
+            atualizador.aguarda(TIMEOUT_HTTP[1] * TENTATIVAS_HTTP)
+        dados = atualizador.atual()
+    if dados is None:
+        st.error(f"Erro ao ler a planilha: {atualizador.ultimo_erro or 'tempo esgotado'}")
+    return dados
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _dados_historicos(competencia: str, versao: str):
+    """Competência anterior lida direto do histórico (sem baixar a planilha)"""
+    with etapa("historico_leitura") as medicao:
+        df = historico().carrega(competencia)
+        medicao.linhas = len(df)
+    with etapa("normalizacao", linhas=len(df)):
+        return DadosNormalizados(df)
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _dados_escritorio(versao: str, escritorio: str, _dados):
+    """Recorte normalizado de um escritório, memorizado por versão dos dados"""
+    with etapa("normalizacao") as medicao:
+        dados = _dados.do_escritorio(escritorio)
+        medicao.linhas = len(dados.df)
+    return dados
+
+
+def dados_competencia(chave: str):
+    """Dados da competência e do escritório escolhidos na página (padrão: atuais, todos)"""
+    atuais = dados_planilha()
+    falhas = carga_escritorios().falhas
+    if falhas:
+        st.warning("Escritórios sem atualização: " + "; ".join(f"{k} ({v})" for k, v in falhas.items()))
+    if atuais is not None and atuais.validacao.colunas_ausentes:
+        st.warning("Colunas obrigatórias ausentes na planilha: " + ", ".join(atuais.validacao.colunas_ausentes))
+    try:
+        armazenadas = historico().competencias()
+    except Exception:
+        armazenadas = []
+    
+    opcoes = [atuais.competencia] if atuais is not None else []
+    opcoes += [c for c in armazenadas if c not in opcoes]
+    
+    c_competencia, c_escritorio, _ = st.columns([1, 1, 4])
+    dados = atuais
+    if len(opcoes) > 1:
+        escolha = c_competencia.selectbox("Competência", opcoes, key=f"competencia_{chave}")
+        if atuais is None or escolha != atuais.competencia:
+            dados = _dados_historicos(escolha, historico().versao(escolha))
+    
+    if dados is not None and len(dados.escritorios) > 1:
+        escritorio = c_escritorio.selectbox(
+            "Escritório", [TODOS_ESCRITORIOS] + dados.escritorios, key=f"escritorio_{chave}"
+        )
+        if escritorio != TODOS_ESCRITORIOS:
+            dados = _dados_escritorio(dados.versao, escritorio, dados)
+    return dados
+
+
+@st.cache_resource
+def consolidados():
+    """Últimos CONSOLIDADOs por versão (base do recálculo incremental da versão seguinte)"""
+    return {}
+
+
+def consolidado_de(dados):
+    """CONSOLIDADO memorizado por versão; numa versão nova só as empresas alteradas são recalculadas"""
+    if dados.versao is None:
+        return relatorios.consolidado(dados)
+    memo = consolidados()
+    relatorio = memo.get(dados.versao)
+    if relatorio is None:
+        mudancas = mudancas_planilha().da_versao(dados.versao)
+        anterior = memo.get(mudancas.versao_anterior) if mudancas is not None else None
+        with etapa("consolidado", linhas=len(dados.ativas)):
+            if anterior is None:
+                relatorio = relatorios.consolidado(dados)
+            else:
+                relatorio = relatorios.consolidado_incremental(anterior, dados, mudancas)
+        memo[dados.versao] = relatorio
+        while len(memo) > 4:
+            memo.pop(next(iter(memo)), None)
+    return relatorio
+
+
+def alteracoes_da_versao(versao):
+    """Mudanças que levaram à versão atual da planilha (recortes por escritório incluídos)"""
+    if versao is None:
+        return None
+    atual = atualizador_planilha().atual()
+    base = versao.split(":")[0]
+    if atual is None or base != atual.versao:
+        return None  # competências do histórico não têm destaque
+    return mudancas_planilha().da_versao(base)
+
+
+def rotulo_competencia(competencia):
+    """Competência + horário da última consulta à planilha ("dados de HH:MM")"""
+    atualizador = atualizador_planilha()
+    atualizado_em = atualizador.atualizado_em
+    atual = atualizador.atual()
+    # Competências do histórico não mostram o horário da planilha atual
+    if atualizado_em is None or atual is None or competencia != atual.competencia:
+        return f"<b>Competência:</b> {competencia}"
+    horario = datetime.fromtimestamp(atualizado_em, FUSO_HORARIO).strftime("%H:%M")
+    return f"<b>Competência:</b> {competencia} <span style='font-size:14px; color:gray;'>(dados de {horario})</span>"
+
+
+def exibe_totais(titulo, totais, competencia):
+    """Cabeçalho da página com os totalizadores e a competência"""
+    itens = "".join(f"<b>{rotulo}:</b> {valor} | " for rotulo, valor in totais.items())
+    st.markdown(
+        f"<h2>{titulo}</h2>"
+        f"<p style='text-align:right; font-size:20px;'>"
+        f"{itens}{rotulo_competencia(competencia)}</p>",
+        unsafe_allow_html=True
+    )
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _exportacao_memorizada(pagina: str, versao: str, formato: str, filtro: str, _df):
+    """Arquivo de download memorizado por (página, versão dos dados, formato, filtro)"""
+    with etapa(f"exportacao_{formato}", pagina=pagina, linhas=len(_df)):
+        return gera_arquivo(_df, formato)
+
+
+def botoes_download(df, nome_arquivo, versao, filtro=""):
+    """Botões de download; o arquivo só é gerado quando o usuário clica"""
+    colunas = st.columns([1] * len(FORMATOS) + [4])
+    for coluna, (formato, (extensao, mime, rotulo)) in zip(colunas, FORMATOS.items()):
+        if versao is None:
+            gerar = partial(gera_arquivo, df, formato)
+        else:
+            gerar = partial(_exportacao_memorizada, nome_arquivo, versao, formato, filtro, df)
+        coluna.download_button(
+            rotulo,
+            data=gerar,
+            file_name=f"{nome_arquivo}.{extensao}",
+            mime=mime,
+            key=f"download_{nome_arquivo}_{formato}"
+        )
+
+
+def exibe_aggrid(df, height=400, grid_key="grid", update_mode=GridUpdateMode.MANUAL, paginado=False, formatos=None, marcas=None):
+    """Exibe AgGrid com configurações padrão (formatos: {coluna: "moeda" | "data" | "mes"})"""
+    # Key fixa baseada apenas no grid_key (sem timestamp)
+    # Isso mantém o estado dos filtros
+    
+    # Destaque das células alteradas desde a atualização anterior (coluna oculta)
+    if marcas is not None:
+        df = df.assign(**{COLUNA_ALTERADAS: marcas})
+    
+    # Opções compiladas uma vez por (grid, esquema de colunas); reruns de filtro
+    # só recebem uma cópia do cache (o AgGrid altera o dicionário recebido)
+    esquema = tuple((str(col), str(dtype)) for col, dtype in df.dtypes.items())
+    formatos = tuple(formatacao.formatos_padrao(df, formatos).items())
+    with etapa("grid_opcoes", linhas=len(df)):
+        grid_options = deepcopy(_opcoes_grid(grid_key, esquema, df.head(0), paginado, formatos))
+        # Datas viajam como AAAA-MM-DD e são formatadas no navegador
+        df = formatacao.datas_iso(df)
+    
+    # Renderiza o grid com key fixa
+    with etapa("grid_render", linhas=len(df)):
+        return AgGrid(
+            df,
+            gridOptions=grid_options,
+            height=height,
+            key=grid_key,  # Key fixa sem timestamp
+            fit_columns_on_grid_load=True,
+            enable_enterprise_modules=False,
+            update_mode=update_mode,  # Manual por padrão para não resetar
+            allow_unsafe_jscode=True
+        )
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _opcoes_grid(grid_key: str, esquema: tuple, _df_vazio, paginado=False, formatos=()):
+    """gridOptions padrão memorizado por (grid, esquema de colunas)"""
+    return monta_opcoes_grid(_df_vazio, paginado, formatos)
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _indice_grid(grid_key: str, versao: str, _df):
+    """Índices de ordenação/filtro memorizados por (grid, versão dos dados)"""
+    with etapa("grid_indice", linhas=len(_df)):
+        return IndiceGrid(_df)
+
+
+def _recorte_empresa(df, versao):
+    """Só as linhas da empresa escolhida na busca da barra lateral (se houver)"""
+    foco = st.session_state.get("empresa_foco")
+    if foco is None or "Código" not in df.columns:
+        return df, versao
+    mascara = (df["Código"] == foco["Código"]).to_numpy()
+    if foco.get(COLUNA_ESCRITORIO) is not None and COLUNA_ESCRITORIO in df.columns:
+        mascara = mascara & (df[COLUNA_ESCRITORIO] == foco[COLUNA_ESCRITORIO]).to_numpy()
+    st.caption(f"Mostrando somente a empresa {foco['Código']} (busca na barra lateral)")
+    versao = None if versao is None else f"{versao}:empresa:{foco['Código']}:{foco.get(COLUNA_ESCRITORIO)}"
+    return df[mascara], versao
+
+
+def _marcas_alteracao(df, mudancas):
+    """Colunas alteradas de cada linha desde a atualização anterior (None se nada mudou no recorte)"""
+    if mudancas is None:
+        return None
+    marcas = mudancas.marcacoes(df.index, df.columns)
+    alteradas = int((marcas != "").sum())
+    if not alteradas:
+        return None
+    horario = datetime.fromtimestamp(mudancas.em, FUSO_HORARIO).strftime("%H:%M")
+    st.caption(f"{alteradas} linha(s) com mudanças na atualização das {horario} (células destacadas)")
+    return marcas
+
+
+def exibe_grid(df, nome_arquivo, versao, height=400, grid_key="grid", update_mode=GridUpdateMode.MANUAL, formatos=None):
+    """Grid + downloads; acima de LINHAS_GRID_SERVIDOR o navegador recebe só a página visível"""
+    df, versao = _recorte_empresa(df, versao)
+    marcas = _marcas_alteracao(df, alteracoes_da_versao(versao))
+    if not LINHAS_GRID_SERVIDOR or len(df) <= LINHAS_GRID_SERVIDOR:
+        exibe_aggrid(df, height=height, grid_key=grid_key, update_mode=update_mode, formatos=formatos, marcas=marcas)
+        botoes_download(df, nome_arquivo, versao)
+        return
+    
+    indice = IndiceGrid(df) if versao is None else _indice_grid(grid_key, versao, df)
+    colunas = [str(c) for c in indice.df.columns]
+    
+    # Controles de filtro/ordenação (aplicados em pandas sobre todas as linhas)
+    c_coluna, c_termo, c_ordem, c_sentido = st.columns([2, 3, 2, 1])
+    coluna = c_coluna.selectbox("Filtrar em", [TODAS_AS_COLUNAS] + colunas, key=f"{grid_key}_coluna")
+    termo = c_termo.text_input("Contém", key=f"{grid_key}_termo")
+    ordenar_por = c_ordem.selectbox("Ordenar por", ["(planilha)"] + colunas, key=f"{grid_key}_ordem")
+    decrescente = c_sentido.checkbox("Decrescente", key=f"{grid_key}_decrescente")
+    
+    with etapa("grid_filtro", linhas=len(indice)) as medicao:
+        posicoes = indice.posicoes(
+            termo, coluna,
+            ordenar_por=None if ordenar_por == "(planilha)" else ordenar_por,
+            crescente=not decrescente
+        )
+        medicao.linhas = len(posicoes)
+    
+    # Página atual (volta para a última válida quando o filtro encolhe o resultado)
+    total_paginas = max(math.ceil(len(posicoes) / TAMANHO_PAGINA_SERVIDOR), 1)
+    chave_pagina = f"{grid_key}_pagina"
+    if st.session_state.get(chave_pagina, 1) > total_paginas:
+        st.session_state[chave_pagina] = total_paginas
+    c_pagina, c_info = st.columns([1, 4])
+    numero = c_pagina.number_input("Página", min_value=1, max_value=total_paginas, step=1, key=chave_pagina)
+    c_info.caption(f"{len(posicoes)} registros | página {numero} de {total_paginas}")
+    
+    inicio = (numero - 1) * TAMANHO_PAGINA_SERVIDOR
+    exibe_aggrid(
+        indice.pagina(posicoes, numero, TAMANHO_PAGINA_SERVIDOR),
+        height=height, grid_key=grid_key, update_mode=update_mode, paginado=True, formatos=formatos,
+        marcas=None if marcas is None else marcas[posicoes[inicio:inicio + TAMANHO_PAGINA_SERVIDOR]]
+    )
+    
+    # O download leva o conjunto filtrado completo, não só a página
+    filtro = f"{coluna}|{termo}|{ordenar_por}|{decrescente}"
+    botoes_download(indice.recorte(posicoes), nome_arquivo, versao, filtro=filtro)
+
+# ============================================================================
+# BARRA LATERAL: BUSCA DE EMPRESAS E MUDANÇAS
+# ============================================================================
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _indice_empresas(versao: str, _dados):
+    """Índice de busca das empresas ATIVAS, montado uma vez por versão dos dados"""
+    with etapa("busca_indice", linhas=len(_dados.ativas)):
+        return IndiceEmpresas(_dados.ativas)
+
+
+def _rotulo_empresa(linha):
+    """"Código - Razão Social (CNPJ)" para a lista de resultados"""
+    return f"{linha.get('Código', '')} - {linha.get('Razão Social', '')} ({linha.get('CNPJ', '')})"
+
+
+def busca_empresas():
+    """Busca por Código, CNPJ ou Razão Social: status em todas as obrigações e foco nas páginas"""
+    termo = st.sidebar.text_input("Buscar empresa", placeholder="Código, CNPJ ou razão social", key="busca_empresa")
+    st.session_state.pop("empresa_foco", None)
+    if not termo.strip():
+        return
+    dados = atualizador_planilha().atual()
+    if dados is None:
+        return  # Primeira carga em andamento (a página mostra o aviso)
+    
+    indice = _indice_empresas(dados.versao, dados)
+    with etapa("busca", pagina="BUSCA") as medicao:
+        posicoes, aproximada = indice.busca(termo)
+        medicao.linhas = len(posicoes)
+    if not posicoes:
+        st.sidebar.caption("Nenhuma empresa encontrada.")
+        return
+    if aproximada:
+        st.sidebar.caption("Nenhum resultado exato; mostrando nomes parecidos.")
+    
+    rotulos = {p: _rotulo_empresa(dados.ativas.iloc[p]) for p in posicoes}
+    posicao = st.sidebar.selectbox("Empresa", posicoes, format_func=rotulos.get, key="busca_resultado")
+    linha = dados.ativas.iloc[posicao]
+    
+    # Status da empresa em cada obrigação (mesmas regras da página CONSOLIDADO)
+    consolidado = consolidado_de(dados).df.iloc[posicao]
+    itens = "".join(
+        f"<b>{ob.nome}:</b> {consolidado[ob.coluna]}<br>"
+        for ob in relatorios.OBRIGACOES_CONSOLIDADO if ob.coluna in consolidado.index
+    )
+    st.sidebar.markdown(
+        f"<p style='font-size:13px;'>{itens}"
+        f"<b>{relatorios.COLUNA_PENDENCIAS}:</b> {consolidado[relatorios.COLUNA_PENDENCIAS]} | "
+        f"<b>{relatorios.COLUNA_CONCLUSAO}:</b> {consolidado[relatorios.COLUNA_CONCLUSAO]}%</p>",
+        unsafe_allow_html=True
+    )
+    
+    if st.sidebar.checkbox("Mostrar só esta empresa nas páginas", value=True, key="busca_filtra_paginas"):
+        st.session_state["empresa_foco"] = {
+            "Código": linha.get("Código"),
+            COLUNA_ESCRITORIO: linha.get(COLUNA_ESCRITORIO),
+        }
+
+
+def feed_mudancas():
+    """Mudanças das últimas atualizações da planilha (empresas inseridas, alteradas e removidas)"""
+    feed = mudancas_planilha().feed()
+    if not feed:
+        return
+    with st.sidebar.expander("Mudanças desde a última atualização"):
+        for mudancas in feed[:5]:
+            horario = datetime.fromtimestamp(mudancas.em, FUSO_HORARIO).strftime("%d/%m %H:%M")
+            st.caption(f"{horario}: " + " | ".join(f"{k}: {v}" for k, v in mudancas.contagem().items()))
+        st.dataframe(feed[0].feed.head(500), hide_index=True)
+
+
+@st.cache_resource(on_release=GeradorPacotes.fecha)
+def gerador_pacotes():
+    """Zips com todos os relatórios, gerados em segundo plano e compartilhados entre sessões"""
+    return GeradorPacotes()
+
+
+@st.fragment(run_every=1)
+def _progresso_pacote(versao, formatos):
+    """Barra de progresso atualizada sem rerodar a página; ao terminar, mostra o download"""
+    tarefa = gerador_pacotes().tarefa(versao, formatos)
+    if tarefa is None or tarefa.pronta:
+        st.rerun()
+    st.progress(tarefa.progresso, text=f"Gerando arquivos: {tarefa.concluidos} de {tarefa.total or '...'}")
+
+
+def pacote_relatorios():
+    """Todos os relatórios da competência em um zip (xlsx + CSV/Parquet opcionais)"""
+    with st.sidebar.expander("Baixar todos os relatórios"):
+        atuais = atualizador_planilha().atual()
+        if atuais is None:
+            return  # Primeira carga em andamento (a página mostra o aviso)
+        try:
+            armazenadas = historico().competencias()
+        except Exception:
+            armazenadas = []
+        opcoes = [atuais.competencia] + [c for c in armazenadas if c != atuais.competencia]
+        dados = atuais
+        if len(opcoes) > 1:
+            escolha = st.selectbox("Competência", opcoes, key="pacote_competencia")
+            if escolha != atuais.competencia:
+                dados = _dados_historicos(escolha, historico().versao(escolha))
+        extras = st.multiselect("Formatos além do Excel", ["csv", "parquet"], key="pacote_formatos")
+        formatos = ("xlsx", *extras)
+        
+        gerador = gerador_pacotes()
+        tarefa = gerador.tarefa(dados.versao, formatos)
+        if tarefa is None or tarefa.erro is not None:
+            if tarefa is not None:
+                st.error(f"Falha ao gerar o pacote: {tarefa.erro}")
+            if not st.button("Gerar pacote", key="pacote_gerar"):
+                return
+            tarefa = gerador.solicita(dados, formatos)
+        if not tarefa.pronta:
+            _progresso_pacote(dados.versao, tarefa.formatos)
+            return
+        st.download_button(
+            "Baixar zip",
+            data=lambda: tarefa.conteudo,
+            file_name=tarefa.nome_arquivo,
+            mime="application/zip",
+            key="pacote_baixar"
+        )
+        st.caption(f"{tarefa.total} arquivos | {len(tarefa.conteudo) / 1024 / 1024:.1f} MB | gerado em {tarefa.fim - tarefa.inicio:.1f} s")
+
+
+def barra_lateral():
+    """Busca de empresas, pacote de relatórios e feed de mudanças (abaixo do menu)"""
+    busca_empresas()
+    pacote_relatorios()
+    feed_mudancas()
+
+
+# ============================================================================
+# DESEMPENHO
+# ============================================================================
+
+def validacao_planilha(atualizador):
+    """Células da versão atual que o esquema da aba GERAL não aceitou"""
+    atual = atualizador.atual()
+    if atual is None or atual.validacao is None:
+        return
+    validacao = atual.validacao
+    if validacao.vazia:
+        st.caption("Validação da planilha: nenhum problema.")
+        return
+    st.caption("Validação da planilha: " + " | ".join(f"{k}: {v}" for k, v in validacao.resumo().items()))
+    if validacao.colunas_ausentes:
+        st.caption("Colunas obrigatórias ausentes: " + ", ".join(validacao.colunas_ausentes))
+    st.dataframe(validacao.contagem, hide_index=True)
+    st.dataframe(validacao.problemas, hide_index=True)
+
+
+def painel_desempenho():
+    """Painel de desempenho por página e etapa (opt-in: ?admin=1 na URL)"""
+    with st.expander("Desempenho", expanded=True):
+        resumo = METRICAS.resumo()
+        if resumo.empty:
+            st.info("Nenhuma medição registrada ainda.")
+        else:
+            st.dataframe(resumo, hide_index=True)
+        estatisticas = fonte_planilha().estatisticas
+        st.caption(f"Fonte da planilha ({FONTE_PLANILHA}): " + " | ".join(f"{k}: {v}" for k, v in estatisticas.items()))
+        metricas = cliente_http().metricas
+        st.caption(
+            f"Downloads: {metricas['downloads']} | {metricas['bytes'] / 1024 / 1024:.1f} MB | "
+            f"{metricas['segundos']:.1f} s | novas tentativas: {metricas['novas_tentativas']} | "
+            f"falhas: {metricas['falhas']}"
+        )
+        atualizador = atualizador_planilha()
+        if atualizador.ultimo_erro is not None:
+            st.caption(f"Última falha da atualização em segundo plano: {atualizador.ultimo_erro}")
+        validacao_planilha(atualizador)
+        if st.button("Zerar medições"):
+            METRICAS.limpa()
@@ -0,0 +1,43 @@
+# ============================================================================
+# PÁGINA CONSOLIDADO
+# ============================================================================
+
+import streamlit as st
+
+from luatech import relatorios
+from luatech.instrumentacao import pagina_instrumentada
+from luatech.paginas.comum import consolidado_de, dados_competencia, exibe_grid, exibe_totais
+
+
+@pagina_instrumentada("CONSOLIDADO")
+def exibe():
+    """Página CONSOLIDADO (todas as obrigações por empresa)"""
+    st.empty()
+    
+    dados = dados_competencia("CONSOLIDADO")
+    if dados is None:
+        return
+    
+    if dados.ativas.empty:
+        st.warning("Nenhuma empresa ATIVA encontrada.")
+        return
+    
+    relatorio = consolidado_de(dados)
+    exibe_totais(relatorio.titulo, relatorio.totais, dados.competencia)
+    
+    # Filtro de pendências (todas, qualquer obrigação ou uma obrigação específica)
+    por_obrigacao = {f"Pendentes em {ob.nome}": ob for ob in relatorios.OBRIGACOES_CONSOLIDADO}
+    filtro = st.selectbox(
+        "Mostrar",
+        ["Todas as empresas", "Com alguma pendência"] + list(por_obrigacao),
+        key="filtro_consolidado"
+    )
+    df = relatorio.df
+    if filtro == "Com alguma pendência":
+        df = relatorios.pendentes_em(df)
+    elif filtro in por_obrigacao:
+        df = relatorios.pendentes_em(df, por_obrigacao[filtro])
+    
+    # O filtro entra na versão: grid e downloads memorizados por recorte
+    versao = None if dados.versao is None else f"{dados.versao}:{filtro}"
+    exibe_grid(df, relatorio.nome_arquivo, versao, height=600, grid_key="grid_consolidado")
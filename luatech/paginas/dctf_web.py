@@ -0,0 +1,45 @@
+# ============================================================================
+# PÁGINA DCTF WEB
+# ============================================================================
+
+import streamlit as st
+from st_aggrid import GridUpdateMode
+
+from luatech import relatorios
+from luatech.instrumentacao import pagina_instrumentada
+from luatech.paginas.comum import dados_competencia, exibe_grid, exibe_totais
+
+
+@pagina_instrumentada("DCTF WEB")
+def exibe():
+    st.empty()  # Limpa renderizações anteriores
+
+    dados = dados_competencia("DCTF WEB")
+
+    if dados is None or dados.df.empty:
+        st.warning("Nenhum dado encontrado.")
+        return
+
+    # Somente ATIVAS (filtro já calculado na normalização)
+    if dados.ativas.empty:
+        st.warning("Nenhuma empresa ATIVA encontrada.")
+        return
+
+    # =========================
+    # DATAFRAME FINAL + TOTALIZADORES
+    # =========================
+    relatorio = relatorios.dctf_web(dados)
+
+    # =========================
+    # CABEÇALHO
+    # =========================
+    exibe_totais(relatorio.titulo, relatorio.totais, dados.competencia)
+
+    # =========================
+    # GRID + DOWNLOAD (sob demanda, memorizado por versão)
+    # =========================
+    exibe_grid(
+        relatorio.df, relatorio.nome_arquivo, dados.versao,
+        height=600, grid_key="grid_dctf", update_mode=GridUpdateMode.NO_UPDATE,
+        formatos=relatorio.formatos
+    )
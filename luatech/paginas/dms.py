@@ -0,0 +1,32 @@
+# ============================================================================
+# PÁGINA DMS
+# ============================================================================
+
+import streamlit as st
+
+from luatech import relatorios
+from luatech.instrumentacao import pagina_instrumentada
+from luatech.paginas.comum import dados_competencia, exibe_grid, exibe_totais
+
+
+@pagina_instrumentada("DMS")
+def exibe():
+    """Página DMS"""
+    st.empty()
+    
+    dados = dados_competencia("DMS")
+    if dados is None:
+        return
+    
+    if dados.ativas.empty:
+        st.warning("Nenhuma empresa ATIVA encontrada para DMS.")
+        return
+    
+    relatorio = relatorios.dms(dados)
+    exibe_totais(relatorio.titulo, relatorio.totais, dados.competencia)
+    
+    # Grid + download sob demanda (R$ formatado no navegador)
+    exibe_grid(
+        relatorio.df, relatorio.nome_arquivo, dados.versao, height=400, grid_key="grid_dms",
+        formatos=relatorio.formatos
+    )
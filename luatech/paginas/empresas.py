@@ -0,0 +1,38 @@
+# ============================================================================
+# PÁGINA EMPRESAS
+# ============================================================================
+
+import streamlit as st
+
+from luatech import relatorios
+from luatech.instrumentacao import pagina_instrumentada
+from luatech.paginas.comum import dados_competencia, exibe_grid, rotulo_competencia
+
+
+@pagina_instrumentada("EMPRESAS")
+def exibe():
+    """Página de listagem de empresas ativas"""
+    st.empty()
+    
+    dados = dados_competencia("EMPRESAS")
+    if dados is None:
+        return
+    
+    # Empresas ATIVAS (filtro já calculado na normalização)
+    if not dados.tem_situacao:
+        st.error("Coluna 'Situação' não encontrada.")
+        return
+    
+    relatorio = relatorios.empresas(dados)
+    
+    # Título
+    st.subheader(relatorio.titulo)
+    st.markdown(
+        f"<p style='text-align:right; font-size:20px;'>"
+        f"<b>Total:</b> {relatorio.totais['Total']} | {rotulo_competencia(dados.competencia)}</p>",
+        unsafe_allow_html=True
+    )
+    
+    # Exibe AgGrid + download (paginação no servidor em planilhas grandes)
+    with st.container():
+        exibe_grid(relatorio.df, relatorio.nome_arquivo, dados.versao, height=400, grid_key="grid_empresas")
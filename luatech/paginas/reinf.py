@@ -0,0 +1,30 @@
+# ============================================================================
+# PÁGINA REINF
+# ============================================================================
+
+import streamlit as st
+
+from luatech import relatorios
+from luatech.instrumentacao import pagina_instrumentada
+from luatech.paginas.comum import dados_competencia, exibe_grid, exibe_totais
+
+
+@pagina_instrumentada("REINF")
+def exibe():
+    """Página REINF"""
+    st.empty()
+    
+    dados = dados_competencia("REINF")
+    if dados is None or dados.df.empty:
+        st.warning("Nenhum dado encontrado.")
+        return
+    
+    if dados.ativas.empty:
+        st.warning("Nenhuma empresa ATIVA para REINF.")
+        return
+    
+    relatorio = relatorios.reinf(dados)
+    exibe_totais(relatorio.titulo, relatorio.totais, dados.competencia)
+    
+    # Grid + download sob demanda
+    exibe_grid(relatorio.df, relatorio.nome_arquivo, dados.versao, height=400, grid_key="grid_reinf")
@@ -0,0 +1,32 @@
+# ============================================================================
+# PÁGINA SEFAZ
+# ============================================================================
+
+import streamlit as st
+
+from luatech import relatorios
+from luatech.instrumentacao import pagina_instrumentada
+from luatech.paginas.comum import dados_competencia, exibe_grid, exibe_totais
+
+
+@pagina_instrumentada("SEFAZ")
+def exibe():
+    """Página SEFAZ"""
+    st.empty()
+    
+    dados = dados_competencia("SEFAZ")
+    if dados is None:
+        return
+    
+    if dados.ativas.empty:
+        st.warning("Nenhuma empresa ATIVA encontrada para SEFAZ.")
+        return
+    
+    relatorio = relatorios.sefaz(dados)
+    exibe_totais(relatorio.titulo, relatorio.totais, dados.competencia)
+    
+    # Grid + download sob demanda (R$ formatado no navegador)
+    exibe_grid(
+        relatorio.df, relatorio.nome_arquivo, dados.versao, height=400, grid_key="grid_sefaz",
+        formatos=relatorio.formatos
+    )
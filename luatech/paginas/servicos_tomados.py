@@ -0,0 +1,29 @@
+# ============================================================================
+# PÁGINA SERVIÇOS TOMADOS
+# ============================================================================
+
+import streamlit as st
+
+from luatech import relatorios
+from luatech.instrumentacao import pagina_instrumentada
+from luatech.paginas.comum import dados_competencia, exibe_grid, exibe_totais
+
+
+@pagina_instrumentada("SERVIÇOS TOMADOS")
+def exibe():
+    """Página SERVIÇOS TOMADOS"""
+    st.empty()
+    
+    dados = dados_competencia("SERVIÇOS TOMADOS")
+    if dados is None:
+        return
+    
+    if dados.ativas.empty:
+        st.warning("Nenhuma empresa ATIVA encontrada para SERVIÇOS TOMADOS.")
+        return
+    
+    relatorio = relatorios.servicos_tomados(dados)
+    exibe_totais(relatorio.titulo, relatorio.totais, dados.competencia)
+    
+    # Grid + download sob demanda
+    exibe_grid(relatorio.df, relatorio.nome_arquivo, dados.versao, height=400, grid_key="grid_rest")
@@ -0,0 +1,29 @@
+# ============================================================================
+# PÁGINA SIMPLES NACIONAL
+# ============================================================================
+
+import streamlit as st
+
+from luatech import relatorios
+from luatech.instrumentacao import pagina_instrumentada
+from luatech.paginas.comum import dados_competencia, exibe_grid, exibe_totais
+
+
+@pagina_instrumentada("SIMPLES NACIONAL")
+def exibe():
+    """Página SIMPLES NACIONAL"""
+    st.empty()
+    
+    dados = dados_competencia("SIMPLES NACIONAL")
+    if dados is None:
+        return
+    
+    relatorio = relatorios.simples(dados)
+    if relatorio.df.empty:
+        st.warning("Nenhuma empresa SIMPLES NACIONAL ATIVA encontrada.")
+        return
+    
+    exibe_totais(relatorio.titulo, relatorio.totais, dados.competencia)
+    
+    # Grid + download sob demanda
+    exibe_grid(relatorio.df, relatorio.nome_arquivo, dados.versao, height=400, grid_key="grid_simples")
@@ -0,0 +1,262 @@
+# ============================================================================
+# RELATÓRIOS
+# Tabela e totalizadores de cada página, montados a partir dos dados
+# normalizados (sem Streamlit: as páginas só exibem o resultado)
+# ============================================================================
+
+import numpy as np
+import pandas as pd
+
+from luatech import formatacao, obrigacoes
+from luatech.normalizacao import DadosNormalizados, sem_ausentes
+
+
+class Relatorio:
+    """Tabela exibida por uma página, com totalizadores e formatos do grid"""
+
+    def __init__(self, titulo, nome_arquivo, df, totais=None, formatos=None):
+        self.titulo = titulo
+        self.nome_arquivo = nome_arquivo
+        self.df = df
+        self.totais = dict(totais or {})
+        self.formatos = dict(formatos or {})
+
+
+def _numerico(df, colunas):
+    """Colunas monetárias (já numéricas pelo esquema; R$ formatado no navegador); vazios viram 0"""
+    presentes = [col for col in colunas if col in df.columns]
+    for col in presentes:
+        serie = df[col]
+        if not pd.api.types.is_numeric_dtype(serie):
+            serie = pd.to_numeric(serie, errors="coerce")
+        df[col] = serie.fillna(0) if serie.isna().any() else serie
+    return {col: formatacao.MOEDA for col in presentes}
+
+
+def empresas(dados) -> Relatorio:
+    """Empresas ATIVAS"""
+    colunas = ["Código", "Razão Social", "CNPJ", "Regime", "Município", "Estado", "Matriz / Filial", "Situação"]
+    df = dados.visao(colunas)
+    return Relatorio("Empresas - Apenas ATIVAS", "empresas", df, {"Total": df.shape[0]})
+
+
+def simples(dados) -> Relatorio:
+    """SIMPLES NACIONAL (empresas ATIVAS do regime); vazio sem Situação/Regime"""
+    colunas = ["Código", "Razão Social", "CNPJ", "Regime", "Município", "Estado", "SIMPLES GERADO", "Situação"]
+    if not (dados.tem_situacao and "Regime" in dados.status.columns):
+        return Relatorio("SIMPLES NACIONAL", "simples_nacional", pd.DataFrame())
+    mascara = (dados.maiusculas("Regime") == "SIMPLES NACIONAL").to_numpy()
+    df = dados.visao(colunas, mascara=mascara)
+    if df.empty:
+        return Relatorio("SIMPLES NACIONAL", "simples_nacional", df)
+
+    resultado = obrigacoes.avalia(obrigacoes.SIMPLES, dados, mascara=mascara)
+    df["SIMPLES GERADO"] = resultado.status
+    return Relatorio("SIMPLES NACIONAL", "simples_nacional", df, resultado.totais)
+
+
+def reinf(dados) -> Relatorio:
+    """REINF (coluna ausente na planilha = nenhuma transmissão)"""
+    colunas = ["Código", "Razão Social", "CNPJ", "Regime", "TRANSMISSÃO", "Situação"]
+    df = dados.visao(colunas)
+    resultado = obrigacoes.avalia(obrigacoes.REINF, dados)
+    df["TRANSMISSÃO"] = resultado.status
+    df = df[[c for c in dados.colunas_visao(colunas) if c in df.columns]]
+    return Relatorio("REINF", "reinf", df, resultado.totais)
+
+
+def dctf_web(dados) -> Relatorio:
+    """DCTF WEB (PERÍODO como data, exibido MM-AAAA)"""
+    df = dados.visao([
+        "Código", "Razão Social", "CNPJ", "Regime", "PERÍODO", "ORIGEM",
+        "TIPO", "SITUAÇÃO DCTF", "MATRIZ / FILIAL", "Situação"
+    ])
+    df = sem_ausentes(df, [c for c in df.columns if c != "PERÍODO"])
+    if dados.periodo_ativas is not None:
+        df["PERÍODO"] = dados.periodo_ativas
+    resultado = obrigacoes.avalia(obrigacoes.DCTF_WEB, dados)
+    return Relatorio("DCTF WEB", "dctf_web", df, resultado.totais, {"PERÍODO": formatacao.MES})
+
+
+def dms(dados) -> Relatorio:
+    """DMS (coluna de guia ausente = guia não salva)"""
+    colunas = [
+        "Código", "Razão Social", "CNPJ", "Regime", "Município", "Estado",
+        "FATURAMENTO SERVIÇOS", "BASE DE CÁLCULO ISS", "XML DMS", "DMS", "GUIA ISS DMS", "Situação"
+    ]
+    df = dados.visao(colunas)
+    formatos = _numerico(df, ["FATURAMENTO SERVIÇOS", "BASE DE CÁLCULO ISS"])
+    if "DMS" in df.columns:
+        df = sem_ausentes(df, ["DMS"])
+    df["GUIA ISS DMS"] = obrigacoes.avalia(obrigacoes.GUIA_ISS_DMS, dados).status
+    df = df[[c for c in dados.colunas_visao(colunas) if c in df.columns]]
+
+    resultado = obrigacoes.avalia(obrigacoes.DMS, dados)
+    return Relatorio("DMS", "dms", df, resultado.totais, formatos)
+
+
+def servicos_tomados(dados) -> Relatorio:
+    """SERVIÇOS TOMADOS (REST)"""
+    colunas = ["Código", "Razão Social", "CNPJ", "REST", "XML REST", "GUIA ISS REST", "Situação"]
+    df = dados.visao(colunas)
+    if "GUIA ISS REST" in df.columns:
+        df["GUIA ISS REST"] = sem_ausentes(df, ["GUIA ISS REST"])["GUIA ISS REST"].astype(str)
+    resultado = obrigacoes.avalia(obrigacoes.SERVICOS_TOMADOS, dados)
+    if "REST" in df.columns:
+        df["REST"] = resultado.status
+    return Relatorio("SERVIÇOS TOMADOS", "servicos_tomados", df, resultado.totais)
+
+
+def sefaz(dados) -> Relatorio:
+    """SEFAZ (totais numéricos; coluna ausente = contadores zerados)"""
+    colunas = [
+        "Código", "Razão Social", "CNPJ", "Estado", "Insc. Estadual",
+        "XML ENTRADA", "XML SAÍDA", "IMPORTAÇÃO",
+        "TOTAL ENTRADA", "TOTAL SAÍDA", "TOTAL DOMÍNIO", "Situação"
+    ]
+    df = dados.visao(colunas)
+    formatos = _numerico(df, ["TOTAL ENTRADA", "TOTAL SAÍDA", "TOTAL DOMÍNIO"])
+    resultado = obrigacoes.avalia(obrigacoes.SEFAZ, dados)
+    return Relatorio("SEFAZ", "sefaz", df, resultado.totais, formatos)
+
+
+# ============================================================================
+# CONSOLIDADO
+# ============================================================================
+
+# Obrigações do consolidado, na ordem das colunas (uma coluna de status cada)
+OBRIGACOES_CONSOLIDADO = (
+    obrigacoes.SIMPLES, obrigacoes.REINF, obrigacoes.DCTF_WEB,
+    obrigacoes.DMS, obrigacoes.SERVICOS_TOMADOS, obrigacoes.SEFAZ,
+)
+COLUNA_PENDENCIAS = "Pendências"
+COLUNA_CONCLUSAO = "% Concluído"
+NAO_SE_APLICA = "-"
+
+
+def _fora_do_escopo(obrigacao, dados) -> np.ndarray:
+    """Empresas que a página da obrigação não lista (SIMPLES: só o regime)"""
+    fora = np.zeros(len(dados.ativas), dtype=bool)
+    if obrigacao is obrigacoes.SIMPLES:
+        if "Regime" in dados.status_ativas.columns:
+            fora |= (dados.maiusculas("Regime") != "SIMPLES NACIONAL").to_numpy()
+        else:
+            fora[:] = True
+    return fora
+
+
+def _dispensadas(obrigacao, dados, status) -> np.ndarray:
+    """Linhas em que a obrigação não se aplica pelo status (mesmas regras das páginas)"""
+    dispensadas = status.isin(obrigacao.dispensados).to_numpy()
+    if obrigacao is obrigacoes.DCTF_WEB and "MATRIZ / FILIAL" in dados.status_ativas.columns:
+        # Filiais ficam fora das "Não concluídas" da DCTF
+        dispensadas = dispensadas | (dados.maiusculas("MATRIZ / FILIAL") == "FILIAL").to_numpy()
+    return dispensadas
+
+
+def _colunas_consolidado(dados) -> dict:
+    """Status de cada obrigação, pendências e % concluído das ATIVAS (cada linha só depende dela mesma)"""
+    colunas = {}
+    concluidas = np.zeros(len(dados.ativas), dtype=np.int64)
+    aplicaveis = np.zeros(len(dados.ativas), dtype=np.int64)
+
+    for obrigacao in OBRIGACOES_CONSOLIDADO:
+        status = obrigacoes.avalia(obrigacao, dados).status
+        fora = _fora_do_escopo(obrigacao, dados)
+        feitas = status.isin(obrigacao.concluidos).to_numpy() & ~fora
+        dispensadas = (_dispensadas(obrigacao, dados, status) | fora) & ~feitas
+        concluidas += feitas
+        aplicaveis += ~dispensadas
+
+        # Dispensa por regra (regime, filial) aparece como "-"; a do próprio status fica visível
+        por_regra = dispensadas & ~status.isin(obrigacao.dispensados).to_numpy()
+        if por_regra.any():
+            status = status.cat.add_categories([NAO_SE_APLICA]).mask(por_regra, NAO_SE_APLICA)
+        colunas[obrigacao.coluna] = status
+
+    colunas[COLUNA_PENDENCIAS] = pd.Series(aplicaveis - concluidas, index=dados.indice_ativas)
+    colunas[COLUNA_CONCLUSAO] = pd.Series(np.where(
+        aplicaveis > 0, np.round(100 * concluidas / np.maximum(aplicaveis, 1)), 100
+    ).astype(np.int64), index=dados.indice_ativas)
+    return colunas
+
+
+def _relatorio_consolidado(df) -> Relatorio:
+    pendentes = int((df[COLUNA_PENDENCIAS] > 0).sum())
+    totais = {
+        "Empresas": len(df),
+        "Em dia": len(df) - pendentes,
+        "Com pendência": pendentes,
+        "Média concluída": f"{df[COLUNA_CONCLUSAO].mean():.0f}%" if len(df) else "-",
+    }
+    return Relatorio("CONSOLIDADO", "consolidado", df, totais)
+
+
+def consolidado(dados) -> Relatorio:
+    """Uma linha por empresa ATIVA: status de cada obrigação, pendências e % concluído"""
+    df = dados.visao(["Código", "Razão Social", "CNPJ", "Regime"])
+    for coluna, valores in _colunas_consolidado(dados).items():
+        df[coluna] = valores
+    return _relatorio_consolidado(df)
+
+
+def consolidado_incremental(anterior: Relatorio, dados, mudancas) -> Relatorio:
+    """CONSOLIDADO da versão nova recalculando só as empresas inseridas/alteradas.
+
+    As demais linhas são copiadas de `anterior` (CONSOLIDADO da versão de
+    `mudancas.versao_anterior`); os totais são refeitos sobre o resultado.
+    """
+    origem = mudancas.rotulos_anteriores(dados.indice_ativas)
+    reaproveita = (origem >= 0) & pd.Index(origem).isin(anterior.df.index)
+    if not mudancas.mesmas_colunas or not reaproveita.any():
+        return consolidado(dados)
+
+    recalcular = dados.indice_ativas[~reaproveita]
+    novas = {}
+    if len(recalcular):
+        novas = _colunas_consolidado(DadosNormalizados(dados.df.loc[recalcular], compacto=False))
+
+    df = dados.visao(["Código", "Razão Social", "CNPJ", "Regime"])
+    antigas = anterior.df.loc[origem[reaproveita]].set_axis(dados.indice_ativas[reaproveita])
+    for coluna in [c for c in anterior.df.columns if c not in df.columns]:
+        partes = [antigas[coluna]] + ([novas[coluna]] if coluna in novas else [])
+        valores = pd.concat(partes).reindex(df.index)
+        if isinstance(anterior.df[coluna].dtype, pd.CategoricalDtype):
+            valores = valores.astype("category")
+        df[coluna] = valores
+    return _relatorio_consolidado(df)
+
+
+def pendentes_em(df: pd.DataFrame, obrigacao=None) -> pd.DataFrame:
+    """Linhas do consolidado com alguma pendência (ou pendentes na obrigação dada)"""
+    if obrigacao is None:
+        return df[df[COLUNA_PENDENCIAS] > 0]
+    resolvidos = set(obrigacao.concluidos) | set(obrigacao.dispensados) | {NAO_SE_APLICA}
+    return df[~df[obrigacao.coluna].isin(resolvidos)]
+
+
+# Página do menu -> montagem do relatório
+RELATORIOS = {
+    "EMPRESAS": empresas,
+    "SIMPLES NACIONAL": simples,
+    "REINF": reinf,
+    "DCTF WEB": dctf_web,
+    "DMS": dms,
+    "SERVIÇOS TOMADOS": servicos_tomados,
+    "SEFAZ": sefaz,
+    "CONSOLIDADO": consolidado,
+}
+
+
+def monta_todos(dados, paginas=None) -> dict:
+    """Relatórios das páginas pedidas (todas por padrão) sobre a mesma carga"""
+    return {pagina: RELATORIOS[pagina](dados) for pagina in (paginas or RELATORIOS)}
+
+
+def resumo(relatorios: dict, competencia: str = "") -> pd.DataFrame:
+    """Uma linha por totalizador de cada relatório (mais a contagem de linhas)"""
+    linhas = []
+    for pagina, relatorio in relatorios.items():
+        linhas.append((competencia, pagina, "Linhas", len(relatorio.df)))
+        linhas += [(competencia, pagina, rotulo, valor) for rotulo, valor in relatorio.totais.items()]
+    return pd.DataFrame(linhas, columns=["Competência", "Relatório", "Totalizador", "Valor"])
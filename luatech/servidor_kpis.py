@@ -0,0 +1,355 @@
+# ============================================================================
+# SERVIDOR DE INDICADORES (JSON)
+# Totais por obrigação e status por empresa para painéis e robôs, lidos dos
+# snapshots do cache em disco do aplicativo (nunca da planilha de origem).
+# Cada resposta é montada uma vez por versão dos dados e servida com ETag.
+# Só a fonte xlsx grava esses snapshots: com GESTOR_FISCAL_FONTE=sheets_api o
+# servidor não sobe sem snapshots de uma carga xlsx anterior (e, com eles,
+# serve essa versão, que deixa de ser atualizada).
+# Uso: python -m luatech.servidor_kpis [--porta 8502] [--escritorios escritorios.json]
+# Com GESTOR_FISCAL_KPIS_TOKEN definido, toda requisição precisa de
+# "Authorization: Bearer <token>"; sem ele, só escuta em loopback.
+# Rotas (todas aceitam ?competencia=MM/AAAA e ?escritorio=NOME):
+#   GET /kpis               totalizadores de cada página
+#   GET /empresas           status de todas as empresas ATIVAS (CONSOLIDADO)
+#   GET /empresas/<código>  status de uma empresa
+#   GET /saude              versão, competência e horário dos dados
+# ============================================================================
+
+import argparse
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+# Logs JSON por etapa só quando pedidos
+os.environ.setdefault("GESTOR_FISCAL_LOG_DESEMPENHO", "off")
+
+from luatech.atualizacao import AtualizadorPlanilha  # noqa: E402
+from luatech.cache_planilha import CachePlanilha  # noqa: E402
+from luatech.escritorios import PLANILHA_PADRAO, CargaEscritorios, carrega_registro  # noqa: E402
+from luatech.historico import HistoricoCompetencias  # noqa: E402
+from luatech.leitura_xlsx import assinatura_leitura, ler_xlsx  # noqa: E402
+from luatech.normalizacao import DadosNormalizados, compacta  # noqa: E402
+from luatech import relatorios  # noqa: E402
+
+logger = logging.getLogger("gestor_fiscal.servidor_kpis")
+
+# Respostas guardadas por versão dos dados (rota x competência x escritório x código)
+LIMITE_RESPOSTAS = 1024
+
+_COMPETENCIA = re.compile(r"\d{2}/\d{4}")
+
+# Token exigido dos clientes (vazio = sem autenticação, só em loopback)
+VARIAVEL_TOKEN = "GESTOR_FISCAL_KPIS_TOKEN"
+
+# Fonte da planilha do aplicativo (ver luatech/paginas/comum.py)
+VARIAVEL_FONTE = "GESTOR_FISCAL_FONTE"
+
+# Entity-tags de If-None-Match: "x", W/"x" ou *
+_ENTITY_TAG = re.compile(r'\s*(\*|(?:W/)?"[^"]*")\s*(?:,|$)')
+
+
+class ErroConsulta(Exception):
+    """Consulta inválida ou sem dados (vira a resposta HTTP `status`)"""
+
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+
+
+class SnapshotsEmDisco:
+    """Fonte das planilhas só com os snapshots do cache (interface de CargaEscritorios)"""
+
+    def __init__(self, cache: CachePlanilha):
+        self.cache = cache
+        self._lidos = {}
+
+    def obtem(self, url: str, aba: str, tolera_falha=True):
+        versao = self.cache.versao_snapshot(url, aba)
+        if versao is None:
+            raise RuntimeError("sem snapshot no cache (abra o aplicativo ou rode a exportação em lote)")
+        anterior = self._lidos.get((url, aba))
+        if anterior is not None and anterior.attrs.get("versao") == versao:
+            return anterior
+        df = self.cache.carrega_snapshot(url, aba)
+        if df is None:
+            raise RuntimeError("snapshot do cache ilegível")
+        self._lidos[(url, aba)] = df = compacta(df)
+        return df
+
+
+def _json_padrao(valor):
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return str(valor)
+
+
+def _registros(df: pd.DataFrame) -> str:
+    """Linhas como lista JSON de objetos (datas ISO, ausentes = null)"""
+    return df.to_json(orient="records", force_ascii=False, date_format="iso")
+
+
+def _linhas_do_codigo(df: pd.DataFrame, codigo: str) -> pd.DataFrame:
+    """Linhas com o Código pedido (Matriz e Filial podem repetir o código)"""
+    if codigo.isdigit() and pd.api.types.is_numeric_dtype(df["Código"]):
+        return df[(df["Código"] == int(codigo)).to_numpy()]
+    return df[(df["Código"].astype(str).str.strip() == codigo).to_numpy()]
+
+
+class Indicadores:
+    """Respostas JSON de uma versão dos dados, montadas na primeira consulta"""
+
+    def __init__(self, df: pd.DataFrame, historico=None):
+        self.dados = DadosNormalizados(df)
+        self.versao = self.dados.versao
+        self.consultado_em = df.attrs.get("consultado_em")
+        self.historico = historico
+        self._lock = threading.Lock()
+        self._dados = {}
+        self._relatorios = {}
+        self._respostas = {}
+
+    # ------------------------------------------------------------------
+    # Dados por competência / escritório
+    # ------------------------------------------------------------------
+
+    def _dados_de(self, competencia: str, escritorio: str):
+        chave = (competencia, escritorio)
+        if chave in self._dados:
+            return self._dados[chave]
+
+        dados = self.dados
+        if competencia and competencia != dados.competencia:
+            if not _COMPETENCIA.fullmatch(competencia):
+                raise ErroConsulta(400, f"competência inválida: {competencia} (use MM/AAAA)")
+            if self.historico is None or competencia not in self.historico.competencias():
+                raise ErroConsulta(404, f"competência {competencia} não encontrada")
+            dados = DadosNormalizados(self.historico.carrega(competencia))
+        if escritorio:
+            if escritorio not in dados.escritorios:
+                raise ErroConsulta(404, f"escritório {escritorio} não encontrado")
+            dados = dados.do_escritorio(escritorio)
+        self._dados[chave] = dados
+        return dados
+
+    def _relatorios_de(self, competencia: str, escritorio: str) -> dict:
+        chave = (competencia, escritorio)
+        if chave not in self._relatorios:
+            self._relatorios[chave] = relatorios.monta_todos(self._dados_de(competencia, escritorio))
+        return self._relatorios[chave]
+
+    # ------------------------------------------------------------------
+    # Respostas
+    # ------------------------------------------------------------------
+
+    def _cabecalho(self, dados, escritorio: str) -> dict:
+        return {"competencia": dados.competencia, "escritorio": escritorio or None, "versao": self.versao}
+
+    def _monta(self, rota: str, competencia: str, escritorio: str) -> str:
+        if rota == "/saude":
+            consultado = self.consultado_em
+            return json.dumps({
+                "versao": self.versao,
+                "competencia": self.dados.competencia,
+                "escritorios": self.dados.escritorios,
+                "empresas_ativas": len(self.dados.ativas),
+                "validacao": self.dados.validacao.resumo(),
+                "consultado_em": None if consultado is None else datetime.fromtimestamp(consultado, timezone.utc).isoformat(),
+            }, ensure_ascii=False)
+
+        dados = self._dados_de(competencia, escritorio)
+        if rota == "/kpis":
+            corpo = self._cabecalho(dados, escritorio)
+            corpo["obrigacoes"] = {
+                pagina: {"Linhas": len(relatorio.df), **relatorio.totais}
+                for pagina, relatorio in self._relatorios_de(competencia, escritorio).items()
+            }
+            return json.dumps(corpo, ensure_ascii=False, default=_json_padrao)
+
+        consolidado = self._relatorios_de(competencia, escritorio)["CONSOLIDADO"].df
+        if rota == "/empresas":
+            linhas = consolidado
+        elif rota.startswith("/empresas/"):
+            codigo = unquote(rota[len("/empresas/"):]).strip()
+            linhas = _linhas_do_codigo(consolidado, codigo)
+            if linhas.empty:
+                raise ErroConsulta(404, f"empresa {codigo} não encontrada entre as ATIVAS")
+        else:
+            raise ErroConsulta(404, f"rota desconhecida: {rota}")
+        cabecalho = json.dumps(self._cabecalho(dados, escritorio), ensure_ascii=False)
+        return f'{cabecalho[:-1]}, "empresas": {_registros(linhas)}}}'
+
+    def resposta(self, rota: str, competencia="", escritorio=""):
+        """(ETag, corpo em bytes) da rota, montada uma vez por versão dos dados"""
+        chave = (rota, competencia, escritorio)
+        pronta = self._respostas.get(chave)
+        if pronta is not None:
+            return pronta
+        with self._lock:
+            pronta = self._respostas.get(chave)
+            if pronta is None:
+                corpo = self._monta(rota, competencia, escritorio).encode("utf-8")
+                etag = '"' + hashlib.sha256(corpo).hexdigest()[:32] + '"'
+                pronta = (etag, corpo)
+                if len(self._respostas) < LIMITE_RESPOSTAS:
+                    self._respostas[chave] = pronta
+        return pronta
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+def etag_confere(etag: str, if_none_match) -> bool:
+    """If-None-Match: lista de entity-tags separadas por vírgula ou *, com comparação fraca"""
+    if not if_none_match:
+        return False
+    opaca = etag.removeprefix("W/")
+    return any(tag == "*" or tag.removeprefix("W/") == opaca for tag in _ENTITY_TAG.findall(if_none_match))
+
+
+def _loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: painéis repetem consultas na mesma conexão
+    server_version = "GestorFiscalKPIs"
+    # Cabeçalho e corpo saem em escritas separadas: sem Nagle, nada de esperar o ACK atrasado
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if not self._autorizado():
+            return self._envia(
+                401, json.dumps({"erro": "token ausente ou inválido"}, ensure_ascii=False).encode("utf-8"),
+                cabecalhos={"WWW-Authenticate": 'Bearer realm="kpis"'}
+            )
+        partes = urlsplit(self.path)
+        parametros = parse_qs(partes.query)
+        competencia = parametros.get("competencia", [""])[0].strip()
+        escritorio = parametros.get("escritorio", [""])[0].strip()
+        indicadores = self.server.atualizador.atual()
+        if indicadores is None:
+            erro = self.server.atualizador.ultimo_erro or "primeira carga em andamento"
+            return self._envia(503, json.dumps({"erro": f"dados indisponíveis: {erro}"}, ensure_ascii=False).encode("utf-8"))
+        try:
+            etag, corpo = indicadores.resposta(partes.path.rstrip("/") or "/", competencia, escritorio)
+        except ErroConsulta as e:
+            return self._envia(e.status, json.dumps({"erro": str(e)}, ensure_ascii=False).encode("utf-8"))
+        except Exception as e:
+            logger.warning("Falha ao responder %s: %s", self.path, e)
+            return self._envia(503, json.dumps({"erro": f"dados indisponíveis: {e}"}, ensure_ascii=False).encode("utf-8"))
+
+        if etag_confere(etag, self.headers.get("If-None-Match")):
+            return self._envia(304, b"", etag)
+        return self._envia(200, corpo, etag)
+
+    def _autorizado(self) -> bool:
+        """Authorization: Bearer <token> (sem token configurado, tudo passa)"""
+        if not self.server.token:
+            return True
+        esquema, _, credencial = (self.headers.get("Authorization") or "").partition(" ")
+        return esquema.lower() == "bearer" and hmac.compare_digest(
+            credencial.strip().encode("utf-8"), self.server.token.encode("utf-8")
+        )
+
+    def _envia(self, status: int, corpo: bytes, etag=None, cabecalhos=None):
+        self.send_response(status)
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        if corpo:
+            self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        logger.debug(formato, *args)
+
+
+def cria_servidor(host="127.0.0.1", porta=8502, escritorios=None, cache=None, intervalo=30, historico=None,
+                  token=None, fonte=None):
+    """Servidor HTTP pronto para serve_forever(); `atualizador` relê o cache a cada `intervalo` s.
+
+    `token` None lê GESTOR_FISCAL_KPIS_TOKEN; sem token, só aceita host de loopback (ValueError).
+    `fonte` None lê GESTOR_FISCAL_FONTE; fora do xlsx, exige snapshots já salvos (ValueError).
+    """
+    token = os.environ.get(VARIAVEL_TOKEN, "") if token is None else token
+    if not token and not _loopback(host):
+        raise ValueError(f"sem {VARIAVEL_TOKEN}, o servidor só escuta em loopback (host pedido: {host!r})")
+    fonte = os.environ.get(VARIAVEL_FONTE, "xlsx") if fonte is None else fonte
+    cache = cache or CachePlanilha(leitor=ler_xlsx, versao_leitor=assinatura_leitura())
+    escritorios = escritorios or [PLANILHA_PADRAO]
+    if fonte != "xlsx":
+        # O aplicativo com essa fonte não grava snapshots: sem eles, 503 para sempre
+        if all(cache.versao_snapshot(e.url, e.aba) is None for e in escritorios):
+            raise ValueError(
+                f"{VARIAVEL_FONTE}={fonte} não grava snapshots no cache ({cache.diretorio}) e não há nenhum; "
+                "o servidor de indicadores só lê os da fonte xlsx"
+            )
+        logger.warning("%s=%s: servindo os snapshots xlsx já salvos, que não serão atualizados", VARIAVEL_FONTE, fonte)
+    carga = CargaEscritorios(escritorios, SnapshotsEmDisco(cache).obtem)
+    if historico is None:
+        historico = HistoricoCompetencias()
+    servidor = ThreadingHTTPServer((host, porta), _Manipulador)
+    servidor.daemon_threads = True
+    servidor.token = token
+    servidor.carga = carga
+    servidor.atualizador = AtualizadorPlanilha(
+        carga, lambda df: Indicadores(df, historico), intervalo=intervalo, antecedencia=0
+    )
+    return servidor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Indicadores do Gestor Fiscal em JSON (a partir do cache em disco)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8502)
+    parser.add_argument(
+        "--escritorios", default=os.environ.get("GESTOR_FISCAL_ESCRITORIOS", "escritorios.json"),
+        help="registro de escritórios (JSON); sem ele, a planilha padrão"
+    )
+    parser.add_argument("--intervalo", type=int, default=30, help="segundos entre verificações do cache")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        servidor = cria_servidor(args.host, args.porta, carrega_registro(args.escritorios), intervalo=args.intervalo)
+    except ValueError as e:
+        parser.error(str(e))
+    # A carga já começou na criação; espera um pouco só para o log dizer se há dados
+    if not servidor.atualizador.aguarda(10) or servidor.atualizador.atual() is None:
+        logger.warning("Sem dados no cache por enquanto: %s", servidor.atualizador.ultimo_erro)
+    logger.info("Indicadores em http://%s:%d/kpis", args.host, servidor.server_port)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servidor.atualizador.para()
+        servidor.carga.fecha()
+
+
+if __name__ == "__main__":
+    main()
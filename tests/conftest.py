@@ -0,0 +1,10 @@
+import os
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+sys.path.insert(0, str(RAIZ / "benchmarks"))
+
+# Os logs JSON por etapa só atrapalham a saída dos testes
+os.environ.setdefault("GESTOR_FISCAL_LOG_DESEMPENHO", "off")
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pandas as pd
+
+from luatech.atualizacao import AtualizadorPlanilha
+
+
+def _df(versao):
+    df = pd.DataFrame({"Código": [1]})
+    df.attrs = {"versao": versao, "consultado_em": time.time()}
+    return df
+
+
+class _Origem:
+    """carregar() que só responde depois de `libera()`"""
+
+    def __init__(self, versao):
+        self.versao = versao
+        self.liberada = threading.Event()
+        self.chamadas = 0
+
+    def __call__(self, tolera_falha=False):
+        self.chamadas += 1
+        self.liberada.wait(5)
+        return _df(self.versao)
+
+    def libera(self):
+        self.liberada.set()
+
+
+def _espera(condicao, timeout=5):
+    limite = time.monotonic() + timeout
+    while not condicao() and time.monotonic() < limite:
+        time.sleep(0.01)
+    return condicao()
+
+
+def test_serve_os_dados_salvos_enquanto_a_primeira_carga_roda():
+    origem = _Origem("nova")
+    atualizador = AtualizadorPlanilha(origem, lambda df: df.attrs["versao"], inicial=lambda: _df("salva"))
+    try:
+        # A thread começa na construção, sem ninguém chamar atual()
+        assert _espera(lambda: origem.chamadas == 1)
+        assert atualizador.aguarda(1)
+        assert atualizador.atual() == "salva"
+        origem.libera()
+        assert _espera(lambda: atualizador.atual() == "nova")
+    finally:
+        origem.libera()
+        atualizador.para()
+
+
+def test_sem_dados_salvos_atual_nao_espera_a_carga():
+    origem = _Origem("nova")
+    atualizador = AtualizadorPlanilha(origem, lambda df: df.attrs["versao"])
+    try:
+        inicio = time.monotonic()
+        assert atualizador.atual() is None
+        assert not atualizador.aguarda(0.1)
+        assert time.monotonic() - inicio < 1
+        origem.libera()
+        assert atualizador.aguarda(5)
+        assert atualizador.atual() == "nova"
+    finally:
+        origem.libera()
+        atualizador.para()
+
+
+def test_falha_na_primeira_carga_libera_quem_espera():
+    def falha(tolera_falha=False):
+        raise OSError("origem fora do ar")
+
+    atualizador = AtualizadorPlanilha(falha, lambda df: df, tentativas=1, espera_base=60)
+    try:
+        assert atualizador.aguarda(5)
+        assert atualizador.atual() is None
+        assert isinstance(atualizador.ultimo_erro, OSError)
+    finally:
+        atualizador.para()
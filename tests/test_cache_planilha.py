@@ -0,0 +1,156 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from luatech.cache_planilha import CachePlanilha
+from luatech.cliente_http import ClienteHTTP
+
+
+def _xlsx(linhas=3) -> bytes:
+    saida = BytesIO()
+    pd.DataFrame({"Código": range(1, linhas + 1), "Situação": ["ATIVA"] * linhas}).to_excel(
+        saida, sheet_name="GERAL", index=False
+    )
+    return saida.getvalue()
+
+
+class _Origem:
+    """Servidor local no lugar da exportação do Google: ETag muda a cada `toca()`"""
+
+    def __init__(self, conteudo: bytes):
+        self.conteudo = conteudo
+        self.modificacao = 0
+        self.requisicoes = []   # status de cada resposta
+        origem = self
+
+        class Manipulador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                etag = f'"{origem.modificacao}-{hashlib.sha256(origem.conteudo).hexdigest()[:8]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    origem.requisicoes.append(304)
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                origem.requisicoes.append(200)
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(origem.conteudo)))
+                self.end_headers()
+                self.wfile.write(origem.conteudo)
+
+            def log_message(self, *args):
+                pass
+
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manipulador)
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.servidor.server_port}/geral.xlsx"
+
+    def toca(self):
+        """Arquivo salvo de novo sem mudar o conteúdo (ETag novo, mesmo hash)"""
+        self.modificacao += 1
+
+    def desliga(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+
+@pytest.fixture
+def origem():
+    origem = _Origem(_xlsx())
+    yield origem
+    if origem.servidor.socket.fileno() != -1:
+        origem.desliga()
+
+
+def _cache(diretorio, **kwargs):
+    return CachePlanilha(diretorio, cliente=ClienteHTTP(tentativas=1, timeout=(1, 5)), **kwargs)
+
+
+def test_falta_acerto_reinicio_toque_e_queda(origem, tmp_path):
+    # Falta: baixa e lê
+    cache = _cache(tmp_path)
+    df = cache.obtem(origem.url, "GERAL")
+    assert list(df["Código"]) == [1, 2, 3]
+    assert origem.requisicoes == [200]
+    assert cache.estatisticas["faltas"] == 1
+    versao = df.attrs["versao"]
+
+    # Acerto: 304 devolve o snapshot
+    assert cache.obtem(origem.url, "GERAL").attrs["versao"] == versao
+    assert origem.requisicoes == [200, 304]
+    assert cache.estatisticas["acertos"] == 1
+
+    # Reinício (novo objeto, mesmo diretório): snapshot do disco após o 304
+    cache = _cache(tmp_path)
+    assert cache.obtem(origem.url, "GERAL").attrs["versao"] == versao
+    assert origem.requisicoes == [200, 304, 304]
+    assert cache.estatisticas == {"acertos": 1, "faltas": 0, "revalidacoes": 1, "erros": 0}
+
+    # Arquivo tocado (ETag novo), mesmo conteúdo: 200, mas o xlsx não é relido
+    origem.toca()
+    assert cache.obtem(origem.url, "GERAL").attrs["versao"] == versao
+    assert origem.requisicoes[-1] == 200
+    assert cache.estatisticas["acertos"] == 2
+    assert cache.estatisticas["faltas"] == 0
+
+    # Origem fora do ar: último snapshot salvo
+    origem.desliga()
+    assert cache.obtem(origem.url, "GERAL").attrs["versao"] == versao
+    assert cache.estatisticas["erros"] == 1
+    with pytest.raises(Exception):
+        cache.obtem(origem.url, "GERAL", tolera_falha=False)
+
+
+def test_reinicio_dentro_da_janela_nao_consulta_a_origem(origem, tmp_path):
+    _cache(tmp_path).obtem(origem.url, "GERAL")
+
+    cache = _cache(tmp_path, janela_revalidacao=60)
+    df = cache.obtem(origem.url, "GERAL")
+    assert list(df["Código"]) == [1, 2, 3]
+    assert origem.requisicoes == [200]
+    assert cache.estatisticas["revalidacoes"] == 0
+
+    # Fora da janela volta a revalidar
+    cache.janela_revalidacao = 0
+    cache.obtem(origem.url, "GERAL")
+    assert origem.requisicoes == [200, 304]
+
+
+def test_conteudo_novo_e_relido(origem, tmp_path):
+    cache = _cache(tmp_path)
+    versao = cache.obtem(origem.url, "GERAL").attrs["versao"]
+    origem.conteudo = _xlsx(5)
+    df = cache.obtem(origem.url, "GERAL")
+    assert len(df) == 5
+    assert df.attrs["versao"] != versao
+    assert cache.estatisticas["faltas"] == 2
+
+
+def test_304_sem_snapshot_baixa_de_novo_e_fecha_os_dois(origem, tmp_path):
+    cache = _cache(tmp_path)
+    cache.obtem(origem.url, "GERAL")
+    for arquivo in list(tmp_path.glob("*.parquet")) + list(tmp_path.glob("*.pkl")):
+        arquivo.unlink()
+
+    downloads, fechados = [], []
+    baixa = cache.cliente.baixa
+
+    def registra(*args, **kwargs):
+        download = baixa(*args, **kwargs)
+        fecha = download.fecha
+        download.fecha = lambda: (fechados.append(download), fecha())
+        downloads.append(download)
+        return download
+
+    cache.cliente.baixa = registra
+    df = cache.obtem(origem.url, "GERAL")
+    assert list(df["Código"]) == [1, 2, 3]
+    assert origem.requisicoes == [200, 304, 200]
+    assert [d.status_code for d in downloads] == [304, 200]
+    assert all(d in fechados for d in downloads)
+
@@ -0,0 +1,46 @@
+import threading
+import time
+
+import pandas as pd
+
+from luatech.escritorios import COLUNA_ESCRITORIO, CargaEscritorios, Escritorio
+
+
+class _Fonte:
+    """obtem() em que a planilha "lenta" só responde depois de `libera()`"""
+
+    def __init__(self):
+        self.liberada = threading.Event()
+        self.chamadas = {}
+
+    def obtem(self, url, aba, tolera_falha=True):
+        self.chamadas[url] = self.chamadas.get(url, 0) + 1
+        if url == "lenta":
+            self.liberada.wait(5)
+        df = pd.DataFrame({"Código": [1]})
+        df.attrs = {"versao": url, "consultado_em": time.time()}
+        return df
+
+    def libera(self):
+        self.liberada.set()
+
+
+def test_busca_presa_nao_e_repetida_e_entra_quando_termina():
+    fonte = _Fonte()
+    carga = CargaEscritorios([Escritorio("A", "rapida"), Escritorio("B", "lenta")], fonte.obtem, timeout=0.2)
+    try:
+        df = carga()
+        assert set(df[COLUNA_ESCRITORIO]) == {"A"}
+        assert set(carga.falhas) == {"B"}
+
+        # Segunda carga com a primeira busca de B ainda presa: nenhuma nova
+        carga()
+        assert fonte.chamadas == {"rapida": 2, "lenta": 1}
+
+        fonte.libera()
+        df = carga()
+        assert set(df[COLUNA_ESCRITORIO]) == {"A", "B"}
+        assert carga.falhas == {}
+    finally:
+        fonte.libera()
+        carga.fecha()
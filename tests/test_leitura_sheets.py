@@ -0,0 +1,78 @@
+import re
+import threading
+
+import pytest
+
+from luatech.leitura_sheets import CONSULTAS_CABECALHO, FonteSheetsAPI
+
+
+def _indice(letras):
+    indice = 0
+    for letra in letras:
+        indice = indice * 26 + ord(letra) - 64
+    return indice - 1
+
+
+class _ClienteFalso:
+    """values_batch_get em memória: `abas[chave]` devolve {coluna: valores} a cada consulta"""
+
+    def __init__(self, abas):
+        self.abas = abas
+        self.http_client = self
+        self.consultas = 0
+
+    def values_batch_get(self, chave, faixas, params=None):
+        self.consultas += 1
+        colunas = self.abas[chave]()
+        nomes = list(colunas)
+        resposta = []
+        for faixa in faixas:
+            a1 = faixa.rsplit("!", 1)[1]
+            if a1 == "1:1":
+                resposta.append({"values": [[nome] for nome in nomes]})
+                continue
+            inicio, fim = re.fullmatch(r"([A-Z]+)2:([A-Z]+)", a1).groups()
+            resposta.append({"values": [colunas[n] for n in nomes[_indice(inicio):_indice(fim) + 1]]})
+        return {"valueRanges": resposta}
+
+
+def test_cabecalho_que_muda_uma_vez_e_reconsultado():
+    versoes = iter([{"Código": [1, 2]}, {"Código": [1, 2], "Situação": ["ATIVA", "ATIVA"]}])
+    ultimo = {}
+
+    def aba():
+        ultimo.update(next(versoes, ultimo))
+        return dict(ultimo)
+
+    fonte = FonteSheetsAPI(_ClienteFalso({"planilha": aba}))
+    df = fonte.obtem("planilha", "GERAL")
+    assert list(df.columns) == ["Código", "Situação"]
+
+
+def test_cabecalho_instavel_gera_erro_claro():
+    contador = iter(range(100))
+    fonte = FonteSheetsAPI(_ClienteFalso({"planilha": lambda: {f"Código{next(contador)}": [1]}}))
+    with pytest.raises(RuntimeError, match="Cabeçalho da aba GERAL mudou"):
+        fonte.obtem("planilha", "GERAL")
+    assert fonte.cliente.consultas == CONSULTAS_CABECALHO
+
+
+def test_planilhas_diferentes_nao_esperam_uma_pela_outra():
+    liberada, entrou = threading.Event(), threading.Event()
+
+    def lenta():
+        entrou.set()
+        liberada.wait(5)
+        return {"Código": [1]}
+
+    fonte = FonteSheetsAPI(_ClienteFalso({"lenta": lenta, "rapida": lambda: {"Código": [2]}}))
+    thread = threading.Thread(target=fonte.obtem, args=("lenta", "GERAL"))
+    thread.start()
+    try:
+        assert entrou.wait(5)
+        # A outra planilha responde com a primeira ainda presa na rede
+        assert fonte.obtem("rapida", "GERAL")["Código"].tolist() == [2]
+    finally:
+        liberada.set()
+        thread.join(5)
+    assert fonte.estatisticas["faltas"] == 2
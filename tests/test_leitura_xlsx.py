@@ -0,0 +1,40 @@
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from luatech.leitura_xlsx import MOTORES, VALORES_AUSENTES, ler_xlsx, motor_disponivel
+
+MOTORES_INSTALADOS = [m for m in MOTORES if motor_disponivel(m)]
+
+
+@pytest.fixture(scope="module")
+def planilha() -> bytes:
+    ausentes = sorted(VALORES_AUSENTES - {""})
+    n = len(ausentes) + 3
+    df = pd.DataFrame({
+        "Código": range(1, n + 1),
+        "Situação": ["ATIVA"] * n,
+        "GUIA ISS DMS": ausentes + ["OK", " N/A ", "n.a."],
+        "REST": ["REST SALVA", None, "Rest salva"] + ausentes,
+        "TOTAL ENTRADA": [1.5, 2, None] + ausentes,
+        "Coluna extra": ["x"] * n,
+    })
+    saida = BytesIO()
+    df.to_excel(saida, sheet_name="GERAL", index=False)
+    return saida.getvalue()
+
+
+@pytest.mark.parametrize("motor", MOTORES_INSTALADOS)
+def test_motores_dao_o_mesmo_resultado(planilha, motor):
+    esperado = ler_xlsx(planilha, "GERAL", motor="openpyxl")
+    pd.testing.assert_frame_equal(ler_xlsx(planilha, "GERAL", motor=motor), esperado)
+
+
+def test_na_values_padrao_viram_ausentes(planilha):
+    df = ler_xlsx(planilha, "GERAL", motor="openpyxl_streaming")
+    guia = df["GUIA ISS DMS"]
+    assert guia.isna().sum() == len(VALORES_AUSENTES) - 1
+    # Só o texto exato: com espaços ou outra grafia continua sendo valor
+    assert guia.dropna().tolist() == ["OK", " N/A ", "n.a."]
+    assert "Coluna extra" not in df.columns
@@ -0,0 +1,23 @@
+from gera_geral import gera_geral
+from luatech import esquema
+from luatech.escritorios import junta
+from luatech.normalizacao import DadosNormalizados
+from luatech.relatorios import monta_todos
+
+
+def test_recorte_do_escritorio_nao_reaplica_o_esquema(monkeypatch):
+    geral = gera_geral(600)
+    geral.attrs["versao"] = "v1"
+    partes = [("A", geral.iloc[:250].reset_index(drop=True)), ("B", geral.iloc[250:].reset_index(drop=True))]
+    dados = DadosNormalizados(junta(partes))
+    # Só a parte do escritório, normalizada do zero (referência)
+    esperado = {p: r.totais for p, r in monta_todos(DadosNormalizados(junta(partes[:1]))).items()}
+
+    def aplica(*args, **kwargs):
+        raise AssertionError("esquema reaplicado no recorte")
+
+    monkeypatch.setattr(esquema, "aplica", aplica)
+    recorte = dados.do_escritorio("A")
+    assert recorte.validacao is None
+    assert recorte.versao == f"{dados.versao}:A"
+    assert {p: r.totais for p, r in monta_todos(recorte).items()} == esperado
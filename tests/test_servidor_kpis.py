@@ -0,0 +1,73 @@
+import http.client
+import threading
+
+import pytest
+
+from luatech.cache_planilha import CachePlanilha
+from luatech.historico import HistoricoCompetencias
+from luatech.servidor_kpis import cria_servidor, etag_confere
+
+
+@pytest.mark.parametrize("cabecalho, confere", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", "abc"', True),
+    ('"x" ,W/"abc" , "y"', True),
+    ("*", True),
+    ('"abcd"', False),
+    ('"ab"', False),
+    ('"xabcx"', False),
+    ("", False),
+    (None, False),
+])
+def test_if_none_match(cabecalho, confere):
+    assert etag_confere('"abc"', cabecalho) is confere
+
+
+def test_etag_fraca_do_servidor():
+    assert etag_confere('W/"abc"', '"abc"')
+
+
+def test_sem_token_so_loopback(monkeypatch, tmp_path):
+    monkeypatch.delenv("GESTOR_FISCAL_KPIS_TOKEN", raising=False)
+    for host in ("0.0.0.0", "", "192.168.0.10", "servidor.local"):
+        with pytest.raises(ValueError, match="loopback"):
+            cria_servidor(host=host, porta=0, cache=CachePlanilha(tmp_path))
+
+
+def test_fonte_sem_snapshots_nao_sobe(tmp_path):
+    with pytest.raises(ValueError, match="sheets_api"):
+        cria_servidor(porta=0, cache=CachePlanilha(tmp_path), token="segredo", fonte="sheets_api")
+
+
+@pytest.fixture
+def servidor(monkeypatch, tmp_path):
+    monkeypatch.setenv("GESTOR_FISCAL_KPIS_TOKEN", "segredo")
+    servidor = cria_servidor(
+        porta=0, cache=CachePlanilha(tmp_path), historico=HistoricoCompetencias(tmp_path / "historico.sqlite3")
+    )
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+    servidor.atualizador.para()
+    servidor.carga.fecha()
+
+
+def _status(servidor, headers):
+    conexao = http.client.HTTPConnection("127.0.0.1", servidor.server_port, timeout=5)
+    try:
+        conexao.request("GET", "/saude", headers=headers)
+        resposta = conexao.getresponse()
+        resposta.read()
+        return resposta.status
+    finally:
+        conexao.close()
+
+
+def test_token_exigido(servidor):
+    assert _status(servidor, {}) == 401
+    assert _status(servidor, {"Authorization": "Bearer errado"}) == 401
+    assert _status(servidor, {"Authorization": "Basic segredo"}) == 401
+    # Token certo passa da autenticação (cache vazio: sem dados ainda)
+    assert _status(servidor, {"Authorization": "Bearer segredo"}) == 503
@@ -0,0 +1,96 @@
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from gera_geral import escreve_xlsx, gera_geral
+from luatech.leitura_xlsx import ler_xlsx
+from luatech.normalizacao import DadosNormalizados
+from luatech.relatorios import RELATORIOS
+
+# Totalizadores como as páginas originais calculavam (Gestor_Fiscal.py da versão inicial).
+# map(str) no lugar do astype(str) da época: no pandas 3 o astype mantém NaN em vez de "nan"
+
+
+def _ativas(df):
+    return df[df["Situação"].map(str).str.upper() == "ATIVA"]
+
+
+def _totais_originais(df: pd.DataFrame) -> dict:
+    ativas = _ativas(df)
+    totais = {"EMPRESAS": {"Total": ativas.shape[0]}}
+
+    simples = ativas[ativas["Regime"].map(str).str.upper() == "SIMPLES NACIONAL"]
+    gerado = simples["SIMPLES GERADO"].apply(
+        lambda x: "Filial" if str(x).upper() == "FILIAL" else ("Concluída" if pd.notna(x) else "Não")
+    )
+    totais["SIMPLES NACIONAL"] = {
+        "Concluídas": int(gerado.isin(["Concluída", "Filial"]).sum()),
+        "Filial": int((gerado == "Filial").sum()),
+        "Não concluídas": int((gerado == "Não").sum()),
+    }
+
+    transmissao = ativas["TRANSMISSÃO"].map(str).str.upper().replace(
+        {"OK": "Transmitida", "FILIAL": "FILIAL", "NAN": "Não", "": "Não"}
+    )
+    totais["REINF"] = {
+        "Filial": int((transmissao == "FILIAL").sum()),
+        "Transmitida": int((transmissao == "Transmitida").sum()),
+        "Não transmitida": int((transmissao == "Não").sum()),
+    }
+
+    dctf = _ativas(df.fillna(""))
+    situacao = dctf["SITUAÇÃO DCTF"].map(str).str.upper()
+    filiais = int((dctf["MATRIZ / FILIAL"].map(str).str.upper() == "FILIAL").sum())
+    totais["DCTF WEB"] = {
+        "Concluídas": int((situacao == "ATIVA").sum()),
+        "Sem Procuração": int((situacao == "SEM PROCURAÇÃO").sum()),
+        "Filiais": filiais,
+        "Não concluídas": max(int((~situacao.isin(["ATIVA", "SEM PROCURAÇÃO"])).sum()) - filiais, 0),
+    }
+
+    dms = ativas["DMS"].fillna("").map(str).str.upper()
+    totais["DMS"] = {
+        "Concluídas": int((dms == "DMS SALVA").sum()),
+        "Sem acesso": int((dms == "SEM ACESSO").sum()),
+        "Não concluídas": int((~dms.isin(["DMS SALVA", "SEM ACESSO"])).sum()),
+    }
+
+    rest = ativas["REST"].fillna("").map(str).replace(
+        {"REST SALVA": "Concluído", "SEM ACESSO": "Sem acesso", "": "Não concluído"}
+    )
+    totais["SERVIÇOS TOMADOS"] = {
+        "Concluídas": int((rest == "Concluído").sum()),
+        "Sem acesso": int((rest == "Sem acesso").sum()),
+        "Não concluídas": int((rest == "Não concluído").sum()),
+    }
+
+    importacao = ativas["IMPORTAÇÃO"].map(str).str.upper()
+    totais["SEFAZ"] = {
+        "Em andamento": int((importacao == "EM ANDAMENTO").sum()),
+        "Outro Estado": int((importacao == "OUTRO ESTADO").sum()),
+        "Sem movimento": int((importacao == "SEM MOVIMENTO").sum()),
+        "Concluído": int((importacao == "CONCLUÍDO").sum()),
+    }
+    return totais
+
+
+@pytest.fixture(scope="module", params=[300, 10_000])
+def planilha(request, tmp_path_factory):
+    caminho = tmp_path_factory.mktemp("geral") / "geral.xlsx"
+    escreve_xlsx(gera_geral(request.param), caminho)
+    return caminho.read_bytes()
+
+
+def test_totais_iguais_aos_das_paginas_originais(planilha):
+    esperado = _totais_originais(pd.read_excel(BytesIO(planilha), sheet_name="GERAL", engine="openpyxl"))
+    dados = DadosNormalizados(ler_xlsx(planilha, "GERAL"))
+    for pagina, totais in esperado.items():
+        assert RELATORIOS[pagina](dados).totais == totais, pagina
+
+
+def test_rest_compara_a_caixa_exata(planilha):
+    df = pd.read_excel(BytesIO(planilha), sheet_name="GERAL", engine="openpyxl")
+    relatorio = RELATORIOS["SERVIÇOS TOMADOS"](DadosNormalizados(ler_xlsx(planilha, "GERAL")))
+    # "Rest salva" continua como está na planilha, fora dos concluídos
+    assert (relatorio.df["REST"] == "Rest salva").sum() == (_ativas(df)["REST"] == "Rest salva").sum() > 0